@@ -0,0 +1,260 @@
+"""
+Benchmarks de las rutas calientes del cálculo.
+
+Mide latencia de una llamada, barridos de profundidad, lotes de composiciones y un rerun completo
+de la página con AppTest de Streamlit. Reporta tiempo (mediana y mínimo por llamada), memoria pico,
+memoria retenida y número de bloques que quedan vivos después de la llamada (instantáneas de
+tracemalloc), y compara la mediana contra la línea base guardada: hay regresión si supera la mediana
+base en más de la tolerancia relativa más el ruido medido (rango intercuartil de las repeticiones).
+Los casos de menos de --piso (100 µs) solo se reportan: a esa escala el ruido de la máquina domina.
+El rerun de la página tiene una tolerancia propia, más estricta. La línea base depende de la máquina:
+regenérela con --guardar al cambiar de equipo y en los cambios que modifiquen las rutas medidas.
+
+Uso:
+    python benchmarks/bench_calculo.py                 # compara contra benchmarks/linea_base.json
+    python benchmarks/bench_calculo.py --guardar       # reemplaza la línea base
+    python benchmarks/bench_calculo.py -k esals        # solo los casos que contienen "esals"
+    python benchmarks/bench_calculo.py --tolerancia-rerun 0.1
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import numpy as np  # noqa: E402
+
+from unampav import (  # noqa: E402
+    CARGAS_POR_CAMINO, CLASES_VEHICULARES, calcular_CT, calcular_volumenes, composicion_vector,
+    danio_tabla, ejes_primer_anio, esals, esals_por_profundidad, esfuerzo_vertical, radio_placa,
+    transformar_vehiculos_a_ejes,
+)
+
+LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "linea_base.json")
+CASOS_RERUN = ("rerun_pagina",)
+
+# Entrada por omisión de la interfaz
+TC_NOMBRE, NC, VC, VIDA, TCA, TDPA = "ET y A", 1, 80.0, 15.0, 3.5, 7500.0
+PARAMS = {clase: 0.0 for clase in CLASES_VEHICULARES}
+PARAMS.update(A2=85, B2=2, C2=2, C38=2, T3S2=2, T3S3=5, T3S2R4=2)
+_, FVP, FVV = calcular_volumenes(TDPA, NC, VC)
+
+
+def caso_transformar():
+    transformar_vehiculos_a_ejes(TC_NOMBRE, PARAMS, FVP, FVV)
+
+
+def caso_ejes_primer_anio():
+    ejes_primer_anio(composicion_vector(PARAMS), FVP, FVV)
+
+
+def caso_esals():
+    esals(25.0, TC_NOMBRE, PARAMS, FVP, FVV, TCA, VIDA)
+
+
+def caso_esals_directo():
+    ejes = ejes_primer_anio(composicion_vector(PARAMS), FVP, FVV)
+    esals_por_profundidad(25.0, ejes, CARGAS_POR_CAMINO[TC_NOMBRE], calcular_CT(TCA, VIDA))
+
+
+def caso_danio_pestana4():
+    df = transformar_vehiculos_a_ejes(TC_NOMBRE, PARAMS, FVP, FVV)
+    cargas = df["Cargas (Ton)"].to_numpy()
+    df["Radio placa"] = radio_placa(5.0, cargas)
+    df["Esfuerzo vert."] = esfuerzo_vertical(5.0, df["Radio placa"].to_numpy())
+    df["Daño unitario"] = danio_tabla(5.0, TC_NOMBRE)
+    df["Ejes Equivalentes"] = df["Ejes 1er Año"] * df["Daño unitario"]
+    df["Ejes Equivalentes"].sum()
+
+
+PROFUNDIDADES = np.arange(1, 101, dtype=float)
+
+
+def caso_barrido_z():
+    esals(PROFUNDIDADES, TC_NOMBRE, PARAMS, FVP, FVV, TCA, VIDA)
+
+
+def caso_barrido_z_directo():
+    ejes = ejes_primer_anio(composicion_vector(PARAMS), FVP, FVV)
+    esals_por_profundidad(PROFUNDIDADES, ejes, CARGAS_POR_CAMINO[TC_NOMBRE], calcular_CT(TCA, VIDA))
+
+
+def _caso_lote(n):
+    rng = np.random.default_rng(0)
+    composiciones = rng.dirichlet(np.ones(len(CLASES_VEHICULARES)), n) * 100
+    cargas = CARGAS_POR_CAMINO[TC_NOMBRE]
+    CT = calcular_CT(TCA, VIDA)
+
+    def caso():
+        ejes = ejes_primer_anio(composiciones, FVP, FVV)
+        esals_por_profundidad(25.0, ejes, cargas, CT)
+
+    return caso
+
+
+def _caso_pagina():
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(RAIZ, "pav25.py"), default_timeout=120)
+    directorio = os.getcwd()
+    os.chdir(RAIZ)  # la página abre imagen/ y guia_unam.pdf con rutas relativas
+    try:
+        app.run()
+    finally:
+        os.chdir(directorio)
+
+    def caso():
+        os.chdir(RAIZ)
+        try:
+            app.run()
+        finally:
+            os.chdir(directorio)
+
+    return caso
+
+
+CASOS = {
+    "transformar_vehiculos_a_ejes": lambda: caso_transformar,
+    "ejes_primer_anio": lambda: caso_ejes_primer_anio,
+    "esals_escalar": lambda: caso_esals,
+    "esals_escalar_directo": lambda: caso_esals_directo,
+    "danio_pestana4": lambda: caso_danio_pestana4,
+    "barrido_z_1_100": lambda: caso_barrido_z,
+    "barrido_z_1_100_directo": lambda: caso_barrido_z_directo,
+    "lote_1k": lambda: _caso_lote(1_000),
+    "lote_10k": lambda: _caso_lote(10_000),
+    "lote_100k": lambda: _caso_lote(100_000),
+    "rerun_pagina": _caso_pagina,
+}
+
+
+def _memoria(funcion):
+    """Memoria pico y retenida (bytes) y bloques vivos nuevos de una llamada, con tracemalloc."""
+    tracemalloc.start()
+    inicial = tracemalloc.take_snapshot()
+    antes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    funcion()
+    despues, pico = tracemalloc.get_traced_memory()
+    final = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    propias = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    cambios = final.filter_traces(propias).compare_to(inicial.filter_traces(propias), "traceback")
+    return pico - antes, despues - antes, sum(max(d.count_diff, 0) for d in cambios)
+
+
+def medir(funcion, repeticiones=7, objetivo=0.2):
+    """
+    Mediana, mínimo y rango intercuartil del tiempo por llamada (s), memoria pico y retenida por
+    llamada (bytes) y bloques retenidos (asignaciones que siguen vivas al terminar la llamada).
+    """
+    funcion()  # calentamiento (cachés, tablas, importaciones perezosas)
+    n = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(n):
+            funcion()
+        duracion = time.perf_counter() - inicio
+        if duracion >= objetivo / 4 or n >= 1_000_000:
+            break
+        n *= 4
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(n):
+            funcion()
+        tiempos.append((time.perf_counter() - inicio) / n)
+
+    pico, retenida, bloques = _memoria(funcion)
+    # Los bloques de las propias mediciones (enteros de get_traced_memory) no cuentan
+    bloques = max(bloques - _memoria(lambda: None)[2], 0)
+    cuartil1, _, cuartil3 = statistics.quantiles(tiempos, n=4)
+    return {
+        "mediana_s": statistics.median(tiempos),
+        "minimo_s": min(tiempos),
+        "ruido_s": cuartil3 - cuartil1,
+        "memoria_pico_b": pico,
+        "memoria_retenida_b": retenida,
+        "bloques_retenidos": bloques,
+        "llamadas": n * repeticiones,
+    }
+
+
+def _formato_tiempo(s):
+    return f"{s * 1e6:10.1f} µs" if s < 1e-3 else f"{s * 1e3:10.2f} ms"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del motor de cálculo UNAM.")
+    parser.add_argument("-k", dest="filtro", default="", help="solo casos cuyo nombre contenga este texto")
+    parser.add_argument("--guardar", action="store_true", help="guardar los resultados como línea base")
+    parser.add_argument("--tolerancia", type=float, default=0.5,
+                        help="aumento relativo permitido antes de marcar regresión (0.5 = 50 %%)")
+    parser.add_argument("--tolerancia-rerun", type=float, default=0.35,
+                        help="aumento relativo permitido en el rerun de la página (0.35 = 35 %%)")
+    parser.add_argument("--piso", type=float, default=100e-6,
+                        help="casos con mediana base menor a este tiempo (s) solo se reportan")
+    parser.add_argument("--salida", help="escribir también los resultados en este JSON")
+    args = parser.parse_args(argv)
+
+    base = {}
+    if os.path.exists(LINEA_BASE):
+        with open(LINEA_BASE, encoding="utf-8") as archivo:
+            base = json.load(archivo)["casos"]
+
+    resultados, regresiones = {}, []
+    print(f"{'caso':28s} {'mediana':>13s} {'mínimo':>13s} {'pico':>10s} {'retenida':>10s} {'bloques':>8s}  vs base")
+    for nombre, preparar in CASOS.items():
+        if args.filtro not in nombre:
+            continue
+        try:
+            funcion = preparar()
+        except ImportError as error:
+            print(f"{nombre:28s} omitido ({error})")
+            continue
+        # El rerun es más ruidoso: más repeticiones para que la mediana sea estable
+        r = resultados[nombre] = medir(funcion, repeticiones=21 if nombre in CASOS_RERUN else 7)
+        comparacion = ""
+        if nombre in base:
+            referencia = base[nombre]
+            cambio = r["mediana_s"] / referencia["mediana_s"] - 1
+            comparacion = f"{cambio:+.0%}"
+            tolerancia = args.tolerancia_rerun if nombre in CASOS_RERUN else args.tolerancia
+            ruido = max(r["ruido_s"], referencia.get("ruido_s", 0.0))
+            if referencia["mediana_s"] < args.piso:
+                comparacion += "  (informativo)"
+            elif r["mediana_s"] > referencia["mediana_s"] * (1 + tolerancia) + ruido:
+                regresiones.append(nombre)
+                comparacion += "  ⚠ regresión"
+        print(f"{nombre:28s} {_formato_tiempo(r['mediana_s'])} {_formato_tiempo(r['minimo_s'])} "
+              f"{r['memoria_pico_b'] / 1024:8.1f} KiB {r['memoria_retenida_b'] / 1024:8.1f} KiB {r['bloques_retenidos']:8d}  {comparacion}")
+
+    datos = {
+        "plataforma": {"python": platform.python_version(), "numpy": np.__version__,
+                       "maquina": platform.machine(), "sistema": platform.system()},
+        "casos": resultados,
+    }
+    if args.guardar:
+        if os.path.exists(LINEA_BASE):
+            base.update(resultados)
+            datos["casos"] = base
+        with open(LINEA_BASE, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo, indent=2, ensure_ascii=False)
+        print(f"Línea base guardada en {LINEA_BASE}")
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo, indent=2, ensure_ascii=False)
+    if regresiones and not args.guardar:
+        print(f"Regresiones: {', '.join(regresiones)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,18 +4,33 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import math
 import plotly.express as px
-from scipy import optimize
-from scipy.stats import norm
-from PIL import Image
 import os
-import base64
+import io
+from unampav import (
+    calcular_fcp, calcular_CT,
+    radio_placa, esfuerzo_vertical, danio_tabla,
+    CONSTANTES_U, calcular_T, calcular_U, calcular_B, calcular_VRS0, barrido_confianza,
+    REGISTRO_CLASES, grafo_unam, clave_entrada, buscar_espesores, frente_pareto, VARIABLES_ALEATORIAS, simular_falla,
+    cache_persistente, ejes_persistentes, esals_persistentes,
+    COEF_GRAVA, barrido_profundidad, grava_equivalente, diezmar, mapa_factibilidad, vida_remanente, sobrecarpeta,
+    comparar_escenarios,
+    Perfilador, perfil_activo_por_entorno,
+    composicion_vector, ejes_acumulados, calcular_CT_clases,
+    EspectroCargas, esals_espectro, Capa, estructura_unam, revisar_capas,
+    leer_activo, data_uri, publicar_variante, url_publicada, precargar,
+)
 # =============================================================================================================
 # 2. Configuración de Página y Estilos
 # ============================================================================================================
 st.set_page_config("Diseño de Pavimentos - UNAM", "🛣️", "wide", "expanded")
 
+# Instrumentación por etapas (UNAMPAV_PERFIL=1 o ?perfil=1); inactiva, las marcas no cuestan nada
+if "perfilador" not in st.session_state:
+    st.session_state.perfilador = Perfilador()
+perfil = st.session_state.perfilador
+perfil.iniciar(perfil_activo_por_entorno() or st.query_params.get("perfil") == "1")
+
 st.markdown("""
 <style>
     .main { background-color: #f8f9fa; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; }
@@ -41,189 +56,181 @@ st.markdown("""
 # Funciones Auxiliares
 # =============================================================================================================
 
-# 1. Calcular el factor carril de proyecto (fcp)
-# =============================================================================================================
-def calcular_fcp(nc): return 0.5 if nc == 1 else 0.45 if nc == 2 else 0.4
-
-# 2. transformar vehículos a número de ejes, definiendo tipo de eje y sus cargas segun tipo de camino
-
-def transformar_vehiculos_a_ejes(tc_nombre, params, cargados, vacios):
-
-    A2, B2, B36, B38 = params["A2"], params["B2"], params["B36"], params["B38"]
-    B4, C2, C36, C38 = params["B4"], params["C2"], params["C36"], params["C38"]
-    C2R2, C3R2, C3R3 = params["C2R2"], params["C3R2"], params["C3R3"]
-    C2R3, T2S1, T2S2 = params["C2R3"], params["T2S1"], params["T2S2"]
-    T3S2, T3S3, T2S3 = params["T3S2"], params["T3S3"], params["T2S2"]
-    T3S1, T2S1R2, T2S1R3 = params["T3S1"], params["T2S1R2"], params["T2S1R3"]
-    T2S2R2, T3S1R2, T3S1R3 = params["T2S2R2"], params["T3S1R2"], params["T3S1R3"]
-    T3S2R2, T3S2R4, T3S2R3 = params["T3S2R2"], params["T3S2R4"], params["T3S2R3"]
-    T3S3S2, T2S2S2, T3S2S2 = params["T3S3S2"], params["T2S2S2"], params["T3S2S2"]   
-    
-    # Cargas por tipo de camino
-    cargas = {
-        "ET y A": [1.0, 6.5, 12.5, 10.0, 11.0, 11.0, 4.0, 7.0, 17.5, 21.0, 17.0, 19.0, 18.0, 4.5, 23.5, 26.5, 5.0],
-        "Tipo B": [1.0, 6.0, 10.5, 9.5, 9.5, 10.5, 4.0, 7.0, 13.0, 17.0, 15.0, 15.0, 17.0, 4.5, 22.5, 22.5, 5.0],
-        "Tipo C": [1.0, 5.5, 9.0, 8.0, 8.0, 9.0, 4.0, 7.0, 11.5, 14.5, 13.5, 13.5,14.5, 4.5, 20.0, 20.0, 5.0],
-        "Tipo D": [1.0, 5.0, 8.0, 7.0, 7.0, 8.0, 4.0, 7.0, 11.0, 13.5, 12.0, 12.0, 13.5, 4.5, 18.0, 18.0, 5.0]
-    }
-
-    if tc_nombre not in cargas:
-        raise ValueError(f"Tipo de camino '{tc_nombre}' no reconocido.")
-
-    # Datos base
-    data = {
-        "Condición": ["Cargado", "Cargado", "Cargado",  "Cargado", "Cargado", "Cargado", "Vacío", "Vacío", 
-                "Cargado", "Cargado", "Cargado", "Cargado", "Cargado","Vacío", 
-                "Cargado", "Cargado", "Vacío"],
-        "Descripción": ["Sencillo", "Sencillo", "Sencillo", "Sencillo", "Sencillo", "Sencillo", "Sencillo","Sencillo",
-                "Tándem", "Tándem", "Tándem", "Tándem", "Tándem","Tándem",
-                "Trídem", "Trídem", "Trídem" ],
-        "Cargas (Ton)": cargas[tc_nombre]  # <- Esto debe coincidir en longitud con las listas anteriores
-    }
-
-    df = pd.DataFrame(data)
-
-    # Fórmulas de transformación a ejes (1er Año)
-    formulas = [
-        lambda: 2 * A2 * (fvp + fvv),
-        lambda: (100 - A2 + B4) * fvp,
-        lambda: (B2 + C2 + T2S1 + T2S2 + T2S3 + T2S2S2) * fvp,
-        lambda: (2*C2R2 + 2*C3R2 + C3R3 + C2R3 + 3*T2S1R2 + 2*T2S1R3 +
-                2*T2S2R2 + 3*T3S1R2 + 2*T3S1R3 + 2*T3S2R2 + T3S2R3) * fvp,
-        lambda: (T2S1 + T3S1) * fvp,
-        lambda: (C2R2 + C2R3 + T2S1R2 + T2S1R3 + T2S2R2) * fvp,
-        lambda: (B2 + B36 + B38 + 2*B4 + 2*C2 + C36 + C38 + 4*C2R2 + 3*C3R2 +
-                2*C3R3 + 3*C2R3 + 3*T2S1 + 2*T2S2 + T3S2 + T3S3 + 2*T3S1 +
-                5*T2S1R2 + 4*T2S1R3 + 4*T2S2R2 + 4*T3S1R2 + 3*T3S1R3 +
-                3*T3S2R2 + T3S2R4 + 2*T3S2R3 + T3S3S2 + 2*T2S2S2 + T3S2S2) * fvv,
-        lambda: (B2 + B36 + B38 + B4) * fvv,
-        lambda: (B36 + B4 + C36 + T3S1R3) * fvp,
-        lambda: (B38 + C38 + T3S2 + T3S3 + T3S1 + T3S2S2) * fvp,
-        lambda: (C3R3 + C2R3 + T2S1R3 + T2S2R2 + T3S1R3 + T3S2R2 +
-                3*T3S2R4 + 2*T3S2R3 + 2*T2S2S2 + 2*T3S2S2) * fvp,
-        lambda: (T2S2 + T3S2 + T3S3S2) * fvp,
-        lambda: (C3R2 + C3R3 + T3S1R2 + T3S2R2 + T3S2R4 + T3S2R3 + T3S3S2) * fvp,
-        lambda: (C36 + C38 + C3R2 + 2*C3R3 + C2R3 + T2S2 + 2*T3S2 + T3S3 + T3S1 +
-                T2S1R3 + T2S2R2 + T3S1R2 + 2*T3S1R3 + 2*T3S2R2 + 4*T3S2R4 +
-                3*T3S2R3 + 2*T3S3S2 + 2*T2S2S2 + 3*T3S2S2) * fvv,
-        lambda: T3S3S2 * fvp,
-        lambda: (T3S3 + T2S3) * fvp,
-        lambda: T3S3S2 * fvv
-    ]
-
-
-    # Calcular ejes
-    df["Ejes 1er Año"] = [formula() for formula in formulas]
-
-    # Convertir toneladas a kips
-    df["Cargas (Kip)"] = df["Cargas (Ton)"] * 2.2046226218517
-
-    # Orden final
-    df = df[["Descripción", "Condición", "Cargas (Ton)", "Cargas (Kip)", "Ejes 1er Año"]]
-
-    # Asegurar tipos
-    df = df.astype({
-        "Descripción": str,
-        "Condición": str,
-        "Cargas (Ton)": float,
-        "Cargas (Kip)": float,
-        "Ejes 1er Año": float
-    })
-
+# Resultados memorizados entre reruns y compartidos entre sesiones.
+# La clave es el hash de las entradas; los argumentos con "_" no se vuelven a hashear.
+@st.cache_data(max_entries=256, show_spinner=False)
+def ejes_memorizados(clave, _tc_nombre, _params, _fvp, _fvv):
+    return ejes_persistentes(cache_persistente(), _tc_nombre, _params, _fvp, _fvv)
+
+# Barrido de profundidades para las gráficas: una llamada vectorizada, puntos ya diezmados
+@st.cache_data(max_entries=64, show_spinner=False)
+def barrido_memorizado(clave, Z_max, vrs, VRS0, _tc_nombre, _params, _fvp, _fvv, _tca, _vida, _periodos=None):
+    Z = np.linspace(1.0, Z_max, 400)
+    esal, Zg = barrido_profundidad(Z, _tc_nombre, _params, _fvp, _fvv, _tca, _vida, vrs, VRS0, _periodos)
+    # Con TDPA = 0 los ESAL's son 0: se acotan a 1 para que el logaritmo sea finito
+    indices = diezmar(Z, np.column_stack([np.log10(np.maximum(esal, 1.0)), Zg]))
+    df = pd.DataFrame(Zg[indices], columns=[f"ZG requerido (CBR {v:g} %)" for v in vrs])
+    df.insert(0, "ESAL's acumulados", esal[indices])
+    df.insert(0, "Z (cm)", Z[indices])
     return df
 
-# 3. Para calcular los ESAL'S en función de la Z
-
-def esals(Z):
-    """
-    Calcula los ESAL's acumulados en la vida de proyecto a partir de la profundidad Z (cm).
-    No muestra DataFrame ni resultados intermedios.
-    """
-    # Cálculo del esfuerzo vertical de un eje estándar
-    sigma_z_st = 5.8 * (1 - (Z**3) / ((15**2 + Z**2)**(1.5)))
-
-    # Transformar vehículos a ejes
-    df = transformar_vehiculos_a_ejes(tc_nombre, params, fvp, fvv)
-    df["Radio placa"] = np.nan
-
-    # Cálculo del radio de placa
-    for i in range(8):
-        P = df.loc[i, "Cargas (Ton)"]
-        q = 2 if i == 0 else 6
-        df.loc[i, "Radio placa"] = np.sqrt((1000 * P) / (2 * np.pi * q))
-
-    for i in range(8, 14):
-        P = df.loc[i, "Cargas (Ton)"]
-        q = 6
-        if Z < 30:
-            radio_placa = np.sqrt((1000 * P) / (4 * np.pi * q))
-        else:
-            radio_placa = np.sqrt((1111 * P) / (4 * np.pi * q))
-        df.loc[i, "Radio placa"] = radio_placa
-
-    for i in range(14, 17):
-        P = df.loc[i, "Cargas (Ton)"]
-        q = 6
-        if Z < 30:
-            radio_placa = np.sqrt((1000 * P) / (6 * np.pi * q))
-        else:
-            radio_placa = np.sqrt((1333 * P) / (6 * np.pi * q))
-        df.loc[i, "Radio placa"] = radio_placa
-
-    # Cálculo del esfuerzo vertical para cada fila
-    esfuerzo_vert = []
-    for i, row in df.iterrows():
-        a = row['Radio placa']
-        q = 2 if i == 0 else 6
-        numerador = Z**3
-        denominador = (a**2 + Z**2)**(1.5)
-        sigma_z = q * (1 - (numerador / denominador))
-        esfuerzo_vert.append(sigma_z)
-
-    df["Esfuerzo vert."] = esfuerzo_vert
-
-    # Cálculo del daño unitario
-    daño_unitario = []
-    for i, row in df.iterrows():
-        sigma_z_i = row['Esfuerzo vert.']
-        if i <= 7:
-            N = 1
-        elif 8 <= i <= 13:
-            N = 2 if Z < 30 else 1
-        else:
-            N = 3 if Z < 30 else 1
-
-        d = (10 ** ((np.log10(sigma_z_i) - np.log10(sigma_z_st)) / np.log10(1.5))) * N
-        daño_unitario.append(d)
-
-    df["Daño unitario"] = daño_unitario
-
-    # Ejes equivalentes del primer año
-    df["Ejes Equivalentes"] = df["Ejes 1er Año"] * df["Daño unitario"]
-    total_ejes_equivalentes = df["Ejes Equivalentes"].sum()
-
-    # Factor de crecimiento de tráfico CT
-    if tca != 0:
-        CT = ((1 + (tca/100)) ** vida - 1) / (tca/100)
-    else:
-        CT = vida
-
-    # Cálculo final de los ESAL's acumulados
-    ESALs = CT * total_ejes_equivalentes
+# Mapas de factibilidad: todos los caminos y carriles de una vez, como float32 compacto
+@st.cache_data(max_entries=16, show_spinner=False)
+def mapa_memorizado(params, vc, tca, vida, VRS0, vrs, tdpa, periodos=None):
+    return mapa_factibilidad(list(opciones_camino), params, list(opciones_ncarriles.values()),
+                             vc, tca, vida, VRS0, vrs, tdpa, periodos)
+
+# Vida remanente y sobrecarpeta de la estructura en servicio
+@st.cache_data(max_entries=64, show_spinner=False)
+def rehabilitacion_memorizada(clave, estructura, vrs, VRS01, VRS02, vida, horizonte, _tc_nombre, _params,
+                              _fvp, _fvv, _tca, _periodos=None):
+    remanente = vida_remanente(estructura, vrs, _tc_nombre, _params, _fvp, _fvv, _tca, VRS01, VRS02,
+                               horizonte=horizonte, periodos=_periodos)
+    espesor = sobrecarpeta(estructura, vrs, _tc_nombre, _params, _fvp, _fvv, _tca, vida, VRS01, VRS02,
+                           periodos=_periodos)
+    return remanente, float(espesor)
+
+# Comparación de alternativas: la clave incluye el contenido de la tabla editada
+@st.cache_data(max_entries=32, show_spinner=False)
+def comparacion_memorizada(clave, escenarios, tdpa, nc, vc, VRS01, VRS02, _tc_nombre, _params, _tca, _vida,
+                           _periodos=None):
+    comparacion = comparar_escenarios(
+        escenarios[["D1", "D2", "D3", "D4"]].to_numpy(float),
+        escenarios[["CBR base", "CBR subbase", "CBR subrasante"]].to_numpy(float),
+        _tc_nombre, _params, tdpa, nc, vc, _tca, _vida, VRS01, VRS02, periodos=_periodos,
+        tdpa_escenario=escenarios["TDPA"].to_numpy(float),
+        tca_escenario=escenarios["Tasa %"].to_numpy(float),
+        vida_escenario=escenarios["Vida"].to_numpy(float),
+    )
+    df = pd.DataFrame({"Alternativa": escenarios["Alternativa"].fillna("").to_numpy()})
+    for i in range(3):
+        df[f"ZG{i + 1} requerido"] = comparacion["Zg"][:, i]
+        df[f"ZG{i + 1} real"] = comparacion["zge"][:, i]
+        df[f"Revisión {i + 1}"] = np.where(comparacion["cumple"][:, i], "✅", "❌")
+    df["Estructura"] = np.where(comparacion["cumple_todo"], "✅ Cumple", "❌ No cumple")
+    return df
 
-    return ESALs
+# Frente de Pareto de la malla de 0 a 50 cm: por tránsito, CBR, costos y mínimos por capa
+@st.cache_data(max_entries=16, show_spinner=False)
+def frente_memorizado(clave, vrs, VRS01, VRS02, costos, minimos, _tc_nombre, _params, _fvp, _fvv, _tca, _vida,
+                      _periodos=None):
+    return frente_pareto(_tc_nombre, _params, _fvp, _fvv, _tca, _vida, *vrs, VRS01, VRS02, costos=costos,
+                         minimos=minimos, maximos=50.0, paso=1.0, periodos=_periodos)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def espectro_memorizado(contenido):
+    return EspectroCargas.cargar(io.BytesIO(contenido))
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def esals_memorizados(clave, Z, _tc_nombre, _params, _fvp, _fvv, _tca, _vida, _periodos=None):
+    return esals_persistentes(cache_persistente(), Z, _tc_nombre, _params, _fvp, _fvv, _tca, _vida, _periodos)
+
+# Nodos "ejes" y "Esal1..3" del grafo: pasan por las funciones memorizadas, así que la tabla de ejes
+# y los ESAL's se comparten entre sesiones y con las pestañas que leen ejes_memorizados
+def ejes_compartidos(tc_nombre, params, fvp, fvv):
+    return ejes_memorizados(clave_entrada(tc_nombre, params, fvp, fvv), tc_nombre, params, fvp, fvv)
+
+def esals_compartidos(Z, tc_nombre, params, fvp, fvv, tca, vida, periodos=None):
+    clave = clave_entrada(tc_nombre, params, fvp, fvv, tca, vida, periodos)
+    return esals_memorizados(clave, Z, tc_nombre, params, fvp, fvv, tca, vida, periodos)
+
+# Cadena de cálculo con dependencias: en cada rerun solo se recalculan los nodos cuyas entradas cambiaron
+if "grafo_calculo" not in st.session_state:
+    st.session_state.grafo_calculo = grafo_unam(ejes=ejes_compartidos, esals=esals_compartidos)
+grafo = st.session_state.grafo_calculo
+grafo.nuevo_ciclo()
+
+
+# Visor de ayuda y datos del tramo como fragmentos: sus botones y campos solo vuelven a ejecutar
+# su propio bloque, sin repetir la transformación a ejes ni las evaluaciones de ESAL's.
+IMAGE_FOLDER = "imagen"
+TOTAL_IMGS = 12
+# Carpeta servida por Streamlit como app/static (server.enableStaticServing en .streamlit/config.toml)
+CARPETA_ESTATICA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+image_files = [f"unam_{i}.png" for i in range(TOTAL_IMGS)]
+
+# Funciones de navegación
+def ir_al_inicio():
+    st.session_state.img_index = 0
+
+def ir_al_final():
+    st.session_state.img_index = TOTAL_IMGS - 1
+
+def ir_atras():
+    if st.session_state.img_index > 0:
+        st.session_state.img_index -= 1
+
+def ir_adelante():
+    if st.session_state.img_index < TOTAL_IMGS - 1:
+        st.session_state.img_index += 1
+
+@st.fragment
+def visor_ayuda():
+    # Estado de navegación
+    if "img_index" not in st.session_state:
+        st.session_state.img_index = 0
+    mostrar_ayuda = st.checkbox("🔍 Ayuda", value=False, key="mostrar_ayuda")
+    # Botón de descarga del PDF
+    st.download_button(
+        label="📥 Descargar guía (PDF)",
+        data=leer_activo("guia_unam.pdf"),
+        file_name="guia_unam.pdf",
+        mime="application/pdf"
+    )
 
-def calcular_CT(tca, vida):
-    if tca != 0:  # Evita la división por cero
-        CT = ((1 + (tca / 100)) ** vida - 1) / (tca / 100)
-    else:
-        CT = vida  # Si tca es 0, el crecimiento es lineal, CT = vida
+    # Visor de ayuda
+    if mostrar_ayuda:
+        # Botones arriba
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.button("⏮ Inicio", on_click=ir_al_inicio)
+        with col2:
+            st.button("◀ Atrás", on_click=ir_atras)
+        with col3:
+            st.button("▶ Adelante", on_click=ir_adelante)
+        with col4:
+            st.button("⏭ Fin", on_click=ir_al_final)
+
+        # Mostrar imagen centrada con estilo limitado; se sirve como archivo estático (WebP reducido)
+        current_file = os.path.join(IMAGE_FOLDER, image_files[st.session_state.img_index])
+        vecinas = [
+            os.path.join(IMAGE_FOLDER, image_files[i])
+            for i in (st.session_state.img_index - 1, st.session_state.img_index + 1) if 0 <= i < TOTAL_IMGS
+        ]
+        with perfil.etapa("Imagen de ayuda"):
+            img_src = None
+            if st.get_option("server.enableStaticServing"):
+                img_src = publicar_variante(current_file, CARPETA_ESTATICA)
+                precargar(vecinas, CARPETA_ESTATICA)
+            if img_src is None:
+                img_src = data_uri(current_file)
+        # El navegador descarga de antemano las vecinas ya publicadas
+        img_vecinas = "".join(
+            f'<img src="{url}" style="display:none;" alt=""/>'
+            for url in map(url_publicada, vecinas) if url is not None
+        )
+        st.markdown(
+            f"""
+            <div style="text-align:center;">
+                <img src="{img_src}"
+                    style="max-width:100%; max-height:80vh; object-fit:contain;"/>
+                <p style="margin-top:10px;">Imagen {st.session_state.img_index + 1} de {TOTAL_IMGS}</p>
+                {img_vecinas}
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
 
-    return CT
-# Función para codificar la imagen en base64
-def cargar_imagen_base64(ruta):
-    with open(ruta, "rb") as img_file:
-        return base64.b64encode(img_file.read()).decode()
+# Los datos del tramo solo se muestran en la memoria; se guardan en session_state por su key
+@st.fragment
+def datos_tramo():
+    col1, col2 = st.columns(2)
+    with col1:
+        st.text_input("Carretera", value="Tuxtla Gutiérrez - San Cristóbal", key="nombreVia_text")
+        st.text_input("De km", value="52+000", key="kminicio_text")
+    with col2:
+        st.text_input("Tramo", value="Escopetazo - San Cristóbal", key="tramo_text")
+        st.text_input("De km", value="79+650", key="kmfin_text")
 
 # ============================================================================================================ f2
 # Título principal con ícono
@@ -269,7 +276,7 @@ with st.sidebar:
         <p>🛣️ OlverPav UNAM  Versión 1.0 - 2025</p>
     </div>
     """, unsafe_allow_html=True)
-
+perfil.marcar("Entradas (sidebar)")
 
 
 
@@ -278,9 +285,9 @@ with st.sidebar:
 # =============================================================================================================
 
 fcp = calcular_fcp(nc)
-vcp = tdpa * fcp  # TDPA en el carril de proyecto
-fvp = (vcp * 3.65 * vc) / 100  # Vehículos cargados
-fvv = (vcp * 3.65 * (100 - vc)) / 100  # Vehículos vacíos
+grafo.entradas(tc_nombre=tc_nombre, tdpa=tdpa, nc=nc, vc=vc, vida=vida)
+vcp, fvp, fvv = grafo.valor("volumenes")  # TDPA en el carril, vehículos cargados y vacíos
+perfil.marcar("Cálculos base")
 
 # =============================================================================================================
 # 7. Contenido Principal - Tabs
@@ -298,64 +305,17 @@ tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
 
 with tab1:
     st.markdown("<h2 style='text-align: center;'>🚛 Composición vehicular (%)</h2>", unsafe_allow_html=True)
-    # Crear dos columnas para los campos
-    col1, col2, col3, col4, col5, = st.columns(5)
-    
-    with col1:
-        A2 = float(st.text_input("**:red[A2]**", value="85", key="a2_text"))      
-        B2 = float(st.text_input("**:red[B2]**", value="2", key="b2_text"))
-        B36 = float(st.text_input("B3 6 llantas ", value="0", key="b36_text"))
-        B38 = float(st.text_input("B3 8 llantas ", value="0", key="b38_text"))
-        B4 = float(st.text_input("B4 ", value="0", key="b4_text"))
-        C2 = float(st.text_input("**:red[C2]**", value="2", key="c2_text"))
-          
-        
-    with col2:
-        
-        C36 = float(st.text_input("C3 6 llantas", value="0", key="c36_text"))
-        C38 = float(st.text_input("**:red[C3 8 llantas]**", value="2", key="c38_text"))
-        C2R2 = float(st.text_input("C2R2 ", value="0", key="c2r2_text"))
-        C3R2 = float(st.text_input("C3R2 ", value="0", key="c3r2_text"))
-        C3R3 = float(st.text_input("C3R3 ", value="0", key="c3r3_text"))
-        C2R3 = float(st.text_input("C2R3 ", value="0", key="c2r3_text"))
-             
-        
-        
-    with col3:
-
-        T2S1 = float(st.text_input("T2S1 ", value="0", key="t2s1_text"))
-        T2S2 = float(st.text_input("T2S2 ", value="0", key="t2s2_text"))
-        T3S2 = float(st.text_input("**:red[T3S2]**", value="2", key="t3s2_text")) 
-        T3S3 = float(st.text_input("**:red[T3S3]**", value="5", key="t3s3_text"))
-        T2S3 = float(st.text_input("T2S3 ", value="0", key="t2s3_text"))
-        T3S1 = float(st.text_input("T3S1 ", value="0", key="t3s1_text"))
-        
-    with col4:
-
-        T2S1R2 = float(st.text_input("T2S1R2 ", value="0", key="t2s1r2_text"))
-        T2S1R3 = float(st.text_input("T2S1R3 ", value="0", key="t2s1r3_text"))
-        T2S2R2 = float(st.text_input("T2S2R2 ", value="0", key="t2s2r2_text"))
-        T3S1R2 = float(st.text_input("T3S1R2 ", value="0", key="t3s1r2_text"))
-        T3S1R3 = float(st.text_input("T3S1R3 ", value="0", key="t3s1r3_text"))
-        T3S2R2 = float(st.text_input("T3S2R2 ", value="0", key="t3s2r2_text"))        
-
-    with col5:
-
-        T3S2R4 = float(st.text_input("**:red[T3S2R4]**", value="2", key="t3s2r4_text"))
-        T3S2R3 = float(st.text_input("T3S2R3 ", value="0", key="t3s2r3_text"))
-        T3S3S2 = float(st.text_input("T3S3S2 ", value="0", key="t3s3s2_text"))
-        T2S2S2 = float(st.text_input("T2S2S2 ", value="0", key="t2s2s2_text"))
-        T3S2S2 = float(st.text_input("T3S2S2 ", value="0", key="t3s2s2_text"))
-
-    params = {
-        "A2": A2, "B2": B2, "B36": B36, "B38": B38, "B4": B4, "C2": C2,
-        "C36": C36, "C38": C38, "C2R2": C2R2, "C3R2": C3R2, "C3R3": C3R3, "C2R3": C2R3,
-        "T2S1": T2S1, "T2S2": T2S2, "T3S2": T3S2, "T3S3": T3S3, "T2S3": T2S3, "T3S1": T3S1,
-        "T2S1R2": T2S1R2, "T2S1R3": T2S1R3, "T2S2R2": T2S2R2, "T3S1R2": T3S1R2, "T3S1R3": T3S1R3,
-        "T3S2R2": T3S2R2,  "T3S2R4": T3S2R4, "T3S2R3": T3S2R3, "T3S3S2": T3S3S2, "T2S2S2": T2S2S2, "T3S2S2": T3S2S2 
-    }
+    # Un campo por clase del registro (unampav/datos/clases.json), repartidos en cinco columnas
+    params = {}
+    for col, grupo in zip(st.columns(5), np.array_split(np.arange(len(REGISTRO_CLASES)), 5)):
+        with col:
+            for k in grupo:
+                clase = REGISTRO_CLASES[k]
+                etiqueta = f"**:red[{clase['etiqueta']}]**" if clase["resaltada"] else clase["etiqueta"]
+                params[clase["clase"]] = float(st.text_input(etiqueta, value=f"{clase['omision']:g}", key=clase["clave"]))
 
     suma_acumulada = sum(params.values())
+    clave_ejes = clave_entrada(tc_nombre, params, fvp, fvv)
 
     # Mostrar la suma acumulada en el sidebar con indicador visual
     #st.progress(min(suma_acumulada/100, 1.0))
@@ -364,8 +324,35 @@ with tab1:
     else:
         st.warning(f"**Suma:** {suma_acumulada:.1f}% (debe ser 100%)")
 
+    # Tasas de crecimiento por clase y, opcionalmente, un cambio de tasa a mitad de la vida útil
+    with st.expander("📈 Crecimiento por clase vehicular"):
+        tabla_tasas = st.data_editor(
+            pd.DataFrame({
+                "Clase": list(params.keys()),
+                "Tasa (%)": [tca] * len(params),
+                "Tasa después del cambio (%)": [tca] * len(params),
+            }),
+            hide_index=True, key="tasas_clase", disabled=["Clase"], height=300
+        )
+        anio_cambio = st.number_input(
+            "Año de cambio de tasa (0 = sin cambio)", min_value=0, max_value=100,
+            value=0, step=1, key="anio_cambio_tasa"
+        )
+    tasas = tabla_tasas["Tasa (%)"].to_numpy(dtype=float)
+    periodos_tasas = None
+    # Un año de cambio posterior a la vida útil deja solo la primera tasa (ver CrecimientoAcumulado)
+    if anio_cambio > 0:
+        tasas = np.stack([tasas, tabla_tasas["Tasa después del cambio (%)"].to_numpy(dtype=float)])
+        periodos_tasas = [anio_cambio]
+    elif np.all(tasas == tca):
+        tasas = tca  # tasa única: factor CT de siempre
+    clave_esals = clave_entrada(tc_nombre, params, fvp, fvv, tasas, vida, periodos_tasas)
+    grafo.entradas(params=params, tca=tasas, periodos=periodos_tasas)
+    perfil.marcar("Composición vehicular")
+
 with tab2:
-    df_ejes = transformar_vehiculos_a_ejes(tc_nombre, params, fvp, fvv)
+    with perfil.etapa("Transformación a ejes"):
+        df_ejes = grafo.valor("ejes")
 
     st.dataframe(
         df_ejes.style.format({
@@ -381,9 +368,13 @@ with tab2:
         ]),
         height=650
     )
+    perfil.marcar("Tabla de ejes (Styler)")
 
 with tab3:
     # Método UNAM 
+    # Espesores iniciales; se guardan en session_state para que la búsqueda automática pueda reemplazarlos
+    for capa, espesor in (("D1", 5.0), ("D2", 5.0), ("D3", 15.0), ("D4", 15.0)):
+        st.session_state.setdefault(capa, espesor)
     col1, col2, col3 = st.columns(3)
     with col1:
         qu = float(st.text_input("Nivel de confianza %", value="90", key="qu_text"))
@@ -391,7 +382,7 @@ with tab3:
 
     with col2:
         # Cálculo de T
-        T = np.sqrt(np.log(1 / ((1 - Qu) ** 2)))
+        T = calcular_T(Qu)
         st.latex(fr"T = \sqrt{{ \ln \left( \frac{{1}}{{(1 - {Qu})^2}} \right) }} = {T:.4f}")
     with col3:   
         # Título centrado
@@ -401,8 +392,7 @@ with tab3:
         )
 
         # Constantes
-        c1, c2, c3 = 2.515517, 0.802853, 0.010328
-        c4, c5, c6 = 1.432788, 0.189269, 0.001308
+        c1, c2, c3, c4, c5, c6 = CONSTANTES_U
 
         # Mostrarlas en 3 renglones de 2 columnas
         st.markdown(
@@ -429,9 +419,7 @@ with tab3:
         )
 
         # Cálculo de U
-        numerador_U = c1 + c2 * T + c3 * T**2
-        denominador_U = 1 + c4 * T + c5 * T**2 + c6 * T**3
-        U = T - (numerador_U / denominador_U)
+        U = calcular_U(T)
 
         # Renglón 1: Fórmula general
         st.latex(r"U = T - \frac{C_1 + C_2 T + C_3 T^2}{1 + C_4 T + C_5 T^2 + C_6 T^3}")
@@ -449,8 +437,7 @@ with tab3:
         )
 
         # Cálculo de B1 y B2
-        B1 = 0.8477 + 0.12 * U      # Para Bases
-        B2 = 0.4547 + 0.1593 * U    # Para subbase e inferiores
+        B1, B2 = calcular_B(U)      # Para Bases / Para subbase e inferiores
 
         # Fórmulas simbólicas
         st.latex(r"B_1 = 0.8477 + 0.12 \cdot U")
@@ -459,7 +446,7 @@ with tab3:
             unsafe_allow_html=True
         )
 
-        VRS01 = 10 ** B1
+        VRS01 = calcular_VRS0(B1)
         st.latex(fr"VRS_0 = 10^{{B_1}} = {VRS01:.4f}")
 
     with col3:
@@ -474,7 +461,7 @@ with tab3:
             unsafe_allow_html=True
         )
 
-        VRS02 = 10 ** B2
+        VRS02 = calcular_VRS0(B2)
         st.latex(fr"VRS_0 = 10^{{B_2}} = {VRS02:.4f}")
     # Configurar las columnas (más angostas)
     col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
@@ -484,7 +471,7 @@ with tab3:
         st.markdown("&nbsp;", unsafe_allow_html=True)
         st.caption("Carpeta asfáltica (cm)")
         D1 = st.number_input(
-            " ", min_value=0.0, max_value=50.0, value=5.0, step=1.0,
+            " ", min_value=0.0, max_value=50.0, step=1.0,
             key="D1", label_visibility="collapsed"
         )
         
@@ -509,27 +496,29 @@ with tab3:
         vrs1 = float(st.text_input("CBR Base hidráulica", value="80", key="vrs1_text"))        
         st.caption("Base asfáltica (cm)")
         D2 = st.number_input(
-            " ", min_value=0.0, max_value=50.0, value=5.0, step=1.0,
+            " ", min_value=0.0, max_value=50.0, step=1.0,
             key="D2", label_visibility="collapsed"
         )
-        Prof1 = D1 + D2
+        grafo.entradas(D1=D1, D2=D2, vrs1=vrs1, VRS01=VRS01, VRS02=VRS02)
+        Prof1 = grafo.valor("Prof1")
         st.latex(fr"Z_1 = {Prof1:.0f}")
-        Esal1 = esals(Prof1)
+        with perfil.etapa("ESAL Z_1"):
+            Esal1 = grafo.valor("Esal1")
         st.latex(fr"\sum L(Z_1) = {Esal1:,.0f}")
         st.markdown("&nbsp;", unsafe_allow_html=True)
         # Cálculo de fz
-        fz1 = vrs1 / ((VRS01 * (1.5) ** (np.log10(Esal1))))
+        fz1 = grafo.valor("fz1")
         st.latex(fr"fz_1 = {fz1:.4f}")
         st.markdown("&nbsp;", unsafe_allow_html=True)
         # Cálculo final de Z
-        Zg1 = 15 / np.sqrt((1/(1-fz1)**(2/3))-1)
+        Zg1 = grafo.valor("Zg1")
         st.latex(fr"ZG_1 = {Zg1:.0f}")        
-        zge1 = (D1*2)+(D2*1.5)
+        zge1 = grafo.valor("zge1")
         st.markdown("&nbsp;", unsafe_allow_html=True)
                  
         st.latex(fr"ZG1_{{\text{{REAL}}}} = {zge1:.0f}")
 
-        if zge1 >= Zg1:
+        if grafo.valor("cumple1"):
             st.markdown("<div style='text-align: center; font-size:18px; color: green;'>✅ Cumple</div>", unsafe_allow_html=True)
         else:
             st.markdown("<div style='text-align: center; font-size:18px; color: red;'>❌ No cumple</div>", unsafe_allow_html=True)
@@ -540,27 +529,29 @@ with tab3:
         
         st.caption("Base hidráulica (cm)")
         D3 = st.number_input(
-            " ", min_value=0.0, max_value=50.0, value=15.0, step=1.0,
+            " ", min_value=0.0, max_value=50.0, step=1.0,
             key="D3", label_visibility="collapsed"
         )
-        zge2 = (D1*2) + (D2*1.5) + D3
-        Prof2 = D1 + D2 + D3
+        grafo.entradas(D3=D3, vrs2=vrs2)
+        zge2 = grafo.valor("zge2")
+        Prof2 = grafo.valor("Prof2")
         st.latex(fr"Z_2 = {Prof2:.0f}")
-        Esal2 = esals(Prof2)
+        with perfil.etapa("ESAL Z_2"):
+            Esal2 = grafo.valor("Esal2")
         st.latex(fr"\sum L(Z_2) = {Esal2:,.0f}")
         st.markdown("&nbsp;", unsafe_allow_html=True)
         # Cálculo de fz
-        fz2 = vrs2 / ((VRS01 * (1.5) ** (np.log10(Esal2))))
+        fz2 = grafo.valor("fz2")
         st.latex(fr"fz_2 = {fz2:.4f}")
         st.markdown("&nbsp;", unsafe_allow_html=True)
         # Cálculo final de Z
-        Zg2 = 15 / np.sqrt((1/(1-fz2)**(2/3))-1)
+        Zg2 = grafo.valor("Zg2")
         st.latex(fr"ZG_2 = {Zg2:.0f}")
         st.markdown("&nbsp;", unsafe_allow_html=True)
                  
         st.latex(fr"ZG2_{{\text{{REAL}}}} = {zge2:.0f}")
 
-        if zge2 >= Zg2:
+        if grafo.valor("cumple2"):
             st.markdown("<div style='text-align: center; font-size:18px; color: green;'>✅ Cumple</div>", unsafe_allow_html=True)
         else:
             st.markdown("<div style='text-align: center; font-size:18px; color: red;'>❌ No cumple</div>", unsafe_allow_html=True)
@@ -571,103 +562,363 @@ with tab3:
        
         st.caption("Subbase hidráulica (cm)")
         D4 = st.number_input(
-            " ", min_value=0.0, max_value=50.0, value=15.0, step=1.0,
+            " ", min_value=0.0, max_value=50.0, step=1.0,
             key="D4", label_visibility="collapsed"
         )
-        Prof3 = D1 + D2 + D3 + D4
+        grafo.entradas(D4=D4, vrs3=vrs3)
+        Prof3 = grafo.valor("Prof3")
         st.latex(fr"Z_3 = {Prof3:.0f}")
-        Esal3 = esals(Prof3)
+        with perfil.etapa("ESAL Z_3"):
+            Esal3 = grafo.valor("Esal3")
         st.latex(fr"\sum L(Z_3) = {Esal3:,.0f}")
         st.markdown("&nbsp;", unsafe_allow_html=True)
         # Cálculo de fz
-        fz3 = vrs3 / ((VRS02 * (1.5) ** (np.log10(Esal3))))
+        fz3 = grafo.valor("fz3")
         st.latex(fr"fz_3 = {fz3:.4f}")
         st.markdown("&nbsp;", unsafe_allow_html=True)
         # Cálculo final de Z
-        Zg3 = 15 / np.sqrt((1/(1-fz3)**(2/3))-1)
+        Zg3 = grafo.valor("Zg3")
         st.latex(fr"ZG_3 = {Zg3:.0f}")
-        zge3 = (D1*2) + (D2*1.5) + D3 + D4
+        zge3 = grafo.valor("zge3")
         st.markdown("&nbsp;", unsafe_allow_html=True)        
                          
         st.latex(fr"ZG3_{{\text{{REAL}}}} = {zge3:.0f}")
 
-        if zge3 >= Zg3:
+        if grafo.valor("cumple3"):
             st.markdown("<div style='text-align: center; font-size:18px; color: green;'>✅ Cumple</div>", unsafe_allow_html=True)
         else:
             st.markdown("<div style='text-align: center; font-size:18px; color: red;'>❌ No cumple</div>", unsafe_allow_html=True)
+
+    # Espesor requerido en función del nivel de confianza (los ESAL's no cambian con la confianza)
+    with st.expander("📉 Espesor requerido vs. nivel de confianza"):
+        if st.toggle("Calcular la curva", key="ver_confianza"):
+            rango_confianza = st.slider(
+                "Nivel de confianza %", min_value=50.0, max_value=99.9, value=(50.0, 99.9), step=0.1,
+                key="rango_confianza"
+            )
+            niveles = np.linspace(rango_confianza[0], rango_confianza[1], 200)
+            barrido = barrido_confianza(niveles / 100, (vrs1, vrs2, vrs3), (Esal1, Esal2, Esal3))
+            df_barrido = pd.DataFrame(barrido["Zg"], columns=["ZG 1", "ZG 2", "ZG 3"])
+            df_barrido.insert(0, "Nivel de confianza %", niveles)
+            fig_barrido = px.line(
+                df_barrido.melt("Nivel de confianza %", var_name="Revisión", value_name="ZG requerido (cm)"),
+                x="Nivel de confianza %", y="ZG requerido (cm)", color="Revisión",
+                title="Espesor en grava equivalente requerido (cuantil exacto de la normal)"
+            )
+            for zge, nombre in ((zge1, "ZG1 real"), (zge2, "ZG2 real"), (zge3, "ZG3 real")):
+                fig_barrido.add_hline(y=zge, line_dash="dot", line_color="gray", annotation_text=nombre)
+            fig_barrido.add_vline(x=qu, line_dash="dash", line_color="#3B82F6")
+            st.plotly_chart(fig_barrido, key="grafica_confianza")
+            st.caption("Las líneas punteadas son los espesores reales de la estructura; la vertical, el nivel de confianza actual.")
+
+    # ESAL's y espesores requeridos en función de la profundidad, con el perfil real de la estructura
+    with st.expander("📈 ESAL's y ZG en función de la profundidad"):
+        if st.toggle("Calcular las gráficas", key="ver_profundidad"):
+            Z_max = max(100.0, 10.0 * np.ceil(1.25 * Prof3 / 10))
+            df_profundidad = barrido_memorizado(
+                clave_esals, Z_max, (vrs1, vrs2, vrs3), (float(VRS01), float(VRS01), float(VRS02)),
+                tc_nombre, params, fvp, fvv, tasas, vida, periodos_tasas
+            )
+            revisiones = pd.DataFrame({
+                "Z (cm)": [Prof1, Prof2, Prof3], "ESAL's acumulados": [Esal1, Esal2, Esal3],
+                "ZG": [Zg1, Zg2, Zg3], "Revisión": ["Z1", "Z2", "Z3"],
+            })
+            col1, col2 = st.columns(2)
+            with col1:
+                fig_esal = px.line(df_profundidad, x="Z (cm)", y="ESAL's acumulados", log_y=True,
+                                   title="ESAL's acumulados vs. profundidad")
+                fig_esal.add_scatter(x=revisiones["Z (cm)"], y=revisiones["ESAL's acumulados"], mode="markers+text",
+                                     text=revisiones["Revisión"], textposition="top center", name="Revisiones")
+                st.plotly_chart(fig_esal, key="grafica_esal_z")
+            with col2:
+                fig_zg = px.line(
+                    df_profundidad.drop(columns="ESAL's acumulados").melt("Z (cm)", var_name="Curva", value_name="ZG (cm)"),
+                    x="Z (cm)", y="ZG (cm)", color="Curva", title="ZG requerido y grava equivalente real vs. profundidad"
+                )
+                # El perfil real es lineal por tramos: basta evaluarlo en las caras de las capas
+                Z_caras = np.array([0.0, D1, D1 + D2, Prof2, Prof3, Z_max])
+                fig_zg.add_scatter(x=Z_caras, y=grava_equivalente(Z_caras, (D1, D2, D3, D4), COEF_GRAVA),
+                                   mode="lines", name="Grava equivalente real", line=dict(color="black", width=3))
+                fig_zg.add_scatter(x=revisiones["Z (cm)"], y=revisiones["ZG"], mode="markers+text",
+                                   text=revisiones["Revisión"], textposition="top center", name="Revisiones")
+                st.plotly_chart(fig_zg, key="grafica_zg_z")
+            st.caption(
+                "Una capa con el CBR indicado cumple si su cara superior está donde la grava equivalente real "
+                "queda por encima de su curva de ZG requerido."
+            )
+
+    # Mapa de factibilidad para planeación de red: espesor requerido sobre la subrasante
+    with st.expander("🗺️ Mapa de factibilidad (CBR de subrasante × TDPA)"):
+        if st.toggle("Calcular el mapa", key="ver_mapa"):
+            col1, col2 = st.columns(2)
+            with col1:
+                camino_mapa = st.selectbox("Camino Tipo", list(opciones_camino), index=list(opciones_camino).index(tc_nombre),
+                                           key="camino_mapa")
+                rango_cbr = st.slider("CBR de la subrasante (%)", 1.0, 40.0, (2.0, 20.0), step=0.5, key="rango_cbr_mapa")
+            with col2:
+                carriles_mapa = st.selectbox("No.Carriles x S.C.", list(opciones_ncarriles), index=nc - 1, key="carriles_mapa")
+                rango_tdpa = st.slider("TDPA ambos sentidos", 100, 100_000, (500, 50_000), step=100, key="rango_tdpa_mapa")
+            vrs_mapa = np.linspace(rango_cbr[0], rango_cbr[1], 120)
+            tdpa_mapa = np.geomspace(rango_tdpa[0], rango_tdpa[1], 120)
+            mapa = mapa_memorizado(params, vc, tasas, vida, float(VRS02), vrs_mapa, tdpa_mapa, periodos_tasas)
+            fig_mapa = px.imshow(
+                mapa[list(opciones_camino).index(camino_mapa), opciones_ncarriles[carriles_mapa] - 1],
+                x=tdpa_mapa, y=vrs_mapa, origin="lower", aspect="auto", color_continuous_scale="Viridis",
+                labels=dict(x="TDPA ambos sentidos", y="CBR subrasante (%)", color="ZG (cm)"),
+                title="Espesor total en grava equivalente requerido sobre la subrasante"
+            )
+            fig_mapa.add_scatter(x=[tdpa], y=[vrs3], mode="markers", marker=dict(color="red", size=10, symbol="x"),
+                                 name="Proyecto actual")
+            fig_mapa.update_xaxes(type="log")
+            st.plotly_chart(fig_mapa, key="grafica_mapa")
+            st.caption(
+                "Supone que la profundidad de la subrasante es igual al espesor en grava equivalente. "
+                "Las zonas en blanco requieren más de 150 cm."
+            )
+
+    # Pavimento existente: la estructura actual como tramo en servicio
+    def aplicar_sobrecarpeta(espesor):
+        st.session_state.D1 = float(min(50.0, np.ceil(st.session_state.D1 + espesor)))
+
+    with st.expander("🛣️ Pavimento existente: vida remanente y sobrecarpeta"):
+        if st.toggle("Calcular la vida remanente", key="ver_rehabilitacion"):
+            st.caption("Los espesores y CBR's actuales se toman como la estructura en servicio desde el año 0.")
+            estructura_existente = (D1, D2, D3, D4)
+            remanente, espesor_sobrecarpeta = rehabilitacion_memorizada(
+                clave_esals, estructura_existente, (vrs1, vrs2, vrs3), float(VRS01), float(VRS02), vida,
+                max(50, int(np.ceil(vida))), tc_nombre, params, fvp, fvv, tasas, periodos_tasas
+            )
+            col1, col2, col3, col4 = st.columns(4)
+            for col, nombre, anios in zip((col1, col2, col3), ("Revisión Z1", "Revisión Z2", "Revisión Z3"), remanente):
+                col.metric(f"Vida remanente {nombre}", "> horizonte" if np.isinf(anios) else f"{anios:.1f} años")
+            if np.isnan(espesor_sobrecarpeta):
+                col4.metric("Sobrecarpeta", "> 50 cm")
+            else:
+                col4.metric(f"Sobrecarpeta para {vida:g} años", f"{espesor_sobrecarpeta:.1f} cm")
+                if espesor_sobrecarpeta > 0:
+                    st.button("Agregar la sobrecarpeta a la carpeta (D1)", on_click=aplicar_sobrecarpeta,
+                              args=(espesor_sobrecarpeta,))
+
+    # Búsqueda automática de la estructura mínima que cumple las tres revisiones
+    def aplicar_espesores_optimos(entradas, minimos, criterio, periodos):
+        resultado = buscar_espesores(*entradas, minimos=minimos, maximos=50.0, paso=1.0, criterio=criterio,
+                                     periodos=periodos)
+        if resultado is None:
+            st.session_state.optimo_mensaje = "Ninguna combinación de espesores entre 0 y 50 cm cumple las tres revisiones."
+        else:
+            st.session_state.D1, st.session_state.D2, st.session_state.D3, st.session_state.D4 = resultado
+            st.session_state.optimo_mensaje = None
+
+    with st.expander("🔧 Búsqueda automática de espesores mínimos"):
+        criterio_nombre = st.radio(
+            "Criterio", ["Menor espesor total", "Mínimo por orden de capas (D1, D2, D3, D4)"],
+            horizontal=True, key="criterio_optimo"
+        )
+        st.caption("Espesores mínimos por capa (cm)")
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            min1 = st.number_input("Carpeta", min_value=0.0, max_value=50.0, value=0.0, step=1.0, key="min_D1")
+        with col2:
+            min2 = st.number_input("Base asfáltica", min_value=0.0, max_value=50.0, value=0.0, step=1.0, key="min_D2")
+        with col3:
+            min3 = st.number_input("Base hidráulica", min_value=0.0, max_value=50.0, value=0.0, step=1.0, key="min_D3")
+        with col4:
+            min4 = st.number_input("Subbase hidráulica", min_value=0.0, max_value=50.0, value=0.0, step=1.0, key="min_D4")
+        st.button(
+            "Buscar espesores", on_click=aplicar_espesores_optimos,
+            args=(
+                (tc_nombre, params, fvp, fvv, tasas, vida, vrs1, vrs2, vrs3, VRS01, VRS02),
+                (min1, min2, min3, min4),
+                "total" if criterio_nombre == "Menor espesor total" else "capas",
+                periodos_tasas,
+            )
+        )
+        if st.session_state.get("optimo_mensaje"):
+            st.warning(st.session_state.optimo_mensaje)
+
+    # Estructuras de menor costo: frente de Pareto costo vs. margen de seguridad
+    def aplicar_estructura_economica():
+        espesores = st.session_state.frente_costos[0]
+        st.session_state.D1, st.session_state.D2, st.session_state.D3, st.session_state.D4 = (
+            float(d) for d in espesores[0]
+        )
+
+    with st.expander("💰 Estructura de menor costo"):
+        if st.toggle("Calcular costos", key="ver_costos"):
+            st.caption("Costos unitarios por m³ (los mínimos por capa son los de la búsqueda automática)")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                costo1 = st.number_input("Carpeta", min_value=0.0, value=3500.0, step=50.0, key="costo_D1")
+            with col2:
+                costo2 = st.number_input("Base asfáltica", min_value=0.0, value=2800.0, step=50.0, key="costo_D2")
+            with col3:
+                costo3 = st.number_input("Base hidráulica", min_value=0.0, value=650.0, step=50.0, key="costo_D3")
+            with col4:
+                costo4 = st.number_input("Subbase hidráulica", min_value=0.0, value=450.0, step=50.0, key="costo_D4")
+            if st.button("Calcular frente de Pareto"):
+                st.session_state.frente_costos = frente_memorizado(
+                    clave_esals, (vrs1, vrs2, vrs3), float(VRS01), float(VRS02), (costo1, costo2, costo3, costo4),
+                    (min1, min2, min3, min4), tc_nombre, params, fvp, fvv, tasas, vida, periodos_tasas
+                )
+            if "frente_costos" in st.session_state:
+                espesores, costo, margen = st.session_state.frente_costos
+                if len(costo) == 0:
+                    st.warning("Ninguna combinación de espesores entre 0 y 50 cm cumple las tres revisiones.")
+                else:
+                    df_frente = pd.DataFrame(espesores, columns=["D1 (cm)", "D2 (cm)", "D3 (cm)", "D4 (cm)"])
+                    df_frente["Costo ($/m²)"] = costo
+                    df_frente["Margen mínimo (cm)"] = margen
+                    fig_frente = px.line(
+                        df_frente, x="Costo ($/m²)", y="Margen mínimo (cm)", markers=True,
+                        hover_data=["D1 (cm)", "D2 (cm)", "D3 (cm)", "D4 (cm)"],
+                        title="Frente de Pareto: costo vs. margen de seguridad (zge − Zg)"
+                    )
+                    st.plotly_chart(fig_frente, key="grafica_frente")
+                    st.dataframe(df_frente.style.format("{:,.2f}"), hide_index=True, height=250)
+                    st.button("Aplicar la estructura más económica", on_click=aplicar_estructura_economica)
+
+    # Análisis probabilístico de la estructura actual
+    with st.expander("🎲 Análisis probabilístico (Monte Carlo)"):
+        if st.toggle("Configurar la simulación", key="ver_monte_carlo"):
+            st.caption("Parámetro 1: media o mínimo · Parámetro 2: desviación estándar o máximo")
+            distribuciones_omision = pd.DataFrame({
+                "Variable": ["CBR Base hidráulica", "CBR Subbase hidráulica", "CBR Subrasante",
+                             "TDPA ambos Sc", "Tas.crec.anual(%)", "Veh.cargados(%)"],
+                "Distribución": ["Normal", "Normal", "Lognormal", "Lognormal", "Normal", "Normal"],
+                "Parámetro 1": [vrs1, vrs2, vrs3, tdpa, tca, vc],
+                "Parámetro 2": [0.2 * vrs1, 0.2 * vrs2, 0.2 * vrs3, 0.15 * tdpa, 1.0, 5.0],
+            })
+            tabla_distribuciones = st.data_editor(
+                distribuciones_omision, hide_index=True, key="distribuciones_mc",
+                disabled=["Variable"],
+                column_config={
+                    "Distribución": st.column_config.SelectboxColumn(
+                        options=["Constante", "Normal", "Lognormal", "Uniforme"], required=True
+                    )
+                }
+            )
+            n_muestras = st.select_slider(
+                "Número de muestras", options=[10_000, 100_000, 500_000, 1_000_000], value=100_000, key="n_muestras_mc"
+            )
+            if st.button("Simular"):
+                distribuciones = {}
+                for variable, (_, fila) in zip(VARIABLES_ALEATORIAS, tabla_distribuciones.iterrows()):
+                    tipo = fila["Distribución"].lower()
+                    if tipo == "constante":
+                        distribuciones[variable] = fila["Parámetro 1"]
+                    else:
+                        distribuciones[variable] = (tipo, fila["Parámetro 1"], fila["Parámetro 2"])
+                st.session_state.resultado_mc = simular_falla(
+                    tc_nombre, params, nc, vida, (D1, D2, D3, D4), VRS01, VRS02, distribuciones, n=n_muestras
+                )
+            if "resultado_mc" in st.session_state:
+                resultado_mc = st.session_state.resultado_mc
+                col1, col2, col3, col4 = st.columns(4)
+                for col, nombre, p in zip(
+                    (col1, col2, col3, col4),
+                    ("Pf revisión 1", "Pf revisión 2", "Pf revisión 3", "Pf estructura"),
+                    list(resultado_mc["prob_falla"]) + [resultado_mc["prob_global"]]
+                ):
+                    col.metric(nombre, f"{100 * p:.2f} %")
+                st.caption(
+                    f"{resultado_mc['n']:,} muestras · intervalo de confianza 95 % de la estructura: "
+                    f"{100 * resultado_mc['intervalo'][0, 3]:.2f} % – {100 * resultado_mc['intervalo'][1, 3]:.2f} %"
+                )
+
+    # Estructura con cualquier número de capas (estabilizadas, subyacente, terracería mejorada, ...)
+    with st.expander("🧱 Estructura de N capas"):
+        if st.toggle("Revisar la estructura", key="ver_capas"):
+            st.caption("Deje el CBR vacío en las capas asfálticas. Cada capa con CBR se revisa en su cara superior.")
+            capas_omision = estructura_unam(D1, D2, D3, D4, vrs1, vrs2, vrs3)
+            tabla_capas = st.data_editor(
+                pd.DataFrame({
+                    "Capa": [c.nombre for c in capas_omision],
+                    "Espesor (cm)": [c.espesor for c in capas_omision],
+                    "Coeficiente": [c.coeficiente for c in capas_omision],
+                    "CBR (%)": [c.vrs for c in capas_omision],
+                    "VRS0": ["Bases (B1)" if c.base else "Terracerías (B2)" for c in capas_omision],
+                }),
+                hide_index=True, num_rows="dynamic", key="capas_n",
+                column_config={
+                    "Espesor (cm)": st.column_config.NumberColumn(min_value=0.0, required=True),
+                    "Coeficiente": st.column_config.NumberColumn(min_value=0.0, required=True),
+                    "CBR (%)": st.column_config.NumberColumn(min_value=0.0),
+                    "VRS0": st.column_config.SelectboxColumn(options=["Bases (B1)", "Terracerías (B2)"], required=True),
+                }
+            )
+            capas = [
+                Capa(
+                    str(fila["Capa"]), float(fila["Espesor (cm)"]), float(fila["Coeficiente"]),
+                    None if pd.isna(fila["CBR (%)"]) else float(fila["CBR (%)"]), fila["VRS0"] != "Terracerías (B2)"
+                )
+                for _, fila in tabla_capas.dropna(subset=["Espesor (cm)", "Coeficiente"]).iterrows()
+            ]
+            if any(c.vrs is not None for c in capas):
+                revision = revisar_capas(capas, tc_nombre, params, fvp, fvv, tasas, vida, VRS01, VRS02,
+                                         periodos=periodos_tasas)
+                st.dataframe(
+                    pd.DataFrame({
+                        "Capa revisada": revision["capa"],
+                        "Z (cm)": revision["Z"],
+                        "ΣL": revision["esal"],
+                        "fz": revision["fz"],
+                        "ZG requerido": revision["Zg"],
+                        "ZG real": revision["zge"],
+                        "Cumple": np.where(revision["cumple"], "✅", "❌"),
+                    }).style.format({"Z (cm)": "{:.0f}", "ΣL": "{:,.0f}", "fz": "{:.4f}",
+                                     "ZG requerido": "{:.0f}", "ZG real": "{:.0f}"}),
+                    hide_index=True
+                )
+
+    # Alternativas del mismo tramo evaluadas juntas; las de igual tránsito comparten ejes y ESAL's
+    with st.expander("⚖️ Comparación de alternativas"):
+        if st.toggle("Comparar alternativas", key="ver_escenarios"):
+            st.caption("Deje vacíos TDPA, tasa o vida para usar los del tramo. Cada renglón es una alternativa.")
+            tabla_escenarios = st.data_editor(
+                pd.DataFrame({
+                    "Alternativa": ["Actual", "Carpeta +2 cm", "TDPA +20 %"],
+                    "D1": [D1, D1 + 2, D1], "D2": [D2] * 3, "D3": [D3] * 3, "D4": [D4] * 3,
+                    "CBR base": [vrs1] * 3, "CBR subbase": [vrs2] * 3, "CBR subrasante": [vrs3] * 3,
+                    "TDPA": [np.nan, np.nan, 1.2 * tdpa], "Tasa %": [np.nan] * 3, "Vida": [np.nan] * 3,
+                }),
+                hide_index=True, num_rows="dynamic", key="escenarios",
+                column_config={
+                    **{c: st.column_config.NumberColumn(min_value=0.0, required=True)
+                       for c in ("D1", "D2", "D3", "D4", "CBR base", "CBR subbase", "CBR subrasante")},
+                    "TDPA": st.column_config.NumberColumn(min_value=0.0),
+                    "Vida": st.column_config.NumberColumn(min_value=1.0),
+                }
+            )
+            escenarios = tabla_escenarios.dropna(
+                subset=["D1", "D2", "D3", "D4", "CBR base", "CBR subbase", "CBR subrasante"]
+            )
+            if len(escenarios):
+                df_comparacion = comparacion_memorizada(
+                    clave_esals, escenarios, tdpa, nc, vc, float(VRS01), float(VRS02),
+                    tc_nombre, params, tasas, vida, periodos_tasas
+                )
+                st.dataframe(
+                    df_comparacion.style.format(
+                        {c: "{:.0f}" for c in df_comparacion.columns if c.startswith("ZG")}
+                    ),
+                    hide_index=True
+                )
+    perfil.marcar("Definición de espesores")
 with tab4:
     # Solo ejes equivalentes
     
     # Ingreso de la profundidad de daño Z (profz) con input numérico
     st.markdown("### 📏 Profundidad de daño")
     Z = float(st.text_input("Z (cm)", value="5", key="Z_text"))    
-    # Cálculo del esfuerzo vertical de un eje estandar
-    sigma_z_st = 5.8 * (1 - (Z**3) / ((15**2 + Z**2)**(3/2)))
     # Clonar el DataFrame para trabajar en esta pestaña
     #df_tab2 = df.copy()
-    df_tab2 = transformar_vehiculos_a_ejes(tc_nombre, params, fvp, fvv)
-    # Crear la nueva columna "Radio placa" inicializada con NaN
-    df_tab2["Radio placa"] = np.nan
-    # Llenar las filas 0 a 6
-    # Llenar las filas 0 a 6
-    for i in range(8):  # De la fila 0 a la 6 inclusive
-        P = df_tab2.loc[i, "Cargas (Ton)"]
-        q = 2 if i == 0 else 6  # q=2 para la fila 0, q=6 para las demás
-        radio_placa = np.sqrt((1000 * P) / (2 * np.pi * q))
-        df_tab2.loc[i, "Radio placa"] = radio_placa
-    for i in range(8, 14):  # De la fila 7 a la 16 inclusive
-        P = df_tab2.loc[i, "Cargas (Ton)"]
-        q = 6  # q = 6 en todas estas filas
-        if Z < 30:
-            radio_placa = np.sqrt((1000 * P) / (4 * np.pi * q))
-        else:
-            radio_placa = np.sqrt((1111 * P) / (4 * np.pi * q))
-        df_tab2.loc[i, "Radio placa"] = radio_placa
-    for i in range(14, 17):  
-        P = df_tab2.loc[i, "Cargas (Ton)"]
-        q = 6
-        if Z < 30:
-            radio_placa = np.sqrt((1000 * P) / (6 * np.pi * q))
-        else:
-            radio_placa = np.sqrt((1333 * P) / (6 * np.pi * q))
-        df_tab2.loc[i, "Radio placa"] = radio_placa
-    # Crear una nueva columna "Esfuerzo vert."
-    esfuerzo_vert = []
-     
-    for i, row in df_tab2.iterrows():
-        a = row['Radio placa']  # Tomamos 'a' de la columna
-        if i == 0:
-            q = 2
-        else:
-            q = 6
-
-        numerador = Z**3
-        denominador = (a**2 + Z**2)**(1.5)
-                
-        sigma_z = q * (1 - (numerador / denominador))
-        esfuerzo_vert.append(sigma_z)
-    
-    # Asignar la columna al DataFrame
-    df_tab2["Esfuerzo vert."] = esfuerzo_vert
-    # Crear lista para el daño unitario
-    daño_unitario = []
-    for i, row in df_tab2.iterrows():
-        sigma_z_i = row['Esfuerzo vert.']  # Tomamos el esfuerzo vertical de la fila
-                
-        # Definir el valor de N dependiendo de la fila y de Z_value
-        if i <= 7:
-            N = 1
-        elif 8 <= i <= 13:
-            N = 2 if Z < 30 else 1
-        else:
-            N = 3 if Z < 30 else 1
-
-        # Calcular daño unitario usando la fórmula dada
-        d = (10 ** ((np.log10(sigma_z_i) - np.log10(sigma_z_st)) / np.log10(1.5)))*N
-
-        daño_unitario.append(d)
-    # Asignar la columna al DataFrame
-    df_tab2["Daño unitario"] = daño_unitario
+    with perfil.etapa("Transformación a ejes"):
+        df_tab2 = ejes_memorizados(clave_ejes, tc_nombre, params, fvp, fvv)
+    # Radio de placa y esfuerzo vertical de las 17 filas en una sola pasada; daño unitario desde la tabla
+    cargas_tab2 = df_tab2["Cargas (Ton)"].to_numpy()
+    df_tab2["Radio placa"] = radio_placa(Z, cargas_tab2)
+    df_tab2["Esfuerzo vert."] = esfuerzo_vertical(Z, df_tab2["Radio placa"].to_numpy())
+    df_tab2["Daño unitario"] = danio_tabla(Z, tc_nombre)
     # Crear nueva columna "Ejes Equivalentes"
     df_tab2["Ejes Equivalentes"] = df_tab2["Ejes 1er Año"] * df_tab2["Daño unitario"]
     # Primero, configuramos el botón de Mostrar/Ocultar
@@ -716,78 +967,36 @@ with tab4:
     </div>
     """, unsafe_allow_html=True)
     # Cálculo de CT
-    CT = calcular_CT(tca, vida)    
-    ESALs = CT * total_ejes_equivalentes
+    if np.ndim(tasas) == 0:
+        CT = calcular_CT(tca, vida)    
+        ESALs = CT * total_ejes_equivalentes
+    else:
+        # Con tasas por clase, cada clase acumula sus propias repeticiones en la vida útil
+        ejes_vida = ejes_acumulados(composicion_vector(params), fvp, fvv, calcular_CT_clases(tasas, vida, periodos_tasas))
+        ESALs = np.sum(ejes_vida * df_tab2["Daño unitario"].to_numpy())
 
     # Mostrar el resultado
     st.markdown("### 🚛 ESAL'S acumulados en la vida de proyecto")
     st.metric("ESAL's en la vida útil", f"{ESALs:,.2f}")
 
-    with tab5:
-        # Ayuda tutorial con el método   
-
-        # Parámetros
-        IMAGE_FOLDER = "imagen"
-        TOTAL_IMGS = 12
-        image_files = [f"unam_{i}.png" for i in range(TOTAL_IMGS)]
-
-        # Estado de navegación
-        if "img_index" not in st.session_state:
-            st.session_state.img_index = 0
-        mostrar_ayuda = st.checkbox("🔍 Ayuda", value=False)
-        # Botón de descarga del PDF en el sidebar
-        with open("guia_unam.pdf", "rb") as pdf_file:
-            st.download_button(
-                label="📥 Descargar guía (PDF)",
-                data=pdf_file,
-             file_name="guia_unam.pdf",
-            mime="application/pdf"
-        )
-        # Funciones de navegación
-        def ir_al_inicio():
-            st.session_state.img_index = 0
-
-        def ir_al_final():
-            st.session_state.img_index = TOTAL_IMGS - 1
-
-        def ir_atras():
-            if st.session_state.img_index > 0:
-                st.session_state.img_index -= 1
-
-        def ir_adelante():
-            if st.session_state.img_index < TOTAL_IMGS - 1:
-                st.session_state.img_index += 1
-
-        # Visor de ayuda
-        if mostrar_ayuda:
-    
+    # Espectro de cargas medido (pesaje en movimiento) en lugar de las 17 filas de cargas fijas
+    with st.expander("📡 Espectro de cargas de pesaje (WIM)"):
+        st.caption("Archivo .npz generado con: python -m unampav.wim pesajes.csv espectro.npz")
+        archivo_espectro = st.file_uploader("Espectro de cargas (.npz)", type="npz", key="espectro_wim")
+        dias_registro = st.number_input("Días registrados", min_value=1.0, value=365.0, step=1.0, key="dias_wim")
+        if archivo_espectro is not None:
+            espectro = espectro_memorizado(archivo_espectro.getvalue())
+            col1, col2 = st.columns(2)
+            col1.metric("Ejes registrados", f"{espectro.total:,}")
+            col2.metric(
+                "ESAL's en la vida útil (espectro)",
+                f"{esals_espectro(Z, espectro, tca, vida, 365 / dias_registro):,.2f}"
+            )
+    perfil.marcar("Solo ejes equivalentes")
 
-         # Botones arriba
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.button("⏮ Inicio", on_click=ir_al_inicio)
-            with col2:
-                st.button("◀ Atrás", on_click=ir_atras)
-            with col3:
-                st.button("▶ Adelante", on_click=ir_adelante)
-            with col4:
-                st.button("⏭ Fin", on_click=ir_al_final)
-
-            # Mostrar imagen centrada con estilo limitado
-            current_file = os.path.join(IMAGE_FOLDER, image_files[st.session_state.img_index])
-            with open(current_file, "rb") as file:
-                img_bytes = file.read()
-                img_base64 = base64.b64encode(img_bytes).decode("utf-8")
-                st.markdown(
-                    f"""
-                    <div style="text-align:center;">
-                        <img src="data:image/png;base64,{img_base64}"
-                            style="max-width:100%; max-height:80vh; object-fit:contain;"/>
-                        <p style="margin-top:10px;">Imagen {st.session_state.img_index + 1} de {TOTAL_IMGS}</p>
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
+    with tab5:
+        visor_ayuda()
+        perfil.marcar("Ayuda y guía")
     with tab6:
          # Título centrado
         st.markdown(
@@ -797,13 +1006,7 @@ with tab4:
         # 👇 Línea en blanco como separación
        
 
-        col1, col2 = st.columns(2)
-        with col1:
-            nombreVia = st.text_input("Carretera", value="Tuxtla Gutiérrez - San Cristóbal", key="nombreVia_text")
-            kminicio = st.text_input("De km", value="52+000", key="kminicio_text")
-        with col2:
-            tramo = st.text_input("Tramo", value="Escopetazo - San Cristóbal", key="tramo_text")
-            kmfin = st.text_input("De km", value="79+650", key="kmfin_text")
+        datos_tramo()
         st.markdown(
             "<div style='text-align: left; font-size:20px; font-weight:600;'>A) Datos generales:</div>",
             unsafe_allow_html=True
@@ -828,7 +1031,7 @@ with tab4:
         )      
 
             st.markdown(
-            fr"<div style='text-align: left; font-size:18px;'>5. Tasa crecimiento anual % :&nbsp;&nbsp;{tca}</div>",
+            fr"<div style='text-align: left; font-size:18px;'>5. Tasa crecimiento anual % :&nbsp;&nbsp;{tca}{'' if np.ndim(tasas) == 0 else ' (tasas por clase)'}</div>",
             unsafe_allow_html=True
         )      
 
@@ -898,7 +1101,7 @@ with tab4:
             st.markdown(
             "<div style='text-align: center; font-size:20px; font-weight:600;'>C) Transformar vehículos a ejes 1er año</div>", unsafe_allow_html=True)
             st.markdown("<br>", unsafe_allow_html=True)
-            df_ejes = transformar_vehiculos_a_ejes(tc_nombre, params, fvp, fvv)
+            df_ejes = ejes_memorizados(clave_ejes, tc_nombre, params, fvp, fvv)
 
             # Filtrar filas donde "Ejes 1er Año" sea mayor a 0
             df_ejes_filtrado = df_ejes[df_ejes["Ejes 1er Año"] > 0]
@@ -983,4 +1186,34 @@ with tab4:
             st.markdown(
             fr"<div style='text-align: right; font-size:18px;'>Sub-base hidráulica:&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;{D4}</div>",
             unsafe_allow_html=True
-        )
\ No newline at end of file
+        )
+perfil.marcar("Memoria de cálculo")
+
+# =============================================================================================================
+# 8. Tiempos por etapa (solo con el perfilador activo)
+# =============================================================================================================
+registro_perfil = perfil.terminar()
+if registro_perfil is not None:
+    with st.sidebar.expander("⏱️ Tiempos por etapa"):
+        st.metric("Rerun", f"{registro_perfil['total_ms']:,.1f} ms")
+        st.dataframe(
+            pd.DataFrame(registro_perfil["etapas"].items(), columns=["Etapa", "ms"])
+            .sort_values("ms", ascending=False).style.format({"ms": "{:,.1f}"}),
+            hide_index=True
+        )
+        # Histograma de los últimos reruns de la sesión
+        historial_perfil = pd.DataFrame(
+            [(etapa, ms) for r in perfil.historial for etapa, ms in r["etapas"].items()],
+            columns=["Etapa", "ms"]
+        )
+        st.plotly_chart(
+            px.histogram(historial_perfil, x="ms", color="Etapa", nbins=30, height=320)
+            .update_layout(showlegend=False, margin=dict(l=0, r=0, t=10, b=0)),
+            key="histograma_perfil"
+        )
+        st.caption(f"{len(perfil.historial)} reruns en el historial")
+        st.caption("Nodos recalculados: " + (", ".join(grafo.recalculados) or "ninguno"))
+        st.download_button(
+            "📥 Exportar (JSON lines)", perfil.jsonl(), file_name="perfil_unampav.jsonl",
+            mime="application/jsonl"
+        )
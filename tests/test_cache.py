@@ -0,0 +1,104 @@
+import itertools
+import multiprocessing
+import types
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from unampav import CLASES_VEHICULARES, CachePersistente, calcular_volumenes, clave_entrada, composicion_vector
+from unampav import cache
+
+PARAMS = {clase: 0.0 for clase in CLASES_VEHICULARES}
+PARAMS.update(A2=85, B2=2, C2=2, C38=2, T3S2=2, T3S3=5, T3S2R4=2)
+_, FVP, FVV = calcular_volumenes(7500, 1, 80)
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Marcas de uso consecutivas: el orden LRU no depende de la resolución del reloj."""
+    monkeypatch.setattr(cache, "time", types.SimpleNamespace(time=itertools.count().__next__))
+
+
+def test_desalojo_lru(tmp_path, reloj):
+    c = CachePersistente(str(tmp_path / "cache.db"), max_entradas=3)
+    for clave in "abc":
+        c.guardar(clave, clave.upper())
+    assert c.obtener("a") == "A"  # "a" pasa a ser la más reciente
+    c.guardar("d", "D")
+    assert len(c) == 3
+    assert c.obtener("b") is None
+    assert [c.obtener(clave) for clave in "acd"] == ["A", "C", "D"]
+    # Reemplazar una clave existente no desaloja a nadie
+    c.guardar("a", "A2")
+    assert len(c) == 3 and c.obtener("a") == "A2"
+
+
+def test_memorizar_calcula_una_vez(tmp_path):
+    c = CachePersistente(str(tmp_path / "cache.db"))
+    llamadas = []
+
+    def cuadrado(x):
+        llamadas.append(x)
+        return np.arange(x) ** 2
+
+    for _ in range(3):
+        np.testing.assert_array_equal(c.memorizar("k", cuadrado, 4), [0, 1, 4, 9])
+    assert llamadas == [4]
+    # Otra instancia sobre el mismo archivo (otra réplica) ve el resultado
+    np.testing.assert_array_equal(CachePersistente(c.ruta).memorizar("k", cuadrado, 4), [0, 1, 4, 9])
+    assert llamadas == [4]
+
+
+def test_clave_entrada_estable():
+    clave = clave_entrada("ET y A", PARAMS, FVP, FVV)
+    # La clave va a disco: no debe cambiar entre procesos ni versiones sin invalidar la caché a propósito
+    assert clave == "1bafc86159a58a06c898c4d626ba51f099a719b92a1ecb6e8786e5cc8e0d22bf"
+    assert clave_entrada("ET y A", PARAMS, FVP, FVV, 3.5, 15) == (
+        "9c778b704de7daa75802e6330f887e9edf54c58775f523d6fce00f19de222893")
+    # Misma clave con el diccionario en otro orden, con el vector de composición y con tasa y vida enteras
+    assert clave_entrada("ET y A", dict(reversed(list(PARAMS.items()))), FVP, FVV) == clave
+    assert clave_entrada("ET y A", composicion_vector(PARAMS), FVP, FVV) == clave
+    assert (clave_entrada("ET y A", PARAMS, FVP, FVV, 3, 15)
+            == clave_entrada("ET y A", PARAMS, FVP, FVV, 3.0, 15.0))
+
+
+def test_clave_entrada_distingue_cada_entrada():
+    otra = dict(PARAMS, A2=84)
+    claves = {
+        clave_entrada("ET y A", PARAMS, FVP, FVV),
+        clave_entrada("ET y B", PARAMS, FVP, FVV),
+        clave_entrada("ET y A", otra, FVP, FVV),
+        clave_entrada("ET y A", PARAMS, FVP + 1, FVV),
+        clave_entrada("ET y A", PARAMS, FVP, FVV, 3.5, 15),
+        clave_entrada("ET y A", PARAMS, FVP, FVV, 3.5, 20),
+        clave_entrada("ET y A", PARAMS, FVP, FVV, 3.0, 15),
+        clave_entrada("ET y A", PARAMS, FVP, FVV, [3.5, 1.0], 15, [5]),
+        clave_entrada("ET y A", PARAMS, FVP, FVV, [3.5, 1.0], 15, [8]),
+        clave_entrada("ET y A", PARAMS, FVP, FVV, np.full(len(CLASES_VEHICULARES), 3.5), 15),
+    }
+    assert len(claves) == 10
+
+
+def _escribir(ruta, proceso, n=40):
+    c = CachePersistente(ruta, max_entradas=1000)
+    for i in range(n):
+        c.guardar(f"{proceso}:{i}", (proceso, i))
+        assert c.obtener(f"{proceso}:{i}") == (proceso, i)
+    return n
+
+
+def test_escritores_concurrentes(tmp_path):
+    ruta = str(tmp_path / "cache.db")
+    CachePersistente(ruta)  # crea la tabla antes de que compitan los procesos
+    # Procesos independientes, como réplicas: SQLite no admite heredar conexiones por fork
+    with ProcessPoolExecutor(4, mp_context=multiprocessing.get_context("spawn")) as procesos:
+        assert sum(procesos.map(_escribir, [ruta] * 4, range(4))) == 160
+    # Hilos sobre una misma instancia: cada uno con su conexión
+    compartida = CachePersistente(ruta, max_entradas=1000)
+    with ThreadPoolExecutor(4) as hilos:
+        assert sum(hilos.map(lambda p: _escribir(ruta, p), range(4, 8))) == 160
+        list(hilos.map(lambda i: compartida.memorizar(f"hilo:{i}", pow, i, 2), range(50)))
+    assert len(compartida) == 370
+    assert all(compartida.obtener(f"{p}:{i}") == (p, i) for p in range(8) for i in range(40))
+    assert [compartida.obtener(f"hilo:{i}") for i in range(50)] == [i ** 2 for i in range(50)]
@@ -0,0 +1,34 @@
+import numpy as np
+
+from unampav import calcular_B, calcular_fz, calcular_T, calcular_U, calcular_VRS0, calcular_ZG
+
+
+def zg_original(fz):
+    """Fórmula de la versión original de pav25.py (NaN con fz > 1)."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return 15 / np.sqrt((1 / (1 - fz) ** (2 / 3)) - 1)
+
+
+def test_zg_coincide_con_la_formula_original_para_fz_menor_a_1():
+    fz = np.linspace(0.01, 0.99, 50)
+    np.testing.assert_allclose(calcular_ZG(fz), zg_original(fz), rtol=1e-12)
+
+
+def test_zg_es_cero_con_fz_mayor_o_igual_a_1():
+    # La fórmula original da NaN (y la revisión "No cumple"); aquí el material resiste solo
+    fz = np.array([1.0, 1.2, 3.0])
+    assert np.isnan(zg_original(fz[1:])).all()
+    np.testing.assert_array_equal(calcular_ZG(fz), 0.0)
+    assert calcular_ZG(1.5) == 0.0
+    assert np.all(0.0 >= calcular_ZG(fz))  # la revisión cumple aun sin espesor
+
+
+def test_zg_crece_al_disminuir_fz():
+    fz = np.linspace(0.05, 0.95, 20)
+    assert np.all(np.diff(calcular_ZG(fz)) < 0)
+
+
+def test_cadena_de_confianza_valores_de_la_interfaz():
+    B1, B2 = calcular_B(calcular_U(calcular_T(0.90)))
+    assert round(float(calcular_ZG(calcular_fz(80, calcular_VRS0(B1), 19_947_448)))) == 23
+    assert round(float(calcular_ZG(calcular_fz(5, calcular_VRS0(B2), 28_668_133)))) == 78
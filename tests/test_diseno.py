@@ -0,0 +1,120 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from unampav import diseno
+from unampav import (
+    CLASES_VEHICULARES, COEF_GRAVA, buscar_espesores, calcular_B, calcular_fz, calcular_T, calcular_U,
+    calcular_VRS0, calcular_volumenes, calcular_ZG, esals, frente_pareto,
+)
+
+PARAMS = {clase: 0.0 for clase in CLASES_VEHICULARES}
+PARAMS.update(A2=85, B2=2, C2=2, C38=2, T3S2=2, T3S3=5, T3S2R4=2)
+_, FVP, FVV = calcular_volumenes(7500, 1, 80)
+VRS01, VRS02 = (calcular_VRS0(B) for B in calcular_B(calcular_U(calcular_T(0.90))))
+ENTRADAS = ("ET y A", PARAMS, FVP, FVV, 3.5, 15, 80, 30, 5, VRS01, VRS02)
+PASO, MAXIMO = 5.0, 30.0
+
+
+def revisar_una(D):
+    """Margen mínimo zge - Zg de una sola estructura, revisión por revisión."""
+    Z = np.cumsum(D)[1:]
+    zge = np.cumsum(np.multiply(D, COEF_GRAVA))[1:]
+    esal = esals(Z, *ENTRADAS[:6])
+    Zg = calcular_ZG(calcular_fz(np.array([80, 30, 5]), np.array([VRS01, VRS01, VRS02]), esal))
+    return (zge - Zg).min()
+
+
+@pytest.fixture(scope="module")
+def malla():
+    """Todas las estructuras de la malla con su margen, por fuerza bruta."""
+    valores = np.arange(0.0, MAXIMO + PASO / 2, PASO)
+    estructuras = list(itertools.product(valores, repeat=4))
+    return estructuras, np.array([revisar_una(D) for D in estructuras])
+
+
+def test_menor_espesor_total(malla):
+    estructuras, margen = malla
+    cumplen = [D for D, m in zip(estructuras, margen) if m >= 0]
+    # Menor total; en empate, menor D1, luego D2 y D3
+    esperado = min(cumplen, key=lambda D: (sum(D), D))
+    assert buscar_espesores(*ENTRADAS, maximos=MAXIMO, paso=PASO, criterio="total") == esperado
+
+
+def test_minimo_por_orden_de_capas(malla):
+    estructuras, margen = malla
+    esperado = min(D for D, m in zip(estructuras, margen) if m >= 0)
+    assert buscar_espesores(*ENTRADAS, maximos=MAXIMO, paso=PASO, criterio="capas") == esperado
+
+
+def test_respeta_los_minimos_por_capa(malla):
+    estructuras, margen = malla
+    minimos = (10.0, 0.0, 15.0, 0.0)
+    cumplen = [D for D, m in zip(estructuras, margen) if m >= 0 and all(np.greater_equal(D, minimos))]
+    resultado = buscar_espesores(*ENTRADAS, minimos=minimos, maximos=MAXIMO, paso=PASO)
+    assert resultado == min(cumplen, key=lambda D: (sum(D), D))
+    assert revisar_una(resultado) >= 0
+
+
+def test_sin_solucion_y_criterio_invalido():
+    assert buscar_espesores(*ENTRADAS, maximos=5.0, paso=PASO) is None
+    with pytest.raises(ValueError):
+        buscar_espesores(*ENTRADAS, maximos=MAXIMO, paso=PASO, criterio="peso")
+
+
+def revisar_frente(malla, costos):
+    estructuras, margen = malla
+    espesores, costo, seguridad = frente_pareto(*ENTRADAS, costos=costos, maximos=MAXIMO, paso=PASO)
+    cumplen = margen >= 0
+    candidatos = np.array(estructuras)[cumplen]
+    costo_malla = candidatos @ np.asarray(costos, dtype=float) / 100
+    margen_malla = margen[cumplen]
+
+    # Cada punto del frente cumple y trae su propio costo y margen
+    np.testing.assert_allclose(espesores @ np.asarray(costos, dtype=float) / 100, costo)
+    np.testing.assert_allclose([revisar_una(D) for D in espesores], seguridad, atol=1e-9)
+    assert np.all(seguridad >= 0)
+    # Costo y margen estrictamente crecientes: sin repetidos ni puntos dominados dentro del frente
+    assert np.all(np.diff(costo) > 0) and np.all(np.diff(seguridad) > 0)
+    # Ninguna estructura que cumple cuesta lo mismo o menos con un margen mayor
+    for c, m in zip(costo, seguridad):
+        assert not np.any((costo_malla <= c + 1e-9) & (margen_malla > m + 1e-9))
+    # Toda estructura que cumple queda dominada o empatada por algún punto del frente
+    dominada = (costo[:, None] <= costo_malla + 1e-9) & (seguridad[:, None] >= margen_malla - 1e-9)
+    assert dominada.any(axis=0).all()
+    # El primer renglón es la más económica que cumple (en empate, la de mayor margen)
+    barata = np.isclose(costo_malla, costo_malla.min())
+    assert costo[0] == pytest.approx(costo_malla.min())
+    assert seguridad[0] == pytest.approx(margen_malla[barata].max())
+    return espesores, costo, seguridad
+
+
+def test_frente_de_pareto_costos_distintos(malla):
+    espesores, costo, _ = revisar_frente(malla, (3500.0, 2800.0, 650.0, 450.0))
+    assert len(costo) > 1
+
+
+def test_frente_de_pareto_con_empates_de_costo(malla):
+    # Con el mismo costo por capa muchas estructuras empatan en costo (mismo espesor total)
+    _, costo, _ = revisar_frente(malla, (1000.0, 1000.0, 1000.0, 1000.0))
+    assert len(np.unique(costo)) == len(costo)
+
+
+def test_frente_de_pareto_vacio():
+    espesores, costo, seguridad = frente_pareto(*ENTRADAS, costos=(1, 1, 1, 1), maximos=5.0, paso=PASO)
+    assert espesores.shape == (0, 4) and len(costo) == 0 and len(seguridad) == 0
+
+
+@pytest.mark.parametrize("elementos", [1, 7 ** 3, 2 * 7 ** 3 + 5])
+def test_bloques_de_la_malla_dan_el_mismo_resultado(monkeypatch, elementos):
+    completos = [buscar_espesores(*ENTRADAS, maximos=MAXIMO, paso=PASO, criterio=criterio)
+                 for criterio in ("total", "capas")]
+    frente = frente_pareto(*ENTRADAS, costos=(1000.0, 1000.0, 1000.0, 1000.0), maximos=MAXIMO, paso=PASO)
+    # Un renglón de D1 o más por bloque: el desempate por índice no depende de los cortes
+    monkeypatch.setattr(diseno, "ELEMENTOS_BLOQUE", elementos)
+    assert [buscar_espesores(*ENTRADAS, maximos=MAXIMO, paso=PASO, criterio=criterio)
+            for criterio in ("total", "capas")] == completos
+    por_bloques = frente_pareto(*ENTRADAS, costos=(1000.0, 1000.0, 1000.0, 1000.0), maximos=MAXIMO, paso=PASO)
+    for a, b in zip(por_bloques, frente):
+        np.testing.assert_array_equal(a, b)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from unampav import CARGAS_POR_CAMINO, CLASES_VEHICULARES, calcular_volumenes, ejes_primer_anio, esals
+
+PARAMS = {clase: 0.0 for clase in CLASES_VEHICULARES}
+PARAMS.update(A2=85, B2=2, C2=2, C38=2, T3S2=2, T3S3=5, T3S2R4=2)
+_, FVP, FVV = calcular_volumenes(7500, 1, 80)
+
+
+def ejes_original(p, fvp, fvv):
+    """Las 17 fórmulas de la versión original de pav25.py, con T2S3 leyendo su propio valor."""
+    return np.array([
+        2 * p["A2"] * (fvp + fvv),
+        (100 - p["A2"] + p["B4"]) * fvp,
+        (p["B2"] + p["C2"] + p["T2S1"] + p["T2S2"] + p["T2S3"] + p["T2S2S2"]) * fvp,
+        (2*p["C2R2"] + 2*p["C3R2"] + p["C3R3"] + p["C2R3"] + 3*p["T2S1R2"] + 2*p["T2S1R3"]
+         + 2*p["T2S2R2"] + 3*p["T3S1R2"] + 2*p["T3S1R3"] + 2*p["T3S2R2"] + p["T3S2R3"]) * fvp,
+        (p["T2S1"] + p["T3S1"]) * fvp,
+        (p["C2R2"] + p["C2R3"] + p["T2S1R2"] + p["T2S1R3"] + p["T2S2R2"]) * fvp,
+        (p["B2"] + p["B36"] + p["B38"] + 2*p["B4"] + 2*p["C2"] + p["C36"] + p["C38"] + 4*p["C2R2"]
+         + 3*p["C3R2"] + 2*p["C3R3"] + 3*p["C2R3"] + 3*p["T2S1"] + 2*p["T2S2"] + p["T3S2"] + p["T3S3"]
+         + 2*p["T3S1"] + 5*p["T2S1R2"] + 4*p["T2S1R3"] + 4*p["T2S2R2"] + 4*p["T3S1R2"] + 3*p["T3S1R3"]
+         + 3*p["T3S2R2"] + p["T3S2R4"] + 2*p["T3S2R3"] + p["T3S3S2"] + 2*p["T2S2S2"] + p["T3S2S2"]) * fvv,
+        (p["B2"] + p["B36"] + p["B38"] + p["B4"]) * fvv,
+        (p["B36"] + p["B4"] + p["C36"] + p["T3S1R3"]) * fvp,
+        (p["B38"] + p["C38"] + p["T3S2"] + p["T3S3"] + p["T3S1"] + p["T3S2S2"]) * fvp,
+        (p["C3R3"] + p["C2R3"] + p["T2S1R3"] + p["T2S2R2"] + p["T3S1R3"] + p["T3S2R2"]
+         + 3*p["T3S2R4"] + 2*p["T3S2R3"] + 2*p["T2S2S2"] + 2*p["T3S2S2"]) * fvp,
+        (p["T2S2"] + p["T3S2"] + p["T3S3S2"]) * fvp,
+        (p["C3R2"] + p["C3R3"] + p["T3S1R2"] + p["T3S2R2"] + p["T3S2R4"] + p["T3S2R3"] + p["T3S3S2"]) * fvp,
+        (p["C36"] + p["C38"] + p["C3R2"] + 2*p["C3R3"] + p["C2R3"] + p["T2S2"] + 2*p["T3S2"] + p["T3S3"]
+         + p["T3S1"] + p["T2S1R3"] + p["T2S2R2"] + p["T3S1R2"] + 2*p["T3S1R3"] + 2*p["T3S2R2"]
+         + 4*p["T3S2R4"] + 3*p["T3S2R3"] + 2*p["T3S3S2"] + 2*p["T2S2S2"] + 3*p["T3S2S2"]) * fvv,
+        p["T3S3S2"] * fvp,
+        (p["T3S3"] + p["T2S3"]) * fvp,
+        p["T3S3S2"] * fvv,
+    ])
+
+
+def esals_original(Z, tc_nombre, p, fvp, fvv, tca, vida):
+    """ESAL's fila por fila como en la versión original de pav25.py."""
+    sigma_st = 5.8 * (1 - Z**3 / (15**2 + Z**2) ** 1.5)
+    total = 0.0
+    for i, (P, ejes) in enumerate(zip(CARGAS_POR_CAMINO[tc_nombre], ejes_original(p, fvp, fvv))):
+        q = 2 if i == 0 else 6
+        if i < 8:
+            a, N = np.sqrt(1000 * P / (2 * np.pi * q)), 1
+        elif i < 14:
+            a, N = (np.sqrt(1000 * P / (4 * np.pi * q)), 2) if Z < 30 else (np.sqrt(1111 * P / (4 * np.pi * q)), 1)
+        else:
+            a, N = (np.sqrt(1000 * P / (6 * np.pi * q)), 3) if Z < 30 else (np.sqrt(1333 * P / (6 * np.pi * q)), 1)
+        sigma = q * (1 - Z**3 / (a**2 + Z**2) ** 1.5)
+        total += ejes * 10 ** ((np.log10(sigma) - np.log10(sigma_st)) / np.log10(1.5)) * N
+    CT = ((1 + tca / 100) ** vida - 1) / (tca / 100) if tca != 0 else vida
+    return CT * total
+
+
+def test_ejes_coinciden_con_las_formulas_originales():
+    rng = np.random.default_rng(1)
+    for _ in range(5):
+        p = dict(zip(CLASES_VEHICULARES, rng.dirichlet(np.ones(len(CLASES_VEHICULARES))) * 100))
+        np.testing.assert_allclose(ejes_primer_anio([p[c] for c in CLASES_VEHICULARES], FVP, FVV),
+                                   ejes_original(p, FVP, FVV), rtol=1e-12)
+
+
+def test_t2s3_usa_su_propia_composicion():
+    # La versión original leía params["T2S2"] para T2S3 (filas 2 y 15)
+    p = dict(PARAMS, T2S2=0.0, T2S3=4.0)
+    ejes = ejes_primer_anio([p[c] for c in CLASES_VEHICULARES], FVP, FVV)
+    assert ejes[2] == pytest.approx((2 + 2 + 4) * FVP)
+    assert ejes[15] == pytest.approx((5 + 4) * FVP)
+    sin_t2s3 = ejes_primer_anio([PARAMS[c] for c in CLASES_VEHICULARES], FVP, FVV)
+    assert ejes[15] - sin_t2s3[15] == pytest.approx(4 * FVP)
+
+
+@pytest.mark.parametrize("tc_nombre", list(CARGAS_POR_CAMINO))
+@pytest.mark.parametrize("Z", [5.0, 10.0, 25.0, 29.0, 30.0, 40.0, 75.0])
+def test_esals_coincide_con_el_calculo_fila_por_fila(tc_nombre, Z):
+    p = dict(PARAMS, T2S3=3.0, A2=82)
+    esperado = esals_original(Z, tc_nombre, p, FVP, FVV, 3.5, 15)
+    assert esals(Z, tc_nombre, p, FVP, FVV, 3.5, 15) == pytest.approx(esperado, rel=1e-9)
+
+
+def test_esals_valores_de_la_interfaz():
+    Z = np.array([10.0, 25.0, 40.0])
+    np.testing.assert_allclose(esals(Z, "ET y A", PARAMS, FVP, FVV, 3.5, 15),
+                               [19_947_448, 26_142_618, 28_668_133], atol=1.0)
+    assert esals(25.0, "ET y A", PARAMS, FVP, FVV, 0, 15) == pytest.approx(
+        esals_original(25.0, "ET y A", PARAMS, FVP, FVV, 0, 15), rel=1e-9)
+
+
+def test_esals_fuera_de_la_malla_de_la_tabla():
+    # Profundidades no enteras se interpolan en la tabla
+    for Z in (12.37, 31.5):
+        assert esals(Z, "Tipo B", PARAMS, FVP, FVV, 3.5, 15) == pytest.approx(
+            esals_original(Z, "Tipo B", PARAMS, FVP, FVV, 3.5, 15), rel=1e-6)
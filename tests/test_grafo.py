@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from unampav import (
+    CLASES_VEHICULARES, calcular_B, calcular_T, calcular_U, calcular_VRS0, esals, grafo_unam,
+    transformar_vehiculos_a_ejes,
+)
+
+PARAMS = {clase: 0.0 for clase in CLASES_VEHICULARES}
+PARAMS.update(A2=85, B2=2, C2=2, C38=2, T3S2=2, T3S3=5, T3S2R4=2)
+VRS01, VRS02 = (calcular_VRS0(B) for B in calcular_B(calcular_U(calcular_T(0.90))))
+ENTRADAS = dict(tc_nombre="ET y A", params=PARAMS, tdpa=7500, nc=1, vc=80, tca=3.5, vida=15, periodos=None,
+                D1=5.0, D2=5.0, D3=15.0, D4=15.0, vrs1=80.0, vrs2=30.0, vrs3=5.0, VRS01=VRS01, VRS02=VRS02)
+NODOS = [f"{nombre}{i}" for i in (1, 2, 3) for nombre in ("Prof", "zge", "Esal", "fz", "Zg", "cumple")]
+
+
+@pytest.fixture
+def grafo():
+    g = grafo_unam()
+    g.entradas(**ENTRADAS)
+    for nombre in NODOS:
+        g.valor(nombre)
+    g.nuevo_ciclo()
+    return g
+
+
+def test_cambiar_D4_solo_recalcula_la_tercera_columna(grafo):
+    grafo.entradas(D4=20.0)
+    for nombre in NODOS:
+        grafo.valor(nombre)
+    assert sorted(grafo.recalculados) == sorted(["zge3", "Prof3", "Esal3", "fz3", "Zg3", "cumple3"])
+    assert grafo.valor("Prof3") == 45.0 and grafo.valor("zge3") == 52.5
+
+
+def test_sin_cambios_no_recalcula_nada(grafo):
+    grafo.entradas(**ENTRADAS)
+    for nombre in NODOS:
+        grafo.valor(nombre)
+    assert grafo.recalculados == []
+
+
+def test_funciones_inyectadas_respaldan_los_nodos():
+    llamadas = {"ejes": 0, "esals": 0}
+
+    def ejes(*args):
+        llamadas["ejes"] += 1
+        return transformar_vehiculos_a_ejes(*args)
+
+    def esals_contados(*args):
+        llamadas["esals"] += 1
+        return esals(*args)
+
+    g = grafo_unam(ejes=ejes, esals=esals_contados)
+    g.entradas(**ENTRADAS)
+    for nombre in NODOS + ["ejes"]:
+        g.valor(nombre)
+    assert llamadas == {"ejes": 1, "esals": 3}
+    _, fvp, fvv = g.valor("volumenes")
+    assert g.valor("Esal2") == pytest.approx(esals(25.0, "ET y A", PARAMS, fvp, fvv, 3.5, 15))
+    np.testing.assert_array_equal(g.valor("ejes").to_numpy(),
+                                  transformar_vehiculos_a_ejes("ET y A", PARAMS, fvp, fvv).to_numpy())
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from unampav import (
+    CLASES_VEHICULARES, CrecimientoAcumulado, calcular_CT, calcular_CT_clases, calcular_volumenes,
+    esals, esals_anuales,
+)
+
+PARAMS = {clase: 0.0 for clase in CLASES_VEHICULARES}
+PARAMS.update(A2=85, B2=2, C2=2, C38=2, T3S2=2, T3S3=5, T3S2R4=2)
+_, FVP, FVV = calcular_volumenes(7500, 1, 80)
+Z = np.array([10.0, 25.0, 40.0])
+
+
+def factor_por_anios(tasas_por_anio):
+    """Σ Π(1 + r) año por año, con un ciclo explícito."""
+    total, factor = 0.0, 1.0
+    for r in tasas_por_anio:
+        total += factor
+        factor *= 1 + r / 100
+    return total
+
+
+@pytest.mark.parametrize("tca", [0.0, 3.5, -2.0])
+@pytest.mark.parametrize("vida", [1, 15, 20])
+def test_tasa_unica_coincide_con_calcular_CT(tca, vida):
+    assert calcular_CT_clases(tca, vida) == pytest.approx(calcular_CT(tca, vida), rel=1e-12)
+    assert calcular_CT_clases(tca, vida) == pytest.approx(factor_por_anios([tca] * vida), rel=1e-12)
+
+
+def test_calcular_CT_con_arreglo_de_tasas():
+    tasas = np.array([-2.0, 0.0, 3.5, 8.0])
+    np.testing.assert_allclose(calcular_CT(tasas, 15), [calcular_CT(r, 15) for r in tasas], rtol=1e-12)
+
+
+def test_vida_fraccionaria():
+    assert calcular_CT_clases(3.5, 12.5) == pytest.approx(calcular_CT(3.5, 12.5), rel=1e-12)
+    assert calcular_CT_clases(0.0, 12.5) == pytest.approx(12.5)
+
+
+def test_tasas_por_clase():
+    tasas = np.linspace(0.0, 6.0, len(CLASES_VEHICULARES))
+    CT = calcular_CT_clases(tasas, 15)
+    assert CT.shape == (len(CLASES_VEHICULARES),)
+    np.testing.assert_allclose(CT, [calcular_CT(r, 15) for r in tasas], rtol=1e-12)
+    # También como diccionario {clase: %}
+    por_clase = dict(zip(CLASES_VEHICULARES, tasas))
+    np.testing.assert_allclose(esals(Z, "ET y A", PARAMS, FVP, FVV, por_clase, 15),
+                               esals(Z, "ET y A", PARAMS, FVP, FVV, tasas, 15))
+
+
+def test_tasas_por_periodo():
+    # 4 % los años 1 a 5 y 1.5 % del 6 al 20
+    esperado = factor_por_anios([4.0] * 5 + [1.5] * 15)
+    assert calcular_CT_clases([4.0, 1.5], 20, periodos=[5]) == pytest.approx(esperado, rel=1e-12)
+    # Tres periodos, por clase
+    tasas = np.stack([np.full(len(CLASES_VEHICULARES), r) for r in (5.0, 2.0, 0.0)])
+    tasas[:, 0] = (1.0, 1.0, 1.0)
+    CT = calcular_CT_clases(tasas, 12, periodos=[3, 8])
+    assert CT[1] == pytest.approx(factor_por_anios([5.0] * 3 + [2.0] * 5 + [0.0] * 4), rel=1e-12)
+    assert CT[0] == pytest.approx(calcular_CT(1.0, 12), rel=1e-12)
+    with pytest.raises(ValueError):
+        CrecimientoAcumulado([4.0, 1.5], periodos=[5, 10])
+
+
+def test_extender_reutiliza_las_sumas_prefijo():
+    crecimiento = CrecimientoAcumulado(3.5)
+    assert crecimiento.acumulado(10) == pytest.approx(calcular_CT(3.5, 10))
+    prefijo = crecimiento._prefijo.copy()
+    assert crecimiento.acumulado(25) == pytest.approx(calcular_CT(3.5, 25))
+    np.testing.assert_array_equal(crecimiento._prefijo[:len(prefijo)], prefijo)
+    assert crecimiento.anios == 25
+
+
+@pytest.mark.parametrize("tca, periodos", [
+    (3.5, None),
+    (np.linspace(1.0, 5.0, len(CLASES_VEHICULARES)), None),
+    ([4.0, 1.5], [5]),
+])
+def test_linea_de_tiempo_contra_ciclo_por_anio(tca, periodos):
+    t, acumulados = esals_anuales(Z, "ET y A", PARAMS, FVP, FVV, tca, 15, periodos)
+    np.testing.assert_array_equal(t, np.arange(1.0, 16.0))
+    assert acumulados.shape == (15, 3)
+    # Cada año es esals con la vida recortada a ese año; el último renglón es la vida completa
+    for anio in (1, 7, 15):
+        np.testing.assert_allclose(acumulados[anio - 1], esals(Z, "ET y A", PARAMS, FVP, FVV, tca, anio, periodos),
+                                   rtol=1e-12)
+    assert np.all(np.diff(acumulados, axis=0) > 0)
+
+
+def test_incremento_anual():
+    # Año 1: ejes equivalentes del 1er año, sin crecimiento; año 2: (1 + r) veces el 1er año
+    _, acumulados = esals_anuales(25.0, "ET y A", PARAMS, FVP, FVV, 3.5, 5)
+    assert acumulados[0] == pytest.approx(esals(25.0, "ET y A", PARAMS, FVP, FVV, 0.0, 1))
+    assert acumulados[1] - acumulados[0] == pytest.approx(1.035 * acumulados[0])
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from unampav import lote  # noqa: E402
+
+TRAMO = dict(tc_nombre="ET y A", tdpa=7500, vrs1=80.0, vrs2=30.0, vrs3=5.0,
+             A2=85, B2=2, C2=2, C38=2, T3S2=2, T3S3=5, T3S2R4=2)
+EXISTENTE = dict(D1=10.0, D2=10.0, D3=20.0, D4=25.0)
+SIN_ESPESORES = dict(D1=np.nan, D2=np.nan, D3=np.nan, D4=np.nan)
+
+
+@pytest.fixture
+def estaciones(tmp_path):
+    """Corredor de 9 estaciones con solo 4 combinaciones distintas, repetidas entre bloques."""
+    filas = [
+        dict(TRAMO, **EXISTENTE),
+        dict(TRAMO, **SIN_ESPESORES),
+        dict(TRAMO, **EXISTENTE),
+        dict(TRAMO, tdpa=9000, **EXISTENTE),
+        dict(TRAMO, **SIN_ESPESORES),
+        dict(TRAMO, vrs3=4.0, **EXISTENTE),
+        dict(TRAMO, tdpa=9000, **EXISTENTE),
+        dict(TRAMO, **EXISTENTE),
+        dict(TRAMO, vrs3=4.0, **EXISTENTE),
+    ]
+    ruta = tmp_path / "estaciones.csv"
+    pd.DataFrame(filas).to_csv(ruta, index=False)
+    return str(ruta)
+
+
+def test_renglones_identicos_se_calculan_una_vez(estaciones, tmp_path, monkeypatch):
+    evaluadas = []
+    evaluar = lote.evaluar_estacion
+
+    def contar(fila, *args):
+        evaluadas.append(fila["tdpa"])
+        return evaluar(fila, *args)
+
+    monkeypatch.setattr(lote, "evaluar_estacion", contar)
+    salida = str(tmp_path / "resultados.csv")
+    # Bloques de 2 renglones: la memoria entre bloques evita repetir las estaciones ya calculadas
+    assert lote.procesar_archivo(estaciones, salida, procesos=1, tamano_bloque=2) == (9, 4)
+    assert len(evaluadas) == 4
+    resultados = pd.read_csv(salida)
+    assert len(resultados) == 9
+    # Las repetidas llevan el resultado de su primera aparición, incluidas las que no traían espesores
+    columnas = ["D1", "D2", "D3", "D4", "Esal1", "Esal2", "Esal3", "cumple"]
+    pd.testing.assert_frame_equal(resultados.loc[[0, 2, 7], columnas].reset_index(drop=True),
+                                  resultados.loc[[0, 0, 0], columnas].reset_index(drop=True))
+    pd.testing.assert_frame_equal(resultados.loc[[1], columnas].reset_index(drop=True),
+                                  resultados.loc[[4], columnas].reset_index(drop=True))
+    assert not resultados.loc[[1, 4], ["D1", "D2", "D3", "D4"]].isna().any(axis=None)
+
+
+def test_memoria_acotada_vuelve_a_calcular(estaciones, tmp_path):
+    salida = str(tmp_path / "resultados.csv")
+    _, calculados = lote.procesar_archivo(estaciones, salida, procesos=1, tamano_bloque=2, max_memoria=1)
+    assert calculados > 4
+    assert len(pd.read_csv(salida)) == 9
+
+
+@pytest.mark.parametrize("opciones", [[], ["--rehabilitacion"]])
+def test_procesos_dan_la_misma_salida_que_en_serie(estaciones, tmp_path, opciones, capsys):
+    serie, paralelo = str(tmp_path / "serie.csv"), str(tmp_path / "paralelo.csv")
+    lote.main([estaciones, serie, "--procesos", "1", "--bloque", "4"] + opciones)
+    lote.main([estaciones, paralelo, "--procesos", "2", "--bloque", "4"] + opciones)
+    assert "9 estaciones procesadas, 4 combinaciones distintas calculadas." in capsys.readouterr().out
+    pd.testing.assert_frame_equal(pd.read_csv(paralelo), pd.read_csv(serie))
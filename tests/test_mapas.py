@@ -0,0 +1,40 @@
+import numpy as np
+
+from unampav import (
+    CLASES_VEHICULARES, calcular_B, calcular_fz, calcular_T, calcular_U, calcular_VRS0, calcular_volumenes,
+    calcular_ZG, esals, mapa_factibilidad,
+)
+
+PARAMS = {clase: 0.0 for clase in CLASES_VEHICULARES}
+PARAMS.update(A2=85, B2=2, C2=2, C38=2, T3S2=2, T3S3=5, T3S2R4=2)
+_, VRS02 = (calcular_VRS0(B) for B in calcular_B(calcular_U(calcular_T(0.90))))
+CAMINOS, CARRILES = ["ET y A", "Tipo C"], [1, 2]
+VRS = np.array([2.0, 5.0, 10.0, 20.0])
+TDPA = np.array([500.0, 3000.0, 7500.0, 30000.0])
+Z_MAX, PASO = 80.0, 0.01
+
+
+def espesor_fuerza_bruta(tc_nombre, nc, vrs, tdpa):
+    """Menor Z de un barrido fino que cumple ZG(ESAL's(Z)) ≤ Z, con el tránsito real del carril."""
+    Z = np.arange(PASO / 2, Z_MAX, PASO)
+    _, fvp, fvv = calcular_volumenes(tdpa, nc, 80)
+    cumple = calcular_ZG(calcular_fz(vrs, VRS02, esals(Z, tc_nombre, PARAMS, fvp, fvv, 3.5, 15))) <= Z
+    return Z[np.argmax(cumple)] if cumple.any() else np.nan
+
+
+def test_mapa_contra_fuerza_bruta():
+    mapa = mapa_factibilidad(CAMINOS, PARAMS, CARRILES, 80, 3.5, 15, VRS02, VRS, TDPA, Z_max=Z_MAX)
+    assert mapa.dtype == np.float32 and mapa.shape == (2, 2, 4, 4)
+    esperado = np.array([[[[espesor_fuerza_bruta(tc, nc, v, t) for t in TDPA] for v in VRS]
+                          for nc in CARRILES] for tc in CAMINOS])
+    # Mismas celdas sin solución dentro de Z_max (CBR 2 %) y el mismo espesor a la resolución del barrido
+    np.testing.assert_array_equal(np.isnan(mapa), np.isnan(esperado))
+    assert np.isnan(mapa).any() and not np.isnan(mapa).all()
+    np.testing.assert_allclose(mapa, esperado, atol=2 * PASO)
+
+
+def test_mapa_monotono():
+    mapa = mapa_factibilidad(["ET y A"], PARAMS, [1], 80, 3.5, 15, VRS02, VRS[1:], TDPA)[0, 0]
+    # Más tránsito pide más espesor; una subrasante mejor, menos
+    assert np.all(np.diff(mapa, axis=1) > 0)
+    assert np.all(np.diff(mapa, axis=0) < 0)
@@ -0,0 +1,65 @@
+import json
+
+import numpy as np
+import pytest
+
+from test_esals import FVP, FVV, PARAMS, ejes_original
+from unampav import CLASES_VEHICULARES, REGISTRO_CLASES, ejes_primer_anio, transformar_vehiculos_a_ejes
+from unampav import trafico
+
+SIN_CLASES = dict.fromkeys(CLASES_VEHICULARES, 0.0)
+
+
+def coeficientes_originales(clase):
+    """Ejes por vehículo cargado y por vehículo vacío de una clase según las fórmulas originales."""
+    una = dict(SIN_CLASES, **{clase: 1.0})
+    return (ejes_original(una, 1.0, 0.0) - ejes_original(SIN_CLASES, 1.0, 0.0),
+            ejes_original(una, 0.0, 1.0) - ejes_original(SIN_CLASES, 0.0, 1.0))
+
+
+@pytest.mark.parametrize("clase", CLASES_VEHICULARES)
+def test_coeficientes_del_registro_por_clase(clase):
+    k = CLASES_VEHICULARES.index(clase)
+    cargado, vacio = coeficientes_originales(clase)
+    np.testing.assert_array_equal(trafico.COEF_EJES[0][:, k], cargado)
+    np.testing.assert_array_equal(trafico.COEF_EJES[1][:, k], vacio)
+
+
+def test_termino_independiente_y_t2s3():
+    # (100 - A2 + B4) · cargados: el 100 es el término independiente de la fila 1
+    np.testing.assert_array_equal(trafico.EJES_BASE_CARGADOS, ejes_original(SIN_CLASES, 1.0, 0.0))
+    # T2S3 aporta un eje a las filas 2 y 15 por vehículo cargado (la versión original leía T2S2)
+    t2s3 = CLASES_VEHICULARES.index("T2S3")
+    assert np.flatnonzero(trafico.COEF_EJES[0][:, t2s3]).tolist() == [2, 15]
+    assert not trafico.COEF_EJES[1][:, t2s3].any()
+    assert len(CLASES_VEHICULARES) == 29 and CLASES_VEHICULARES[0] == "A2"
+
+
+def test_tabla_de_ejes_de_la_interfaz():
+    p = dict(PARAMS, T2S3=3.0, C3R2=1.5)
+    df = transformar_vehiculos_a_ejes("ET y A", p, FVP, FVV)
+    np.testing.assert_allclose(df["Ejes 1er Año"].to_numpy(), ejes_original(p, FVP, FVV), rtol=1e-12)
+    assert [c["omision"] for c in REGISTRO_CLASES if c["omision"]] == [85.0, 2.0, 2.0, 2.0, 2.0, 5.0, 2.0]
+
+
+def test_producto_disperso_igual_al_denso(monkeypatch):
+    pytest.importorskip("scipy")
+    np.testing.assert_array_equal(trafico.matriz_dispersa().toarray(),
+                                  trafico.COEF_EJES.reshape(-1, len(CLASES_VEHICULARES)))
+    composiciones = np.random.default_rng(2).dirichlet(np.ones(len(CLASES_VEHICULARES)), 50) * 100
+    denso = ejes_primer_anio(composiciones, FVP, FVV)
+    monkeypatch.setattr(trafico, "DENSIDAD_DISPERSA", 1.0)  # fuerza la ruta dispersa
+    np.testing.assert_allclose(ejes_primer_anio(composiciones, FVP, FVV), denso, rtol=1e-12)
+
+
+def test_cargar_registro_con_una_clase_regional(tmp_path):
+    with open(trafico.RUTA_REGISTRO, encoding="utf-8") as archivo:
+        registro = json.load(archivo)
+    registro["clases"].append({"clase": "T3S3R4", "etiqueta": "T3S3R4", "omision": 0.0,
+                               "cargado": {"3": 1, "14": 2}, "vacio": {"6": 1}})
+    ruta = tmp_path / "clases.json"
+    ruta.write_text(json.dumps(registro), encoding="utf-8")
+    clases, base = trafico.cargar_registro(str(ruta))
+    assert len(clases) == 30 and base == {1: 100}
+    assert clases[-1]["cargado"] == {3: 1, 14: 2} and clases[-1]["vacio"] == {6: 1}
+    assert clases[:29] == REGISTRO_CLASES
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from unampav import (
+    CLASES_VEHICULARES, COEF_GRAVA, calcular_B, calcular_fz, calcular_T, calcular_U, calcular_VRS0,
+    calcular_volumenes, calcular_ZG, esal_admisible, esals, sobrecarpeta, vida_remanente,
+)
+
+PARAMS = {clase: 0.0 for clase in CLASES_VEHICULARES}
+PARAMS.update(A2=85, B2=2, C2=2, C38=2, T3S2=2, T3S3=5, T3S2R4=2)
+_, FVP, FVV = calcular_volumenes(7500, 1, 80)
+VRS01, VRS02 = (calcular_VRS0(B) for B in calcular_B(calcular_U(calcular_T(0.90))))
+VRS = (80.0, 30.0, 5.0)
+TRANSITO = ("ET y A", PARAMS, FVP, FVV, 3.5)
+
+
+def margenes(D, vida, h=0.0):
+    """zge - Zg de las tres revisiones con una sobrecarpeta h sobre la estructura D."""
+    D = np.asarray(D, dtype=float)
+    Z = np.cumsum(D)[1:] + h
+    zge = np.cumsum(D * np.asarray(COEF_GRAVA))[1:] + COEF_GRAVA[0] * h
+    esal = esals(Z, *TRANSITO, vida)
+    return zge - calcular_ZG(calcular_fz(np.array(VRS), np.array([VRS01, VRS01, VRS02]), esal))
+
+
+@pytest.mark.parametrize("vrs, VRS0", [(80.0, VRS01), (30.0, VRS01), (5.0, VRS02)])
+def test_esal_admisible_invierte_fz_y_zg(vrs, VRS0):
+    zge = np.array([5.0, 17.5, 32.5, 47.5, 90.0])
+    esal = esal_admisible(vrs, VRS0, zge)
+    np.testing.assert_allclose(calcular_ZG(calcular_fz(vrs, VRS0, esal)), zge, rtol=1e-9)
+    # Y en sentido contrario: los ESAL's que piden exactamente ese espesor
+    for n in (1e6, 2e7):
+        assert esal_admisible(vrs, VRS0, calcular_ZG(calcular_fz(vrs, VRS0, n))) == pytest.approx(n, rel=1e-9)
+
+
+def test_esal_admisible_crece_con_el_espesor():
+    zge = np.linspace(1.0, 100.0, 50)
+    assert np.all(np.diff(esal_admisible(5.0, VRS02, zge)) > 0)
+    # Sin grava encima la capa resiste mientras fz ≥ 1; con CBR < VRS0, ni un ESAL
+    for vrs, VRS0 in ((5.0, VRS02), (80.0, VRS01)):
+        assert calcular_fz(vrs, VRS0, esal_admisible(vrs, VRS0, 0.0)) == pytest.approx(1.0)
+    assert esal_admisible(3.0, VRS02, 0.0) < 1
+
+
+def test_vida_remanente_acota_el_cruce():
+    D = (10.0, 10.0, 20.0, 25.0)
+    anios = vida_remanente(D, VRS, *TRANSITO, VRS01, VRS02)
+    assert anios.shape == (3,)
+    for i, t in enumerate(anios):
+        if np.isinf(t):
+            assert margenes(D, 50)[i] >= 0
+            continue
+        # Cumple justo antes del año de falla y ya no justo después
+        assert margenes(D, max(t - 0.05, 0.01))[i] >= -1e-6
+        assert margenes(D, t + 0.05)[i] < 1e-6
+
+
+def test_vida_remanente_de_la_estructura_de_la_interfaz():
+    # La estructura por omisión no cumple a 15 años: la vida remanente es menor en las tres revisiones
+    anios = vida_remanente((5.0, 5.0, 15.0, 15.0), VRS, *TRANSITO, VRS01, VRS02)
+    assert np.all(anios < 15) and np.all(anios > 0)
+    # Inventario completo: un renglón por tramo
+    inventario = np.array([[5.0, 5.0, 15.0, 15.0], [15.0, 15.0, 30.0, 40.0]])
+    resultado = vida_remanente(inventario, VRS, *TRANSITO, VRS01, VRS02)
+    assert resultado.shape == (2, 3)
+    np.testing.assert_allclose(resultado[0], anios)
+    assert np.all(resultado[1] > resultado[0])
+
+
+def test_sobrecarpeta_es_el_minimo_que_cumple():
+    D = (5.0, 5.0, 15.0, 15.0)
+    h = sobrecarpeta(D, VRS, *TRANSITO, 15, VRS01, VRS02)
+    assert 0 < h < 50
+    assert margenes(D, 15, h).min() >= 0
+    # 30 bisecciones sobre 50 cm: un espesor apenas menor ya no cumple
+    assert margenes(D, 15, h - 1e-3).min() < 0
+    # Con la sobrecarpeta la vida remanente alcanza la vida de proyecto
+    con_sobrecarpeta = (D[0] + h,) + D[1:]
+    assert vida_remanente(con_sobrecarpeta, VRS, *TRANSITO, VRS01, VRS02).min() == pytest.approx(15, abs=1e-3)
+
+
+def test_sobrecarpeta_limites():
+    # Ya cumple: 0; no alcanza con el espesor máximo: NaN
+    assert sobrecarpeta((20.0, 15.0, 30.0, 40.0), VRS, *TRANSITO, 15, VRS01, VRS02) == 0.0
+    assert np.isnan(sobrecarpeta((5.0, 5.0, 15.0, 15.0), VRS, *TRANSITO, 15, VRS01, VRS02, espesor_max=1.0))
+    inventario = sobrecarpeta(np.array([[20.0, 15.0, 30.0, 40.0], [5.0, 5.0, 15.0, 15.0]]), VRS, *TRANSITO, 15,
+                              VRS01, VRS02)
+    assert inventario.shape == (2,)
+    assert inventario[0] == 0.0
+    assert inventario[1] == pytest.approx(sobrecarpeta((5.0, 5.0, 15.0, 15.0), VRS, *TRANSITO, 15, VRS01, VRS02))
@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+from unampav import CARGAS_POR_CAMINO, CLASES_VEHICULARES, calcular_volumenes, composicion_vector, ejes_primer_anio
+from unampav import tablas
+from unampav.danio import danio_unitario
+
+PARAMS = {clase: 0.0 for clase in CLASES_VEHICULARES}
+PARAMS.update(A2=85, B2=2, C2=2, C38=2, T3S2=2, T3S3=5, T3S2R4=2)
+_, FVP, FVV = calcular_volumenes(7500, 1, 80)
+EJES = ejes_primer_anio(composicion_vector(PARAMS), FVP, FVV)
+# Nodos, puntos entre nodos y los dos lados de la discontinuidad en Z = 30 cm
+Z = np.concatenate([np.linspace(0.5, 299.9, 2001), [1.0, 25.0, 29.9, 29.99, 29.999, 30.0, 30.001, 30.01, 30.1]])
+
+
+@pytest.mark.parametrize("tc_nombre", list(CARGAS_POR_CAMINO))
+def test_tabla_coincide_con_boussinesq_directo(tc_nombre):
+    cargas = CARGAS_POR_CAMINO[tc_nombre]
+    np.testing.assert_allclose(tablas.danio_tabla(Z, tc_nombre), danio_unitario(Z, cargas), rtol=1e-6)
+    np.testing.assert_allclose(tablas.equivalentes_tabla(Z, tc_nombre, EJES), danio_unitario(Z, cargas) @ EJES,
+                               rtol=1e-6)
+    # En los nodos de la malla la interpolación no agrega error
+    nodos = np.array([5.0, 10.0, 29.95, 30.0, 40.0, 150.0])
+    np.testing.assert_allclose(tablas.equivalentes_tabla(nodos, tc_nombre, EJES),
+                               danio_unitario(nodos, cargas) @ EJES, rtol=1e-12)
+
+
+def test_cada_lado_de_Z_30_usa_su_rama():
+    cargas = CARGAS_POR_CAMINO["ET y A"]
+    somero = tablas.equivalentes_tabla(29.999, "ET y A", EJES)
+    profundo = tablas.equivalentes_tabla(30.0, "ET y A", EJES)
+    assert somero == pytest.approx(danio_unitario(29.999, cargas, somero=True) @ EJES, rel=1e-6)
+    assert profundo == pytest.approx(danio_unitario(30.0, cargas, somero=False) @ EJES, rel=1e-12)
+    # El salto se conserva: no se interpola a través de la discontinuidad
+    assert abs(somero / profundo - 1) > 0.1
+
+
+@pytest.mark.parametrize("tc_nombre", ["ET y A", "Tipo D"])
+def test_fuera_de_la_tabla_se_calcula_directo(tc_nombre):
+    cargas = CARGAS_POR_CAMINO[tc_nombre]
+    fuera = np.array([tablas.Z_MAXIMO + 0.01, 350.0, 1000.0])
+    np.testing.assert_array_equal(tablas.equivalentes_tabla(fuera, tc_nombre, EJES),
+                                  danio_unitario(fuera, cargas) @ EJES)
+    np.testing.assert_array_equal(tablas.danio_tabla(fuera, tc_nombre), danio_unitario(fuera, cargas))
+    # Mezcla de profundidades dentro y fuera de la tabla en una sola llamada
+    mezcla = np.array([25.0, 350.0, 40.0])
+    np.testing.assert_allclose(tablas.equivalentes_tabla(mezcla, tc_nombre, EJES),
+                               danio_unitario(mezcla, cargas) @ EJES, rtol=1e-12)
+    assert tablas.equivalentes_tabla(tablas.Z_MAXIMO, tc_nombre, EJES) == pytest.approx(
+        danio_unitario(tablas.Z_MAXIMO, cargas) @ EJES, rel=1e-12)
+
+
+def test_sin_transito_y_camino_invalido():
+    assert tablas.curva_equivalentes("ET y A", np.zeros(17)) is None
+    np.testing.assert_array_equal(tablas.equivalentes_tabla(Z[:5], "ET y A", np.zeros(17)), np.zeros(5))
+    with pytest.raises(ValueError):
+        tablas.danio_tabla(25.0, "Tipo Z")
+
+
+def test_tabla_en_disco(tmp_path, monkeypatch):
+    monkeypatch.setenv("UNAMPAV_TABLAS", str(tmp_path))
+    tablas.cargar_tabla.cache_clear()
+    try:
+        tabla = tablas.cargar_tabla()
+        assert os.path.dirname(tablas.ruta_tabla()) == str(tmp_path) and os.path.exists(tablas.ruta_tabla())
+        assert isinstance(tabla, np.memmap)
+        assert tabla.shape == (len(CARGAS_POR_CAMINO), 2, len(tablas._nodos()), 17)
+        np.testing.assert_array_equal(tabla, tablas.construir_tabla())
+    finally:
+        tablas.cargar_tabla.cache_clear()
@@ -0,0 +1,36 @@
+"""
+Núcleo de cálculo del método UNAM para diseño de pavimentos.
+
+No depende de Streamlit: se puede importar desde procesos de trabajo, lotes o servicios.
+"""
+from .trafico import (
+    CARGAS_POR_CAMINO, CLASES_VEHICULARES, REGISTRO_CLASES, COEF_EJES, EJES_BASE_CARGADOS,
+    cargar_registro, matriz_dispersa,
+    calcular_fcp, calcular_volumenes, calcular_CT,
+    composicion_vector, ejes_primer_anio, pesos_clase, ejes_acumulados, ejes_por_clase, tasas_vector,
+    transformar_vehiculos_a_ejes,
+)
+from .danio import EJES_TABLA, propiedades_ejes, radio_placa, esfuerzo_vertical, danio_unitario
+from .tablas import cargar_tabla, danio_tabla, curva_equivalentes, equivalentes_tabla
+from .esals import esals_por_profundidad, esals
+from .confiabilidad import (
+    CONSTANTES_U, calcular_T, calcular_U, calcular_U_exacta, calcular_B, calcular_VRS0, calcular_fz, calcular_ZG,
+    barrido_confianza,
+)
+from .cache import (
+    clave_entrada, CachePersistente, cache_persistente, ejes_persistentes, esals_persistentes,
+)
+from .diseno import COEF_GRAVA, revisar_malla, buscar_espesores, frente_pareto
+from .montecarlo import VARIABLES_ALEATORIAS, muestrear, simular_falla
+from .perfil import Perfilador, perfil_activo_por_entorno
+from .activos import leer_activo, variante_webp, data_uri, publicar_variante, url_publicada, precargar
+from .linea_tiempo import (
+    anios_calendario, CrecimientoAcumulado, calcular_CT_clases, LineaTiempoESAL, esals_anuales,
+)
+from .wim import EspectroCargas, espectro_csv, espectro_binario, equivalentes_espectro, esals_espectro
+from .capas import Capa, estructura_unam, revisar_capas
+from .grafo import huella, GrafoCalculo, grafo_unam
+from .profundidad import barrido_profundidad, grava_equivalente, diezmar
+from .mapas import mapa_factibilidad
+from .rehabilitacion import esal_admisible, vida_remanente, sobrecarpeta
+from .escenarios import comparar_escenarios
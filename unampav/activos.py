@@ -0,0 +1,95 @@
+"""
+Archivos de apoyo de la interfaz (imágenes de la guía y PDF) leídos y convertidos una sola vez por proceso.
+
+Las imágenes se publican como variantes WebP reducidas en la carpeta estática de Streamlit
+(server.enableStaticServing), de modo que el navegador las descarga y guarda en caché por URL
+en lugar de recibir un data URI en base64 de cientos de KB en cada rerun.
+Pillow se importa solo al generar una variante.
+"""
+import base64
+import io
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+ANCHO_MAXIMO = 1000
+CALIDAD_WEBP = 80
+
+_precarga = ThreadPoolExecutor(max_workers=2, thread_name_prefix="unampav-activos")
+_candado = threading.Lock()
+_publicadas = {}  # (ruta, subcarpeta) -> (URL, archivo) de las variantes ya escritas
+
+
+@lru_cache(maxsize=32)
+def leer_activo(ruta):
+    """Contenido del archivo `ruta` (se lee del disco una sola vez)."""
+    with open(ruta, "rb") as archivo:
+        return archivo.read()
+
+
+@lru_cache(maxsize=64)
+def variante_webp(ruta, ancho_max=ANCHO_MAXIMO, calidad=CALIDAD_WEBP):
+    """Imagen `ruta` reducida a `ancho_max` px de ancho como WebP; devuelve (bytes, tipo MIME).
+
+    Si Pillow no tiene soporte WebP se conserva el archivo original.
+    """
+    from PIL import Image, features
+
+    if not features.check("webp"):
+        return leer_activo(ruta), "image/png"
+    imagen = Image.open(io.BytesIO(leer_activo(ruta)))
+    if imagen.width > ancho_max:
+        imagen = imagen.resize((ancho_max, round(imagen.height * ancho_max / imagen.width)), Image.LANCZOS)
+    salida = io.BytesIO()
+    imagen.save(salida, "WEBP", quality=calidad, method=4)
+    return salida.getvalue(), "image/webp"
+
+
+@lru_cache(maxsize=64)
+def data_uri(ruta, ancho_max=ANCHO_MAXIMO, calidad=CALIDAD_WEBP):
+    """Variante WebP como data URI (respaldo cuando no hay carpeta estática)."""
+    contenido, tipo = variante_webp(ruta, ancho_max, calidad)
+    return f"data:{tipo};base64,{base64.b64encode(contenido).decode()}"
+
+
+def publicar_variante(ruta, carpeta_estatica, subcarpeta="ayuda", ancho_max=ANCHO_MAXIMO, calidad=CALIDAD_WEBP):
+    """Escribe la variante WebP en `carpeta_estatica/subcarpeta` y devuelve su URL relativa.
+
+    La URL tiene la forma app/static/<subcarpeta>/<archivo>. Devuelve None si la carpeta no se
+    puede escribir. El archivo se regenera si falta o si el original es más reciente; los fallos
+    no se recuerdan, de modo que la siguiente llamada lo vuelve a intentar.
+    """
+    contenido, tipo = variante_webp(ruta, ancho_max, calidad)
+    nombre = os.path.splitext(os.path.basename(ruta))[0] + (".webp" if tipo == "image/webp" else ".png")
+    carpeta = os.path.join(carpeta_estatica, subcarpeta)
+    destino = os.path.join(carpeta, nombre)
+    try:
+        with _candado:
+            if not os.path.exists(destino) or os.path.getmtime(destino) < os.path.getmtime(ruta):
+                os.makedirs(carpeta, exist_ok=True)
+                descriptor, temporal = tempfile.mkstemp(dir=carpeta, suffix=".tmp")
+                with os.fdopen(descriptor, "wb") as archivo:
+                    archivo.write(contenido)
+                os.chmod(temporal, 0o644)
+                os.replace(temporal, destino)
+    except OSError:
+        _publicadas.pop((ruta, subcarpeta), None)
+        return None
+    _publicadas[(ruta, subcarpeta)] = (f"app/static/{subcarpeta}/{nombre}", destino)
+    return _publicadas[(ruta, subcarpeta)][0]
+
+
+def precargar(rutas, carpeta_estatica, subcarpeta="ayuda"):
+    """Prepara en segundo plano las variantes de `rutas` (por ejemplo, la imagen vecina)."""
+    for ruta in rutas:
+        _precarga.submit(publicar_variante, ruta, carpeta_estatica, subcarpeta)
+
+
+def url_publicada(ruta, subcarpeta="ayuda"):
+    """URL de la variante de `ruta` si ya está publicada y su archivo existe (sin bloquear), o None."""
+    publicada = _publicadas.get((ruta, subcarpeta))
+    if publicada is None or not os.path.exists(publicada[1]):
+        return None
+    return publicada[0]
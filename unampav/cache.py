@@ -0,0 +1,167 @@
+"""
+Claves estables para memorizar resultados del motor entre reruns, sesiones y procesos.
+
+CachePersistente guarda tablas de ejes y ESAL's por profundidad en un archivo SQLite (modo WAL)
+compartido por todas las réplicas y que sobrevive a los reinicios; se activa con la variable de
+entorno UNAMPAV_CACHE_DB. El número de resultados está acotado y se descartan los menos usados.
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from .esals import esals
+from .trafico import CLASES_VEHICULARES, composicion_vector, tasas_vector, transformar_vehiculos_a_ejes
+
+MAX_ENTRADAS = 4096
+
+
+def clave_entrada(tc_nombre, params, cargados, vacios, tca=None, vida=None, periodos=None):
+    """
+    Hash SHA-256 del tipo de camino, la composición de 29 clases, los volúmenes cargados/vacíos
+    y, si se indican, la tasa de crecimiento y la vida de proyecto.
+    `tca` puede ser una tasa única o tasas por clase/periodo (ver esals), con sus `periodos`.
+    `params` puede ser el diccionario de composición o un vector en el orden de CLASES_VEHICULARES.
+    """
+    if isinstance(params, dict):
+        params = composicion_vector(params)
+    composicion = np.asarray(params, dtype=np.float64).reshape(len(CLASES_VEHICULARES))
+    h = hashlib.sha256(str(tc_nombre).encode())
+    h.update(composicion.tobytes())
+    h.update(np.array([cargados, vacios], dtype=np.float64).tobytes())
+    if tca is not None:
+        tca = tasas_vector(tca)
+    if tca is not None and (tca.ndim > 0 or periodos is not None):
+        # Tasas por clase o por periodo: se incluyen la forma, los valores y los años de cambio
+        h.update(repr(tca.shape).encode())
+        h.update(tca.astype(np.float64).tobytes())
+        h.update(np.asarray([] if periodos is None else periodos, dtype=np.float64).tobytes())
+        tca = np.nan
+    if tca is not None or vida is not None:
+        h.update(np.array([np.nan if tca is None else tca,
+                           np.nan if vida is None else vida], dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+# =============================================================================================================
+# Caché persistente en disco
+# =============================================================================================================
+class CachePersistente:
+    """
+    Resultados serializados (pickle) en SQLite, con desalojo LRU a `max_entradas`.
+
+    Cada hilo usa su propia conexión; el modo WAL permite lectores concurrentes mientras otro
+    proceso escribe, y busy_timeout espera a que se libere el candado en lugar de fallar.
+    Si la base no se puede abrir o escribir, el resultado se calcula normalmente.
+    """
+
+    def __init__(self, ruta, max_entradas=MAX_ENTRADAS, espera=10.0):
+        self.ruta = ruta
+        self.max_entradas = int(max_entradas)
+        self.espera = espera
+        self._local = threading.local()
+        with self._conexion() as con:
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS resultados "
+                "(clave TEXT PRIMARY KEY, valor BLOB NOT NULL, usado REAL NOT NULL)"
+            )
+            con.execute("CREATE INDEX IF NOT EXISTS resultados_usado ON resultados (usado)")
+
+    def _conexion(self):
+        con = getattr(self._local, "conexion", None)
+        if con is None:
+            carpeta = os.path.dirname(os.path.abspath(self.ruta))
+            os.makedirs(carpeta, exist_ok=True)
+            con = sqlite3.connect(self.ruta, timeout=self.espera)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexion = con
+        return con
+
+    def __len__(self):
+        return self._conexion().execute("SELECT COUNT(*) FROM resultados").fetchone()[0]
+
+    def obtener(self, clave):
+        """Valor guardado para `clave`, o None; marca la entrada como usada."""
+        con = self._conexion()
+        fila = con.execute("SELECT valor FROM resultados WHERE clave = ?", (clave,)).fetchone()
+        if fila is None:
+            return None
+        with con:
+            con.execute("UPDATE resultados SET usado = ? WHERE clave = ?", (time.time(), clave))
+        return pickle.loads(fila[0])
+
+    def guardar(self, clave, valor):
+        """Guarda `valor` y descarta las entradas menos usadas si se rebasa `max_entradas`."""
+        datos = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._conexion() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO resultados (clave, valor, usado) VALUES (?, ?, ?)",
+                (clave, sqlite3.Binary(datos), time.time()),
+            )
+            con.execute(
+                "DELETE FROM resultados WHERE clave IN (SELECT clave FROM resultados "
+                "ORDER BY usado DESC LIMIT -1 OFFSET ?)", (self.max_entradas,)
+            )
+
+    def memorizar(self, clave, funcion, *args):
+        """funcion(*args) leído del disco si ya se calculó con la misma `clave` (en este u otro proceso)."""
+        try:
+            valor = self.obtener(clave)
+        except sqlite3.Error:
+            return funcion(*args)
+        if valor is None:
+            valor = funcion(*args)
+            try:
+                self.guardar(clave, valor)
+            except sqlite3.Error:
+                pass
+        return valor
+
+    def limpiar(self):
+        with self._conexion() as con:
+            con.execute("DELETE FROM resultados")
+
+
+_persistentes = {}
+
+
+def cache_persistente(ruta=None, max_entradas=None):
+    """
+    Caché compartida del proceso para `ruta` (por omisión, la variable UNAMPAV_CACHE_DB).
+    Devuelve None si no se configuró una ruta o la base no se puede abrir.
+    """
+    ruta = ruta or os.environ.get("UNAMPAV_CACHE_DB")
+    if not ruta:
+        return None
+    if ruta not in _persistentes:
+        try:
+            _persistentes[ruta] = CachePersistente(
+                ruta, max_entradas or int(os.environ.get("UNAMPAV_CACHE_MAX", MAX_ENTRADAS))
+            )
+        except (OSError, sqlite3.Error):
+            _persistentes[ruta] = None
+    return _persistentes[ruta]
+
+
+def ejes_persistentes(cache, tc_nombre, params, fvp, fvv):
+    """transformar_vehiculos_a_ejes a través de la caché persistente (sin caché si `cache` es None)."""
+    if cache is None:
+        return transformar_vehiculos_a_ejes(tc_nombre, params, fvp, fvv)
+    clave = "ejes:" + clave_entrada(tc_nombre, params, fvp, fvv)
+    return cache.memorizar(clave, transformar_vehiculos_a_ejes, tc_nombre, params, fvp, fvv)
+
+
+def esals_persistentes(cache, Z, tc_nombre, params, fvp, fvv, tca, vida, periodos=None):
+    """esals(Z, ...) a través de la caché persistente; la clave incluye las profundidades Z."""
+    if cache is None:
+        return esals(Z, tc_nombre, params, fvp, fvv, tca, vida, periodos)
+    Z_arr = np.asarray(Z, dtype=np.float64)
+    h = hashlib.sha256(clave_entrada(tc_nombre, params, fvp, fvv, tca, vida, periodos).encode())
+    h.update(repr(Z_arr.shape).encode())
+    h.update(Z_arr.tobytes())
+    return cache.memorizar("esals:" + h.hexdigest(), esals, Z, tc_nombre, params, fvp, fvv, tca, vida, periodos)
@@ -0,0 +1,78 @@
+"""
+Estructura de pavimento de N capas y sus revisiones ZG.
+
+Cada capa tiene espesor, coeficiente de grava equivalente y, si es un material con CBR (bases,
+subbases, capas estabilizadas, subyacente, terracería mejorada, subrasante), una revisión en su cara
+superior: los ESAL's a esa profundidad fijan el espesor en grava equivalente requerido, que se compara
+con el aportado por las capas de arriba. Todas las revisiones se evalúan con una sola llamada a esals.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .confiabilidad import calcular_fz, calcular_ZG
+from .diseno import COEF_GRAVA
+from .esals import esals
+
+
+@dataclass(frozen=True)
+class Capa:
+    """
+    nombre      : descripción de la capa
+    espesor     : cm (la última capa, la subrasante, puede ir con 0: es semi-infinita)
+    coeficiente : coeficiente de grava equivalente
+    vrs         : CBR (%) del material; None para capas asfálticas sin revisión
+    base        : True usa VRS0 de bases y subbases (B1); False el de terracerías (B2)
+    """
+    nombre: str
+    espesor: float
+    coeficiente: float = 1.0
+    vrs: Optional[float] = None
+    base: bool = True
+
+
+def estructura_unam(D1, D2, D3, D4, vrs1, vrs2, vrs3):
+    """Las cuatro capas y la subrasante de la pestaña "Definición de espesores"."""
+    a1, a2, a3, a4 = COEF_GRAVA
+    return [
+        Capa("Carpeta asfáltica", D1, a1),
+        Capa("Base asfáltica", D2, a2),
+        Capa("Base hidráulica", D3, a3, vrs1),
+        Capa("Subbase hidráulica", D4, a4, vrs2),
+        Capa("Subrasante", 0.0, 1.0, vrs3, base=False),
+    ]
+
+
+def revisar_capas(capas, tc_nombre, params, fvp, fvv, tca, vida, VRS01, VRS02, espesores=None,
+                  periodos=None):
+    """
+    Revisiones ZG en la cara superior de cada capa con CBR.
+
+    espesores : opcional, arreglo (..., N) para revisar a la vez muchas variantes de espesores
+                de la misma estructura (por omisión, los espesores de `capas`).
+    Devuelve un diccionario con una columna por revisión (última dimensión):
+      capa, Z, esal, fz, Zg, zge, margen (zge - Zg), cumple, y cumple_todo (todas las revisiones).
+    """
+    D = np.asarray([c.espesor for c in capas] if espesores is None else espesores, dtype=float)
+    coef = np.array([c.coeficiente for c in capas])
+    revisadas = np.array([i for i, c in enumerate(capas) if c.vrs is not None], dtype=np.intp)
+    vrs = np.array([capas[i].vrs for i in revisadas], dtype=float)
+    VRS0 = np.where([capas[i].base for i in revisadas], VRS01, VRS02)
+
+    # Profundidad y grava equivalente por encima de cada capa: sumas acumuladas sin la capa misma
+    Z_arriba = np.cumsum(D, axis=-1) - D
+    zge_arriba = np.cumsum(D * coef, axis=-1) - D * coef
+    Z = Z_arriba[..., revisadas]
+    zge = zge_arriba[..., revisadas]
+
+    esal = esals(Z, tc_nombre, params, fvp, fvv, tca, vida, periodos)
+    fz = calcular_fz(vrs, VRS0, esal)
+    Zg = calcular_ZG(fz)
+    margen = zge - Zg
+    cumple = margen >= 0
+    return {
+        "capa": [capas[i].nombre for i in revisadas],
+        "Z": Z, "esal": esal, "fz": fz, "Zg": Zg, "zge": zge,
+        "margen": margen, "cumple": cumple, "cumple_todo": cumple.all(axis=-1),
+    }
@@ -0,0 +1,74 @@
+"""
+Cadena de confiabilidad y espesores del método UNAM (pestaña "Definición de espesores"):
+T -> U -> B1/B2 -> VRS0 -> fz -> ZG.
+"""
+import numpy as np
+
+# Constantes de la aproximación racional de la distribución normal (C1 a C6)
+CONSTANTES_U = (2.515517, 0.802853, 0.010328, 1.432788, 0.189269, 0.001308)
+
+
+def calcular_T(Qu):
+    """T a partir del nivel de confianza Qu expresado en fracción (0.90 = 90 %)."""
+    return np.sqrt(np.log(1 / ((1 - Qu) ** 2)))
+
+
+def calcular_U(T):
+    """Abscisa del nivel de confianza U."""
+    C1, C2, C3, C4, C5, C6 = CONSTANTES_U
+    numerador_U = C1 + C2 * T + C3 * T**2
+    denominador_U = 1 + C4 * T + C5 * T**2 + C6 * T**3
+    return T - (numerador_U / denominador_U)
+
+
+def calcular_U_exacta(Qu):
+    """Abscisa U con el cuantil exacto de la distribución normal (scipy), para Qu escalar o arreglo."""
+    from scipy.stats import norm
+
+    return norm.ppf(Qu)
+
+
+def calcular_B(U):
+    """Constantes experimentales (B1, B2): B1 para bases, B2 para subbase e inferiores."""
+    B1 = 0.8477 + 0.12 * U
+    B2 = 0.4547 + 0.1593 * U
+    return B1, B2
+
+
+def calcular_VRS0(B):
+    """VRS0 = 10^B."""
+    return 10 ** B
+
+
+def calcular_fz(vrs, VRS0, esal):
+    """Factor de influencia de Boussinesq para el CBR `vrs` y los ESAL's a la profundidad de la capa."""
+    return vrs / ((VRS0 * (1.5) ** (np.log10(esal))))
+
+
+def calcular_ZG(fz):
+    """
+    Espesor en grava equivalente requerido (cm).
+    Con fz ≥ 1 el material ya resiste por sí solo y el espesor requerido es 0.
+    """
+    fz = np.asarray(fz, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        Zg = 15 / np.sqrt((1 / (1 - fz) ** (2 / 3)) - 1)
+    return np.where(fz >= 1, 0.0, Zg)[()]
+
+
+def barrido_confianza(Qu, vrs, esal, base=(True, True, False)):
+    """
+    Espesores en grava equivalente requeridos para un arreglo de niveles de confianza, en una llamada.
+
+    Qu   : niveles de confianza en fracción, forma (n,)
+    vrs  : CBR de las capas revisadas (vrs1, vrs2, vrs3)
+    esal : ESAL's acumulados en la cara superior de cada una (no dependen de la confianza)
+    base : True usa VRS0 de bases (B1), False el de subbase e inferiores (B2)
+    Devuelve un diccionario con U, B1, B2, VRS01, VRS02 (n,) y Zg (n, revisiones).
+    """
+    U = calcular_U_exacta(np.asarray(Qu, dtype=float))
+    B1, B2 = calcular_B(U)
+    VRS01, VRS02 = calcular_VRS0(B1), calcular_VRS0(B2)
+    VRS0 = np.where(np.asarray(base), VRS01[..., None], VRS02[..., None])
+    Zg = calcular_ZG(calcular_fz(np.asarray(vrs, dtype=float), VRS0, np.asarray(esal, dtype=float)))
+    return {"U": U, "B1": B1, "B2": B2, "VRS01": VRS01, "VRS02": VRS02, "Zg": Zg}
@@ -0,0 +1,67 @@
+"""
+Daño unitario por fila de ejes en función de la profundidad Z (solución de Boussinesq).
+"""
+import numpy as np
+
+# Las 17 filas de ejes se agrupan en sencillos (0-7), tándem (8-13) y trídem (14-16).
+# La fila 0 (automóvil) trabaja con presión de contacto q = 2, el resto con q = 6.
+PRESION_EJES = np.array([2.0] + [6.0] * 16)
+LLANTAS_EJES = np.array([2.0] * 8 + [4.0] * 6 + [6.0] * 3)          # divisor de π·q en el radio de placa
+FACTOR_PROFUNDO = np.array([1000.0] * 8 + [1111.0] * 6 + [1333.0] * 3)  # factor de carga para Z ≥ 30
+N_SOMERO = np.array([1.0] * 8 + [2.0] * 6 + [3.0] * 3)               # repeticiones por eje para Z < 30
+
+# Propiedades de las 17 filas de la tabla: (presión, llantas, factor para Z ≥ 30, repeticiones para Z < 30)
+EJES_TABLA = (PRESION_EJES, LLANTAS_EJES, FACTOR_PROFUNDO, N_SOMERO)
+
+
+def propiedades_ejes(grupos, presion=6.0):
+    """
+    Propiedades de filas de ejes arbitrarias (por ejemplo, las clases de un espectro de pesaje),
+    en el mismo formato que EJES_TABLA. `grupos`: 0 sencillo, 1 tándem, 2 trídem.
+    """
+    g = np.asarray(grupos, dtype=np.intp)
+    presion = np.broadcast_to(np.asarray(presion, dtype=float), g.shape)
+    return presion, np.array([2.0, 4.0, 6.0])[g], np.array([1000.0, 1111.0, 1333.0])[g], np.array([1.0, 2.0, 3.0])[g]
+
+
+def _difundir(Z, filas):
+    """Alinea Z (cualquier forma) contra un arreglo (..., 17) para operar en un solo paso."""
+    Z = np.asarray(Z, dtype=float)
+    filas = np.asarray(filas, dtype=float)
+    filas = filas.reshape(filas.shape[:-1] + (1,) * Z.ndim + filas.shape[-1:])
+    return Z[..., None], filas
+
+
+def radio_placa(Z, cargas, somero=None, ejes=EJES_TABLA):
+    """
+    Radio de placa (cm) de cada fila de ejes para una o varias profundidades Z (cm).
+    `cargas` son las toneladas por fila, (17,) o (..., 17) para varios tipos de camino.
+    `somero` fuerza la rama Z < 30 (True) o Z ≥ 30 (False); por omisión se decide con Z.
+    `ejes` describe las filas (ver propiedades_ejes); por omisión, las 17 filas de la tabla.
+    Devuelve un arreglo de forma cargas.shape[:-1] + Z.shape + (17,).
+    """
+    presion, llantas, factor_profundo, _ = ejes
+    Z, P = _difundir(Z, cargas)
+    somero = Z < 30 if somero is None else somero
+    factor = np.where(somero, 1000.0, factor_profundo)
+    return np.sqrt((factor * P) / (llantas * np.pi * presion))
+
+
+def esfuerzo_vertical(Z, radio, ejes=EJES_TABLA):
+    """Esfuerzo vertical de Boussinesq bajo cada placa; `radio` viene de radio_placa(Z, ...)."""
+    Z = np.asarray(Z, dtype=float)[..., None]
+    return ejes[0] * (1 - (Z**3) / ((radio**2 + Z**2) ** 1.5))
+
+
+def danio_unitario(Z, cargas, somero=None, ejes=EJES_TABLA):
+    """
+    Daño unitario de cada fila de ejes respecto al eje estándar, para un arreglo de profundidades Z.
+    Misma forma de salida y mismos `somero` y `ejes` que radio_placa.
+    """
+    sigma_z = esfuerzo_vertical(Z, radio_placa(Z, cargas, somero, ejes), ejes)
+    Z = np.asarray(Z, dtype=float)[..., None]
+    somero = Z < 30 if somero is None else somero
+    # Cálculo del esfuerzo vertical de un eje estándar
+    sigma_z_st = 5.8 * (1 - (Z**3) / ((15**2 + Z**2) ** 1.5))
+    N = np.where(somero, ejes[3], 1.0)
+    return (10 ** ((np.log10(sigma_z) - np.log10(sigma_z_st)) / np.log10(1.5))) * N
@@ -0,0 +1,186 @@
+"""
+Búsqueda automática de espesores: recorre la malla de espesores D1..D4 y devuelve la estructura
+mínima que cumple las tres revisiones ZG de la pestaña "Definición de espesores".
+"""
+import numpy as np
+
+from .confiabilidad import calcular_fz, calcular_ZG
+from .esals import esals
+
+# Coeficientes de grava equivalente: carpeta, base asfáltica, base hidráulica, subbase
+COEF_GRAVA = (2.0, 1.5, 1.0, 1.0)
+
+# Combinaciones por bloque al recorrer la malla (la de 0 a 50 cm cada 1 cm tiene 51⁴ ≈ 6.8 millones)
+ELEMENTOS_BLOQUE = 1 << 18
+
+
+def _revisiones(espesores, VRS01, VRS02):
+    """Profundidades, grava equivalente real y VRS0 de las tres revisiones de estructuras D1..D4, (..., 3)."""
+    D = np.asarray(espesores, dtype=float)
+    Z = np.cumsum(D, axis=-1)[..., 1:]
+    zge = np.cumsum(D * np.asarray(COEF_GRAVA), axis=-1)[..., 1:]
+    VRS0 = np.array([VRS01, VRS01, VRS02], dtype=float)
+    return Z, zge, VRS0
+
+
+def _zg_revisiones(vrs, VRS0, esal):
+    """ZG que exige cada revisión con su CBR, su VRS0 y los ESAL's a su profundidad."""
+    return calcular_ZG(calcular_fz(vrs, VRS0, esal))
+
+
+def _malla(minimos, maximos, paso):
+    """Valores admisibles por capa; todas comparten el mismo paso."""
+    minimos = np.broadcast_to(np.asarray(minimos, dtype=float), (4,))
+    maximos = np.broadcast_to(np.asarray(maximos, dtype=float), (4,))
+    return [np.arange(lo, hi + paso / 2, paso) for lo, hi in zip(minimos, maximos)]
+
+
+def _bloques_malla(tc_nombre, params, fvp, fvv, tca, vida, vrs1, vrs2, vrs3, VRS01, VRS02,
+                   minimos, maximos, paso, periodos, elementos=None):
+    """
+    Recorre la malla en bloques de renglones de D1 de a lo más `elementos` combinaciones
+    (ELEMENTOS_BLOQUE por omisión).
+
+    Como los ESAL's solo dependen de la profundidad acumulada, se calculan una vez por cada
+    profundidad posible (una sola llamada vectorizada) y se reparten por índice en cada bloque.
+    Primero genera las capas; después (inicio, cumple, margen) por bloque, donde `inicio` es el
+    índice de D1 del primer renglón del bloque.
+    """
+    D1, D2, D3, D4 = capas = _malla(minimos, maximos, paso)
+    a1, a2, a3, a4 = COEF_GRAVA
+    yield capas
+
+    # Profundidad = suma de los mínimos + (suma de índices) · paso
+    base = np.cumsum([c[0] for c in capas])
+    n_indices = sum(len(c) - 1 for c in capas) + 1
+    Z_rel = np.arange(n_indices) * paso
+    Z = np.concatenate([base[1] + Z_rel, base[2] + Z_rel, base[3] + Z_rel])
+    esal = esals(Z, tc_nombre, params, fvp, fvv, tca, vida, periodos).reshape(3, n_indices)
+    Zg1 = calcular_ZG(calcular_fz(vrs1, VRS01, esal[0]))
+    Zg2 = calcular_ZG(calcular_fz(vrs2, VRS01, esal[1]))
+    Zg3 = calcular_ZG(calcular_fz(vrs3, VRS02, esal[2]))
+
+    i1, i2, i3, i4 = (np.arange(len(c), dtype=np.int32) for c in capas)
+    elementos = ELEMENTOS_BLOQUE if elementos is None else elementos
+    filas = max(1, int(min(elementos // (len(D2) * len(D3) * len(D4)), len(D1))))
+    for inicio in range(0, len(D1), filas):
+        b = slice(inicio, inicio + filas)
+        s1 = i1[b, None, None, None] + i2[None, :, None, None]
+        s2 = s1 + i3[None, None, :, None]
+        s3 = s2 + i4[None, None, None, :]
+
+        zge1 = a1 * D1[b, None, None, None] + a2 * D2[None, :, None, None]
+        zge2 = zge1 + a3 * D3[None, None, :, None]
+        zge3 = zge2 + a4 * D4[None, None, None, :]
+
+        margen = (zge1 - Zg1[s1], zge2 - Zg2[s2], zge3 - Zg3[s3])
+        cumple = (margen[0] >= 0) & (margen[1] >= 0) & (margen[2] >= 0)
+        yield inicio, cumple, margen
+
+
+def revisar_malla(tc_nombre, params, fvp, fvv, tca, vida, vrs1, vrs2, vrs3, VRS01, VRS02,
+                  minimos=0.0, maximos=50.0, paso=1.0, periodos=None):
+    """
+    Evalúa las tres revisiones para todas las combinaciones D1..D4 de la malla.
+
+    Arma la malla completa en memoria; buscar_espesores y frente_pareto la recorren por bloques.
+    Devuelve (espesores, cumple, margen):
+      espesores : lista con los 4 vectores de espesores admisibles
+      cumple    : arreglo booleano (n1, n2, n3, n4) con las tres revisiones satisfechas
+      margen    : tupla con zge - Zg de cada revisión, difundible contra `cumple`
+    """
+    bloques = _bloques_malla(tc_nombre, params, fvp, fvv, tca, vida, vrs1, vrs2, vrs3, VRS01, VRS02,
+                             minimos, maximos, paso, periodos, elementos=np.inf)
+    capas = next(bloques)
+    _, cumple, margen = next(bloques)
+    return capas, cumple, margen
+
+
+def buscar_espesores(tc_nombre, params, fvp, fvv, tca, vida, vrs1, vrs2, vrs3, VRS01, VRS02,
+                     minimos=0.0, maximos=50.0, paso=1.0, criterio="total", periodos=None):
+    """
+    Estructura mínima que cumple zge1 ≥ Zg1, zge2 ≥ Zg2 y zge3 ≥ Zg3.
+
+    criterio = "total" : menor espesor total D1+D2+D3+D4; en empate, menor D1, luego D2, D3.
+    criterio = "capas" : mínimo por orden de capas (primero D1, luego D2, D3 y D4).
+    `minimos` y `maximos` pueden ser un valor o uno por capa; `paso` es común a las 4 capas.
+    `tca` y `periodos` admiten tasas por clase y por periodo, como en esals.
+    Devuelve (D1, D2, D3, D4) o None si ninguna combinación de la malla cumple.
+    """
+    if criterio not in ("total", "capas"):
+        raise ValueError(f"Criterio '{criterio}' no reconocido.")
+    bloques = _bloques_malla(tc_nombre, params, fvp, fvv, tca, vida, vrs1, vrs2, vrs3, VRS01, VRS02,
+                             minimos, maximos, paso, periodos)
+    capas = next(bloques)
+    i1, i2, i3, i4 = (np.arange(len(c), dtype=np.int32) for c in capas)
+    mejor = None  # (suma de índices, índice plano en la malla completa)
+    for inicio, cumple, _ in bloques:
+        plano = cumple.ravel()
+        if not plano.any():
+            continue
+        if criterio == "capas":
+            # El orden C de la malla ya es el orden D1, D2, D3, D4: el primer bloque con solución decide
+            mejor = (0, inicio * plano.size // len(cumple) + np.argmax(plano))
+            break
+        # Con paso común, el espesor total solo depende de la suma de índices de la malla;
+        # en empate gana el bloque anterior (menor D1)
+        suma = (i1[inicio:inicio + len(cumple), None, None, None] + i2[None, :, None, None]
+                + i3[None, None, :, None] + i4[None, None, None, :]).ravel()
+        minima = suma[plano].min()
+        if mejor is None or minima < mejor[0]:
+            mejor = (minima, inicio * plano.size // len(cumple) + np.flatnonzero(plano & (suma == minima))[0])
+    if mejor is None:
+        return None
+    i = np.unravel_index(mejor[1], tuple(len(c) for c in capas))
+    return tuple(float(c[k]) for c, k in zip(capas, i))
+
+
+def frente_pareto(tc_nombre, params, fvp, fvv, tca, vida, vrs1, vrs2, vrs3, VRS01, VRS02, costos,
+                  minimos=0.0, maximos=50.0, paso=1.0, periodos=None):
+    """
+    Frente de Pareto costo vs. margen de seguridad de las estructuras de la malla que cumplen.
+
+    costos : costo por m³ de carpeta, base asfáltica, base hidráulica y subbase; el costo de una
+             estructura es por m² de calzada, Σ costo_i · D_i / 100.
+    El margen de una estructura es el menor zge - Zg de sus tres revisiones. Una estructura está en
+    el frente si ninguna otra cuesta lo mismo o menos con un margen mayor o igual.
+    Devuelve (espesores, costo, margen) ordenados por costo creciente: espesores es (k, 4) y el
+    primer renglón es la estructura más económica que cumple. Arreglos vacíos si ninguna cumple.
+    """
+    bloques = _bloques_malla(tc_nombre, params, fvp, fvv, tca, vida, vrs1, vrs2, vrs3, VRS01, VRS02,
+                             minimos, maximos, paso, periodos)
+    capas = next(bloques)
+    c1, c2, c3, c4 = (np.asarray(costos, dtype=float) / 100).reshape(4)
+    D1, D2, D3, D4 = capas
+    forma = tuple(len(c) for c in capas)
+
+    # Frente de cada bloque y después el de la unión: una estructura dominada dentro de su bloque
+    # también lo está en la malla completa, y el orden por bloques conserva el desempate por índice
+    costos_frente, seguridad_frente, indices_frente = [], [], []
+    for inicio, cumple, margen in bloques:
+        costo = (c1 * D1[inicio:inicio + len(cumple), None, None, None] + c2 * D2[None, :, None, None]
+                 + c3 * D3[None, None, :, None] + c4 * D4[None, None, None, :])
+        costo = np.broadcast_to(costo, cumple.shape)[cumple]
+        seguridad = np.minimum(np.minimum(margen[0], margen[1]), margen[2])
+        seguridad = np.broadcast_to(seguridad, cumple.shape)[cumple]
+        frente = _frente(costo, seguridad)
+        costos_frente.append(costo[frente])
+        seguridad_frente.append(seguridad[frente])
+        indices_frente.append(inicio * cumple[0].size + np.flatnonzero(cumple)[frente])
+    costo, seguridad, indices = (np.concatenate(v) for v in (costos_frente, seguridad_frente, indices_frente))
+    frente = _frente(costo, seguridad)
+
+    i = np.unravel_index(indices[frente], forma)
+    espesores = np.column_stack([c[k] for c, k in zip(capas, i)]).reshape(-1, 4)
+    return espesores, costo[frente], seguridad[frente]
+
+
+def _frente(costo, seguridad):
+    """
+    Índices del frente por costo creciente (y margen decreciente en empates): queda cada estructura
+    cuyo margen supera al de todas las más baratas.
+    """
+    orden = np.lexsort((-seguridad, costo))
+    ordenada = seguridad[orden]
+    previo = np.maximum.accumulate(np.concatenate(([-np.inf], ordenada[:-1])))
+    return orden[ordenada > previo]
@@ -0,0 +1,42 @@
+"""
+Motor de ESAL's: daño unitario por fila de ejes y ejes equivalentes acumulados en función de Z.
+"""
+import numpy as np
+
+from .danio import _difundir, danio_unitario
+from .tablas import equivalentes_tabla
+from .linea_tiempo import calcular_CT_clases
+from .trafico import calcular_CT, composicion_vector, ejes_acumulados, ejes_primer_anio, tasas_vector
+
+
+def esals_por_profundidad(Z, ejes, cargas, CT):
+    """
+    ESAL's acumulados en la vida de proyecto para un arreglo de profundidades Z (cm), en una sola pasada.
+
+    ejes   : ejes del 1er año por fila, (17,) o (..., 17)
+    cargas : cargas en toneladas por fila, (17,) o (..., 17) para varios tipos de camino
+    CT     : factor de crecimiento de tráfico (ver calcular_CT)
+    """
+    d = danio_unitario(Z, cargas)
+    _, ejes = _difundir(Z, ejes)
+    return CT * np.sum(ejes * d, axis=-1)
+
+
+def esals(Z, tc_nombre, params, fvp, fvv, tca, vida, periodos=None):
+    """
+    Calcula los ESAL's acumulados en la vida de proyecto a partir de la profundidad Z (cm).
+    Acepta un escalar o un arreglo de profundidades. No depende de estado global.
+    El daño unitario se interpola en la tabla del tipo de camino (ver unampav.tablas).
+
+    tca puede ser una tasa única (%), una por clase (diccionario o vector de 29) y, con `periodos`,
+    una por periodo (ver CrecimientoAcumulado).
+    """
+    tca = tasas_vector(tca)
+    composicion = composicion_vector(params)
+    if tca.ndim == 0 and periodos is None:
+        ejes = ejes_primer_anio(composicion, fvp, fvv)
+        # Curva de ejes equivalentes (tabla del tipo de camino · ejes del 1er año) interpolada en Z
+        return calcular_CT(float(tca), vida) * equivalentes_tabla(Z, tc_nombre, ejes)
+    # Ejes acumulados en la vida con el factor de crecimiento de cada clase
+    ejes = ejes_acumulados(composicion, fvp, fvv, calcular_CT_clases(tca, vida, periodos))
+    return equivalentes_tabla(Z, tc_nombre, ejes)
@@ -0,0 +1,55 @@
+"""
+Comparación de alternativas de un mismo tramo: cada escenario tiene sus espesores D1..D4, sus CBR's
+y, opcionalmente, su propio TDPA, tasa de crecimiento o vida de proyecto.
+
+Los escenarios con el mismo tránsito se agrupan: para cada grupo se hace una sola transformación a
+ejes y una sola llamada a esals con las profundidades de todos sus escenarios.
+"""
+import numpy as np
+
+from .diseno import _revisiones, _zg_revisiones
+from .esals import esals
+from .trafico import calcular_volumenes
+
+
+def comparar_escenarios(espesores, vrs, tc_nombre, params, tdpa, nc, vc, tca, vida, VRS01, VRS02,
+                        periodos=None, tdpa_escenario=None, tca_escenario=None, vida_escenario=None):
+    """
+    Revisiones ZG de n escenarios a la vez.
+
+    espesores : (n, 4) D1..D4 de cada escenario; vrs : (n, 3) CBR de base, subbase y subrasante
+    tdpa_escenario, tca_escenario, vida_escenario : opcionales, (n,); NaN (o None) usa el valor del
+                tramo. Una tasa propia es única para todas las clases y sin periodos.
+    Devuelve un diccionario con arreglos (n, 3): Z, esal, Zg, zge, margen (zge - Zg), cumple,
+    y cumple_todo (n,).
+    """
+    Z, zge, VRS0 = _revisiones(np.reshape(espesores, (-1, 4)), VRS01, VRS02)
+    n = len(Z)
+    vrs = np.broadcast_to(np.asarray(vrs, dtype=float), (n, 3))
+
+    def propio(valores):
+        if valores is None:
+            return np.full(n, np.nan)
+        return np.asarray([np.nan if v is None else v for v in np.ravel(valores)], dtype=float)
+
+    trafico = np.column_stack([propio(tdpa_escenario), propio(tca_escenario), propio(vida_escenario)])
+    # NaN no se agrupa consigo mismo en np.unique: se agrupa por (usa el del tramo, valor propio)
+    base = np.isnan(trafico)
+    grupos, grupo = np.unique(np.hstack([base, np.where(base, 0.0, trafico)]), axis=0, return_inverse=True)
+    grupo = grupo.ravel()
+
+    esal = np.empty((n, 3))
+    for g, (base_tdpa, base_tca, base_vida, tdpa_g, tca_g, vida_g) in enumerate(grupos):
+        _, fvp, fvv = calcular_volumenes(tdpa if base_tdpa else tdpa_g, nc, vc)
+        tasas, periodos_g = (tca, periodos) if base_tca else (tca_g, None)
+        filas = grupo == g
+        esal[filas] = esals(Z[filas], tc_nombre, params, fvp, fvv, tasas, vida if base_vida else vida_g,
+                            periodos_g)
+
+    Zg = _zg_revisiones(vrs, VRS0, esal)
+    margen = zge - Zg
+    cumple = margen >= 0
+    return {
+        "Z": Z, "esal": esal, "Zg": Zg, "zge": zge,
+        "margen": margen, "cumple": cumple, "cumple_todo": cumple.all(axis=1),
+    }
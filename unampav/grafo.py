@@ -0,0 +1,101 @@
+"""
+Grafo de dependencias de la cadena de cálculo: recalcula solo los nodos invalidados.
+
+Cada nodo tiene un nombre, una función y las entradas/nodos de los que depende. Al pedir un valor,
+se comparan las huellas (hash) de sus dependencias con las del último cálculo; si no cambiaron se
+devuelve el valor guardado. Si un nodo se recalcula y produce el mismo resultado, su huella no cambia
+y los nodos de abajo tampoco se recalculan (corte temprano). Así, mover D4 solo recalcula Prof3,
+Esal3, fz3, Zg3 y las revisiones de esa columna.
+"""
+import functools
+import hashlib
+import operator
+import pickle
+
+from .cache import ejes_persistentes, esals_persistentes
+from .confiabilidad import calcular_fz, calcular_ZG
+from .diseno import COEF_GRAVA
+from .trafico import calcular_volumenes
+
+
+def huella(valor):
+    """Hash estable de un valor (números, diccionarios, arreglos, DataFrames...)."""
+    return hashlib.blake2b(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16).digest()
+
+
+class GrafoCalculo:
+    """Nodos de cálculo con memoria por huella de sus dependencias."""
+
+    def __init__(self):
+        self._nodos = {}    # nombre -> (función, dependencias)
+        self._valores = {}
+        self._huellas = {}  # nombre -> huella del valor actual
+        self._claves = {}   # nombre -> huellas de las dependencias con que se calculó
+        self.recalculados = []
+
+    def nodo(self, nombre, funcion, *dependencias):
+        """Define el nodo `nombre` = funcion(*valores de `dependencias`)."""
+        self._nodos[nombre] = (funcion, dependencias)
+
+    def entradas(self, **valores):
+        """Asigna valores de entrada; solo cambia la huella de las que realmente cambiaron."""
+        for nombre, valor in valores.items():
+            h = huella(valor)
+            if self._huellas.get(nombre) != h:
+                self._valores[nombre] = valor
+                self._huellas[nombre] = h
+
+    def valor(self, nombre):
+        """Valor del nodo o entrada `nombre`, recalculando solo si cambió alguna dependencia."""
+        if nombre not in self._nodos:
+            if nombre not in self._valores:
+                raise KeyError(f"La entrada '{nombre}' no tiene valor.")
+            return self._valores[nombre]
+        funcion, dependencias = self._nodos[nombre]
+        argumentos = [self.valor(d) for d in dependencias]
+        clave = tuple(self._huellas[d] for d in dependencias)
+        if self._claves.get(nombre) != clave:
+            resultado = funcion(*argumentos)
+            self._valores[nombre] = resultado
+            self._huellas[nombre] = huella(resultado)
+            self._claves[nombre] = clave
+            self.recalculados.append(nombre)
+        return self._valores[nombre]
+
+    def nuevo_ciclo(self):
+        """Limpia el registro de nodos recalculados (por ejemplo, al inicio de cada rerun)."""
+        self.recalculados = []
+
+
+def grafo_unam(persistente=None, ejes=None, esals=None):
+    """
+    Cadena de la pestaña "Definición de espesores":
+    volúmenes → tabla de ejes; D1..D4 → Prof1..3 → Esal1..3 → fz1..3 → Zg1..3 → cumple1..3.
+
+    Entradas: tc_nombre, params, tdpa, nc, vc, tca, vida, periodos, D1..D4, vrs1..vrs3, VRS01, VRS02.
+    persistente : CachePersistente opcional para la tabla de ejes y los ESAL's (compartidos entre procesos).
+    ejes, esals : funciones opcionales con la firma de transformar_vehiculos_a_ejes y de esals que respaldan
+                  esos nodos (por ejemplo, las versiones memorizadas del cliente); sustituyen a `persistente`.
+    """
+    a1, a2, a3, a4 = COEF_GRAVA
+    ejes = ejes or functools.partial(ejes_persistentes, persistente)
+    esals = esals or functools.partial(esals_persistentes, persistente)
+    g = GrafoCalculo()
+    g.nodo("volumenes", calcular_volumenes, "tdpa", "nc", "vc")
+    g.nodo("fvp", operator.itemgetter(1), "volumenes")
+    g.nodo("fvv", operator.itemgetter(2), "volumenes")
+    g.nodo("ejes", ejes, "tc_nombre", "params", "fvp", "fvv")
+
+    g.nodo("Prof1", operator.add, "D1", "D2")
+    g.nodo("Prof2", operator.add, "Prof1", "D3")
+    g.nodo("Prof3", operator.add, "Prof2", "D4")
+    g.nodo("zge1", lambda D1, D2: a1 * D1 + a2 * D2, "D1", "D2")
+    g.nodo("zge2", lambda zge1, D3: zge1 + a3 * D3, "zge1", "D3")
+    g.nodo("zge3", lambda zge2, D4: zge2 + a4 * D4, "zge2", "D4")
+    for i, (vrs, VRS0) in enumerate((("vrs1", "VRS01"), ("vrs2", "VRS01"), ("vrs3", "VRS02")), start=1):
+        g.nodo(f"Esal{i}", esals, f"Prof{i}", "tc_nombre", "params", "fvp", "fvv",
+               "tca", "vida", "periodos")
+        g.nodo(f"fz{i}", calcular_fz, vrs, VRS0, f"Esal{i}")
+        g.nodo(f"Zg{i}", calcular_ZG, f"fz{i}")
+        g.nodo(f"cumple{i}", operator.ge, f"zge{i}", f"Zg{i}")
+    return g
@@ -0,0 +1,122 @@
+"""
+ESAL's acumulados año por año (años × profundidades) en lugar de un solo factor CT.
+
+El factor de crecimiento de la vida completa es la suma de los factores anuales (1+r)^k, k = 0..n-1;
+aquí se guardan esas sumas prefijo y se extienden cuando se piden más años, de modo que cambiar la
+vida útil o agregar años no recalcula lo anterior. Útil para construcción por etapas y para decidir
+el momento de una rehabilitación.
+"""
+import numpy as np
+
+from .tablas import danio_tabla, equivalentes_tabla
+from .trafico import composicion_vector, ejes_por_clase, ejes_primer_anio, tasas_vector
+
+
+def anios_calendario(vida):
+    """Años 1, 2, ..., vida; si la vida no es entera, el último punto es la vida misma."""
+    n = int(np.ceil(vida))
+    t = np.arange(1, n + 1, dtype=float)
+    if n:
+        t[-1] = vida
+    return t
+
+
+class CrecimientoAcumulado:
+    """
+    Sumas prefijo de los factores de crecimiento anuales.
+
+    tca      : tasa anual (%) escalar, por clase (29,) o por periodo (P,) / (P, 29)
+    periodos : con tasas por periodo, los P - 1 años en que termina cada periodo
+               (por ejemplo periodos=[5]: la primera tasa rige los años 1 a 5 y la segunda del 6 en adelante)
+
+    Los factores (1+r)^k se obtienen con productos acumulados (cumprod) sobre los años, para todas las
+    clases a la vez. Con una tasa única, acumulado(t) vale ((1+r)^t - 1)/r (o t si r = 0), igual que
+    calcular_CT(tca, t); con tasas por clase devuelve un factor por clase.
+    """
+
+    def __init__(self, tca, periodos=None):
+        self.tasas = np.asarray(tca, dtype=float) / 100
+        self.periodos = None if periodos is None else np.asarray(periodos, dtype=float)
+        if self.periodos is not None and len(self.periodos) != len(self.tasas) - 1:
+            raise ValueError("Se requiere un año de cambio menos que tasas por periodo.")
+        forma = self.tasas.shape[1:] if self.periodos is not None else self.tasas.shape
+        self._factor = np.ones((1,) + forma)    # producto de (1+r_j) para j < k, k = 0..n
+        self._prefijo = np.zeros((1,) + forma)  # suma de los factores de los años previos a k
+
+    @property
+    def anios(self):
+        return len(self._prefijo) - 1
+
+    def tasa(self, k):
+        """Tasa (fracción) que rige durante el año k + 1, para un arreglo de índices k."""
+        k = np.asarray(k)
+        if self.periodos is None:
+            return np.broadcast_to(self.tasas, k.shape + self.tasas.shape)
+        return self.tasas[np.searchsorted(self.periodos, k + 1, side="left")]
+
+    def extender(self, n):
+        """Garantiza las sumas prefijo hasta el año n, calculando solo los años nuevos."""
+        faltan = int(n) - self.anios
+        if faltan <= 0:
+            return
+        crecimiento = 1 + self.tasa(np.arange(self.anios, int(n)))
+        nuevos = self._factor[-1] * np.cumprod(crecimiento, axis=0)
+        sumandos = np.concatenate((self._factor[-1:], nuevos[:-1]))
+        self._prefijo = np.concatenate((self._prefijo, self._prefijo[-1] + np.cumsum(sumandos, axis=0)))
+        self._factor = np.concatenate((self._factor, nuevos))
+
+    def acumulado(self, t):
+        """Factor acumulado al año t (escalar o arreglo; admite años fraccionarios): t.shape + forma de la tasa."""
+        t = np.asarray(t, dtype=float)
+        k = np.floor(t).astype(int)
+        self.extender(k.max(initial=0))
+        forma = (Ellipsis,) + (None,) * (self._factor.ndim - 1)
+        fraccion = (t - k)[forma]
+        r = self.tasa(k)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            parcial = np.where(r != 0, ((1 + r) ** fraccion - 1) / np.where(r != 0, r, 1), fraccion)
+        return self._prefijo[k] + self._factor[k] * parcial
+
+
+def calcular_CT_clases(tca, vida, periodos=None):
+    """
+    Factor de crecimiento acumulado en la vida de proyecto por clase vehicular (29,)
+    (o escalar con una tasa única); generaliza calcular_CT a tasas por clase y por periodo.
+    """
+    return CrecimientoAcumulado(tca, periodos).acumulado(vida)
+
+
+class LineaTiempoESAL:
+    """
+    ESAL's acumulados por año y por profundidad para una composición vehicular fija.
+
+    Los ejes equivalentes del 1er año por profundidad (por clase, si las tasas son por clase) se
+    calculan una vez; acumulados(vida) devuelve un arreglo (años, *Z.shape) reutilizando las sumas
+    prefijo ya calculadas.
+    """
+
+    def __init__(self, Z, tc_nombre, params, fvp, fvv, tca, periodos=None):
+        self.Z = np.asarray(Z, dtype=float)
+        self.crecimiento = CrecimientoAcumulado(tasas_vector(tca), periodos)
+        composicion = composicion_vector(params)
+        if self.crecimiento._factor.ndim == 1:
+            self.primer_anio = equivalentes_tabla(self.Z, tc_nombre, ejes_primer_anio(composicion, fvp, fvv))
+        else:
+            # (29, *Z.shape): aporte de cada clase a los ejes equivalentes del 1er año
+            por_clase = danio_tabla(self.Z, tc_nombre) @ ejes_por_clase(composicion, fvp, fvv).T
+            self.primer_anio = np.moveaxis(por_clase, -1, 0)
+
+    def acumulados(self, vida):
+        F = self.crecimiento.acumulado(anios_calendario(vida))
+        if F.ndim == 1:
+            return np.multiply.outer(F, self.primer_anio)
+        return np.tensordot(F, self.primer_anio, axes=1)
+
+
+def esals_anuales(Z, tc_nombre, params, fvp, fvv, tca, vida, periodos=None):
+    """
+    ESAL's acumulados al final de cada año: devuelve (años, arreglo (años, *Z.shape)).
+    El último renglón coincide con esals(Z, ..., tca, vida, periodos).
+    """
+    linea = LineaTiempoESAL(Z, tc_nombre, params, fvp, fvv, tca, periodos)
+    return anios_calendario(vida), linea.acumulados(vida)
@@ -0,0 +1,217 @@
+"""
+Procesamiento por lotes de estaciones de un corredor.
+
+Cada renglón del archivo de entrada (CSV o Parquet) es una estación con su tránsito, CBR's y,
+opcionalmente, su estructura. El archivo se lee por bloques, los renglones idénticos se calculan
+una sola vez y los bloques se reparten en un grupo de procesos; los resultados se escriben
+conforme se terminan.
+
+Uso:
+    python -m unampav.lote estaciones.csv resultados.csv --procesos 4
+"""
+import argparse
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .confiabilidad import calcular_B, calcular_T, calcular_U, calcular_VRS0
+from .diseno import _revisiones, _zg_revisiones, buscar_espesores
+from .esals import esals
+from .rehabilitacion import sobrecarpeta, vida_remanente
+from .trafico import CLASES_VEHICULARES, calcular_volumenes
+
+# Valores por omisión de las columnas que no vengan en el archivo (los mismos de la interfaz)
+VALORES_OMISION = {"nc": 1, "vc": 80.0, "vida": 15.0, "tca": 3.5, "qu": 90.0}
+COLUMNAS_CALCULO = (
+    ("tc_nombre", "nc", "vc", "vida", "tca", "tdpa", "qu", "vrs1", "vrs2", "vrs3")
+    + CLASES_VEHICULARES + ("D1", "D2", "D3", "D4")
+)
+
+
+def evaluar_estacion(fila, criterio="total", rehabilitacion=False):
+    """
+    Cadena completa para una estación: fcp -> ejes -> ESAL's a Prof1/2/3 -> fz -> ZG -> revisiones.
+    Si la estación no trae D1..D4 (o alguno es NaN) se buscan los espesores mínimos.
+    Con `rehabilitacion`, las estaciones con estructura se evalúan como pavimento existente:
+    vida remanente de cada revisión y sobrecarpeta necesaria para la vida de proyecto.
+    """
+    params = {clase: fila[clase] for clase in CLASES_VEHICULARES}
+    _, fvp, fvv = calcular_volumenes(fila["tdpa"], fila["nc"], fila["vc"])
+    U = calcular_U(calcular_T(fila["qu"] / 100))
+    B1, B2 = calcular_B(U)
+    VRS01, VRS02 = calcular_VRS0(B1), calcular_VRS0(B2)
+    trafico = (fila["tc_nombre"], params, fvp, fvv, fila["tca"], fila["vida"])
+
+    espesores = tuple(fila[capa] for capa in ("D1", "D2", "D3", "D4"))
+    existente = rehabilitacion and not any(np.isnan(espesores))
+    if any(np.isnan(espesores)):
+        espesores = buscar_espesores(*trafico, fila["vrs1"], fila["vrs2"], fila["vrs3"], VRS01, VRS02,
+                                     criterio=criterio)
+        if espesores is None:
+            return {"D1": np.nan, "D2": np.nan, "D3": np.nan, "D4": np.nan, "cumple": False}
+
+    D = np.array(espesores, dtype=float)
+    vrs = (fila["vrs1"], fila["vrs2"], fila["vrs3"])
+    prof, zge, VRS0 = _revisiones(D, VRS01, VRS02)  # Prof1, Prof2, Prof3
+    esal = esals(prof, *trafico)
+    zg = _zg_revisiones(np.array(vrs, dtype=float), VRS0, esal)
+
+    resultado = {"D1": D[0], "D2": D[1], "D3": D[2], "D4": D[3]}
+    for i in range(3):
+        resultado[f"Prof{i + 1}"] = prof[i]
+        resultado[f"Esal{i + 1}"] = esal[i]
+        resultado[f"Zg{i + 1}"] = zg[i]
+        resultado[f"zge{i + 1}"] = zge[i]
+        resultado[f"cumple{i + 1}"] = bool(zge[i] >= zg[i])
+    resultado["cumple"] = all(resultado[f"cumple{i + 1}"] for i in range(3))
+    if existente:
+        horizonte = max(50, int(np.ceil(fila["vida"])))
+        remanente = vida_remanente(D, vrs, *trafico[:5], VRS01, VRS02, horizonte=horizonte)
+        for i in range(3):
+            resultado[f"vida_remanente{i + 1}"] = remanente[i]
+        resultado["sobrecarpeta"] = sobrecarpeta(D, vrs, *trafico, VRS01, VRS02)
+    return resultado
+
+
+def _evaluar_grupo(filas, criterio, rehabilitacion=False):
+    return [evaluar_estacion(fila, criterio, rehabilitacion) for fila in filas]
+
+
+def _normalizar(bloque):
+    """Completa columnas faltantes con sus valores por omisión (composición y espesores)."""
+    bloque = bloque.copy()
+    for columna, valor in VALORES_OMISION.items():
+        if columna not in bloque:
+            bloque[columna] = valor
+    for clase in CLASES_VEHICULARES:
+        if clase not in bloque:
+            bloque[clase] = 0.0
+    for capa in ("D1", "D2", "D3", "D4"):
+        if capa not in bloque:
+            bloque[capa] = np.nan
+    return bloque
+
+
+def leer_bloques(ruta, tamano_bloque):
+    """Itera el archivo de entrada en DataFrames de a lo más `tamano_bloque` renglones."""
+    import pandas as pd
+
+    if ruta.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        for lote in pq.ParquetFile(ruta).iter_batches(batch_size=tamano_bloque):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(ruta, chunksize=tamano_bloque)
+
+
+class _Escritor:
+    """Escribe bloques de resultados de forma incremental en CSV o Parquet."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.parquet = ruta.lower().endswith(".parquet")
+        self._escritor = None
+        self._primero = True
+
+    def escribir(self, df):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            tabla = pa.Table.from_pandas(df, preserve_index=False)
+            if self._escritor is None:
+                self._escritor = pq.ParquetWriter(self.ruta, tabla.schema)
+            self._escritor.write_table(tabla)
+        else:
+            df.to_csv(self.ruta, mode="w" if self._primero else "a", header=self._primero, index=False)
+        self._primero = False
+
+    def cerrar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+
+
+def procesar_archivo(entrada, salida, procesos=None, tamano_bloque=1000, criterio="total",
+                     max_memoria=100_000, rehabilitacion=False):
+    """
+    Procesa todas las estaciones de `entrada` y escribe los resultados en `salida`.
+
+    procesos      : procesos de trabajo (None = núcleos disponibles, 1 = sin grupo de procesos)
+    tamano_bloque : renglones leídos por bloque
+    max_memoria   : resultados distintos que se recuerdan entre bloques para no repetir cálculos
+    rehabilitacion: agrega vida remanente y sobrecarpeta de las estaciones con estructura
+    Devuelve (renglones procesados, renglones calculados).
+    """
+    import pandas as pd
+
+    procesos = procesos or os.cpu_count() or 1
+    memoria = OrderedDict()
+    escritor = _Escritor(salida)
+    total = calculados = 0
+    grupo = ProcessPoolExecutor(procesos) if procesos > 1 else None
+    try:
+        for bloque in leer_bloques(entrada, tamano_bloque):
+            bloque = _normalizar(bloque)
+            entradas = bloque[list(COLUMNAS_CALCULO)]
+            # NaN != NaN: se reemplaza por None para que las estaciones sin espesores se agrupen
+            claves = list(entradas.astype(object).where(entradas.notna(), None)
+                          .itertuples(index=False, name=None))
+
+            pendientes = {}
+            for clave, fila in zip(claves, entradas.to_dict("records")):
+                if clave in memoria:
+                    memoria.move_to_end(clave)
+                else:
+                    pendientes.setdefault(clave, fila)
+
+            if pendientes:
+                filas = list(pendientes.values())
+                if grupo is None:
+                    resultados = _evaluar_grupo(filas, criterio, rehabilitacion)
+                else:
+                    partes = [filas[i::procesos] for i in range(procesos)]
+                    por_parte = list(grupo.map(_evaluar_grupo, partes, [criterio] * procesos,
+                                               [rehabilitacion] * procesos))
+                    resultados = [None] * len(filas)
+                    for i, parte in enumerate(por_parte):
+                        resultados[i::procesos] = parte
+                for clave, resultado in zip(pendientes, resultados):
+                    memoria[clave] = resultado
+                calculados += len(pendientes)
+
+            resultados = pd.DataFrame([memoria[clave] for clave in claves], index=bloque.index)
+            # Se desaloja hasta armar el bloque: sus propios resultados siempre están en memoria
+            while len(memoria) > max_memoria:
+                memoria.popitem(last=False)
+            salida_bloque = bloque.drop(columns=[c for c in resultados.columns if c in bloque])
+            escritor.escribir(pd.concat([salida_bloque, resultados], axis=1))
+            total += len(bloque)
+    finally:
+        escritor.cerrar()
+        if grupo is not None:
+            grupo.shutdown()
+    return total, calculados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diseño por lotes de estaciones con el método UNAM.")
+    parser.add_argument("entrada", help="CSV o Parquet con una estación por renglón")
+    parser.add_argument("salida", help="CSV o Parquet de resultados")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos de trabajo (1 = sin paralelismo)")
+    parser.add_argument("--bloque", type=int, default=1000, help="renglones por bloque de lectura")
+    parser.add_argument("--criterio", choices=("total", "capas"), default="total",
+                        help="criterio de búsqueda para estaciones sin espesores")
+    parser.add_argument("--rehabilitacion", action="store_true",
+                        help="vida remanente y sobrecarpeta de las estaciones con estructura existente")
+    args = parser.parse_args(argv)
+
+    total, calculados = procesar_archivo(args.entrada, args.salida, args.procesos, args.bloque, args.criterio,
+                                         rehabilitacion=args.rehabilitacion)
+    print(f"{total} estaciones procesadas, {calculados} combinaciones distintas calculadas.")
+
+
+if __name__ == "__main__":
+    main()
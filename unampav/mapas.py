@@ -0,0 +1,55 @@
+"""
+Mapas de factibilidad para planeación de red: espesor total en grava equivalente requerido sobre
+la subrasante para una malla densa de CBR de subrasante × TDPA, por tipo de camino y número de carriles.
+
+Los ejes del 1er año son proporcionales al TDPA del carril (calcular_volumenes es lineal), así que
+basta una curva de ESAL's por profundidad con TDPA unitario por tipo de camino; el resto de la malla
+se obtiene por difusión (broadcasting). Como la profundidad de la subrasante es el propio espesor,
+se resuelve el punto fijo Z = ZG(Z) con bisección vectorizada sobre toda la malla a la vez.
+"""
+import numpy as np
+
+from .confiabilidad import calcular_fz, calcular_ZG
+from .esals import esals
+from .trafico import calcular_fcp, calcular_volumenes
+
+ITERACIONES_BISECCION = 30
+
+
+def mapa_factibilidad(tc_nombres, params, carriles, vc, tca, vida, VRS0, vrs, tdpa, periodos=None,
+                      Z_max=150.0, n_profundidades=300):
+    """
+    Espesor en grava equivalente (cm) requerido sobre la subrasante para cada combinación.
+
+    tc_nombres : tipos de camino; carriles : números de carriles (nc)
+    vrs, tdpa  : vectores de CBR de la subrasante (%) y de TDPA en ambos sentidos
+    VRS0       : VRS0 de terracerías (B2) del nivel de confianza
+    Supone que la profundidad de la subrasante es igual al espesor en grava equivalente (coeficiente 1),
+    de modo que el espesor requerido es la solución de Z = ZG(ESAL's(Z)).
+    Devuelve un arreglo float32 (caminos, carriles, CBR, TDPA); NaN si se requieren más de Z_max cm.
+    """
+    Z = np.linspace(1.0, Z_max, n_profundidades)
+    _, fvp, fvv = calcular_volumenes(1.0, 1, vc)
+    fcp_1 = calcular_fcp(1)
+    log_unitario = np.log10([esals(Z, tc, params, fvp, fvv, tca, vida, periodos) for tc in tc_nombres])
+
+    # log10 de ESAL's = log10(curva unitaria del camino) + log10(TDPA en el carril)
+    escala = np.log10(np.multiply.outer([calcular_fcp(nc) / fcp_1 for nc in carriles], np.asarray(tdpa, float)))
+    forma = (len(tc_nombres), len(carriles), len(vrs), len(tdpa))
+    vrs_malla = np.asarray(vrs, dtype=float)[:, None]
+
+    def exceso(Zp):
+        """ZG requerido a la profundidad Zp menos Zp (decrece con Zp)."""
+        log_esal = np.stack([np.interp(Zp[i], Z, log_unitario[i]) for i in range(len(tc_nombres))])
+        log_esal = log_esal + escala[None, :, None, :]
+        return calcular_ZG(calcular_fz(vrs_malla, VRS0, 10 ** log_esal)) - Zp
+
+    bajo = np.zeros(forma)
+    alto = np.full(forma, Z_max)
+    for _ in range(ITERACIONES_BISECCION):
+        medio = 0.5 * (bajo + alto)
+        positivo = exceso(medio) > 0
+        bajo = np.where(positivo, medio, bajo)
+        alto = np.where(positivo, alto, medio)
+    espesor = np.where(exceso(alto) > 0, np.nan, alto)
+    return espesor.astype(np.float32)
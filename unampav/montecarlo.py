@@ -0,0 +1,99 @@
+"""
+Análisis probabilístico (Monte Carlo) de una estructura fija.
+
+Se muestrean los CBR's (vrs1..vrs3), el TDPA, la tasa de crecimiento y el % de vehículos cargados,
+y cada muestra recorre la cadena ESAL -> fz -> ZG de forma vectorizada.
+"""
+import numpy as np
+
+from .diseno import _revisiones, _zg_revisiones
+from .tablas import danio_tabla
+from .trafico import (
+    COEF_EJES, EJES_BASE_CARGADOS, calcular_CT, calcular_fcp, composicion_vector,
+)
+
+VARIABLES_ALEATORIAS = ("vrs1", "vrs2", "vrs3", "tdpa", "tca", "vc")
+# Límites físicos de cada variable; las muestras fuera de rango se recortan
+LIMITES = {"vrs1": (1e-3, None), "vrs2": (1e-3, None), "vrs3": (1e-3, None),
+           "tdpa": (0.0, None), "tca": (-99.0, None), "vc": (0.0, 100.0)}
+
+
+def muestrear(distribucion, n, rng):
+    """
+    Genera n muestras de una distribución dada como:
+      valor                              -> constante
+      ("normal", media, desviación)
+      ("lognormal", media, desviación)   -> media y desviación de la variable, no de su logaritmo
+      ("uniforme", mínimo, máximo)
+      ("triangular", mínimo, moda, máximo)
+    """
+    if np.isscalar(distribucion):
+        return np.full(n, float(distribucion))
+    tipo, *p = distribucion
+    if tipo == "normal":
+        return rng.normal(p[0], p[1], n)
+    if tipo == "lognormal":
+        sigma2 = np.log1p((p[1] / p[0]) ** 2)
+        return rng.lognormal(np.log(p[0]) - sigma2 / 2, np.sqrt(sigma2), n)
+    if tipo == "uniforme":
+        return rng.uniform(p[0], p[1], n)
+    if tipo == "triangular":
+        return rng.triangular(p[0], p[1], p[2], n)
+    raise ValueError(f"Distribución '{tipo}' no reconocida.")
+
+
+def simular_falla(tc_nombre, params, nc, vida, espesores, VRS01, VRS02, distribuciones,
+                  n=100_000, semilla=None, bloque=200_000):
+    """
+    Probabilidad de que cada revisión (zge ≥ ZG) no se cumpla para la estructura `espesores` (D1..D4).
+
+    distribuciones : diccionario con una entrada por cada nombre de VARIABLES_ALEATORIAS
+                     (ver `muestrear`); las que falten deben darse como constante.
+    Las muestras se procesan en bloques de `bloque` para acotar la memoria.
+    Devuelve un diccionario con:
+      "prob_falla"  : arreglo (3,) con la probabilidad de falla de cada revisión
+      "prob_global" : probabilidad de que falle al menos una revisión
+      "error"       : error estándar de cada probabilidad (4,), la última es la global
+      "intervalo"   : intervalo de confianza al 95 % de las 4 probabilidades, forma (2, 4)
+      "n"           : número de muestras
+    """
+    from scipy.stats import norm
+
+    faltantes = [v for v in VARIABLES_ALEATORIAS if v not in distribuciones]
+    if faltantes:
+        raise ValueError(f"Faltan distribuciones para: {', '.join(faltantes)}.")
+
+    prof, zge, VRS0 = _revisiones(espesores, VRS01, VRS02)
+
+    # Los ESAL's son lineales en los volúmenes cargados y vacíos: se precalculan las dos sumas de daño
+    x = composicion_vector(params)
+    d = danio_tabla(prof, tc_nombre)                                  # (3, 17)
+    danio_cargados = d @ (COEF_EJES[0] @ x + EJES_BASE_CARGADOS)       # (3,)
+    danio_vacios = d @ (COEF_EJES[1] @ x)                              # (3,)
+    fcp = calcular_fcp(nc)
+
+    rng = np.random.default_rng(semilla)
+    fallas = np.zeros(4)
+    hechas = 0
+    while hechas < n:
+        m = min(bloque, n - hechas)
+        s = {}
+        for v in VARIABLES_ALEATORIAS:
+            bajo, alto = LIMITES[v]
+            s[v] = np.clip(muestrear(distribuciones[v], m, rng), bajo, alto)
+        vcp = s["tdpa"] * fcp
+        fvp = vcp * 3.65 * s["vc"] / 100
+        fvv = vcp * 3.65 * (100 - s["vc"]) / 100
+        esal = calcular_CT(s["tca"], vida)[:, None] * (fvp[:, None] * danio_cargados
+                                                        + fvv[:, None] * danio_vacios)
+        vrs = np.stack([s["vrs1"], s["vrs2"], s["vrs3"]], axis=1)
+        falla = zge < _zg_revisiones(vrs, VRS0, esal)                  # (m, 3)
+        fallas[:3] += falla.sum(axis=0)
+        fallas[3] += falla.any(axis=1).sum()
+        hechas += m
+
+    p = fallas / n
+    error = np.sqrt(p * (1 - p) / n)
+    z = norm.ppf(0.975)
+    intervalo = np.clip(np.stack([p - z * error, p + z * error]), 0, 1)
+    return {"prob_falla": p[:3], "prob_global": p[3], "error": error, "intervalo": intervalo, "n": n}
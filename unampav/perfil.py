@@ -0,0 +1,76 @@
+"""
+Instrumentación opcional por etapas de cada rerun de la página.
+
+Se activa con la variable de entorno UNAMPAV_PERFIL=1 (o desde la interfaz con ?perfil=1).
+Cuando está inactiva, las marcas no hacen nada. Cada rerun queda como un registro
+{"inicio": ..., "total_ms": ..., "etapas": {nombre: ms}} que se puede exportar como JSON lines;
+con UNAMPAV_PERFIL_ARCHIVO=ruta también se agrega a ese archivo en cada rerun.
+"""
+import json
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def perfil_activo_por_entorno():
+    return os.environ.get("UNAMPAV_PERFIL", "").lower() in ("1", "true", "si", "sí")
+
+
+class Perfilador:
+    """Cronómetro por etapas con historial acotado de los últimos reruns."""
+
+    def __init__(self, historia=200, archivo=None):
+        self.historial = deque(maxlen=historia)
+        self.archivo = archivo if archivo is not None else os.environ.get("UNAMPAV_PERFIL_ARCHIVO")
+        self.activo = False
+        self._etapas = {}
+        self._inicio = self._ultima = None
+
+    def iniciar(self, activo=True):
+        """Arranca un rerun nuevo."""
+        self.activo = activo
+        self._etapas = {}
+        self._inicio = self._ultima = time.perf_counter()
+
+    def marcar(self, nombre):
+        """Cierra la etapa `nombre`: le asigna el tiempo transcurrido desde la marca anterior."""
+        if not self.activo:
+            return
+        ahora = time.perf_counter()
+        self._etapas[nombre] = self._etapas.get(nombre, 0.0) + (ahora - self._ultima) * 1000
+        self._ultima = ahora
+
+    @contextmanager
+    def etapa(self, nombre):
+        """Mide solo el bloque `with`; el tiempo no se cuenta en la siguiente marca."""
+        if not self.activo:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            fin = time.perf_counter()
+            self._etapas[nombre] = self._etapas.get(nombre, 0.0) + (fin - inicio) * 1000
+            self._ultima += fin - inicio
+
+    def terminar(self):
+        """Cierra el rerun, lo agrega al historial (y al archivo, si hay) y lo devuelve."""
+        if not self.activo:
+            return None
+        registro = {
+            "inicio": time.time() - (time.perf_counter() - self._inicio),
+            "total_ms": (time.perf_counter() - self._inicio) * 1000,
+            "etapas": dict(self._etapas),
+        }
+        self.historial.append(registro)
+        if self.archivo:
+            with open(self.archivo, "a", encoding="utf-8") as archivo:
+                archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        self.activo = False
+        return registro
+
+    def jsonl(self):
+        """Historial completo en formato JSON lines."""
+        return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in self.historial)
@@ -0,0 +1,56 @@
+"""
+Curvas en función de la profundidad para las gráficas de la pestaña "Definición de espesores":
+ESAL's acumulados vs. Z, espesor ZG requerido vs. Z para cada CBR y perfil de grava equivalente real
+de la estructura. Todas las profundidades se evalúan en una sola llamada vectorizada a esals.
+"""
+import numpy as np
+
+from .confiabilidad import calcular_fz, calcular_ZG
+from .esals import esals
+
+
+def barrido_profundidad(Z, tc_nombre, params, fvp, fvv, tca, vida, vrs, VRS0, periodos=None):
+    """
+    ESAL's y espesores requeridos para un arreglo de profundidades Z (n,).
+
+    vrs, VRS0 : CBR de cada material y su VRS0 (B1 para bases, B2 para subbase e inferiores), (k,)
+    Devuelve (esal (n,), Zg (n, k)): Zg[:, j] es el espesor en grava equivalente que requiere el
+    material j si su cara superior estuviera a la profundidad Z.
+    """
+    Z = np.asarray(Z, dtype=float)
+    esal = esals(Z, tc_nombre, params, fvp, fvv, tca, vida, periodos)
+    fz = calcular_fz(np.asarray(vrs, dtype=float), np.asarray(VRS0, dtype=float), esal[:, None])
+    return esal, calcular_ZG(fz)
+
+
+def grava_equivalente(Z, espesores, coeficientes):
+    """
+    Grava equivalente real por encima de la profundidad Z: Σ a_i · (parte de la capa i sobre Z).
+    Lineal por tramos, con quiebres en las caras de las capas.
+    """
+    Z = np.asarray(Z, dtype=float)
+    D = np.asarray(espesores, dtype=float)
+    techo = np.cumsum(D) - D
+    dentro = np.clip(Z[..., None] - techo, 0.0, D)
+    return dentro @ np.asarray(coeficientes, dtype=float)
+
+
+def diezmar(x, y, max_puntos=150):
+    """
+    Índices de a lo más `max_puntos` puntos de la curva (x, y) repartidos por longitud de arco
+    (en escala normalizada), para enviar menos puntos al navegador sin perder los tramos curvos.
+    Conserva el primero y el último. Si la curva tiene valores no finitos se reparten por x.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float).reshape(len(x), -1)
+    if len(x) <= max_puntos:
+        return np.arange(len(x))
+    if not np.isfinite(y).all():
+        return np.unique(np.linspace(0, len(x) - 1, max_puntos).round().astype(np.intp))
+    escala = np.ptp(y, axis=0)
+    dx = np.diff(x) / (np.ptp(x) or 1.0)
+    dy = np.diff(y / np.where(escala > 0, escala, 1.0), axis=0)
+    tramos = np.hypot(dx[:, None], dy).max(axis=1)
+    arco = np.concatenate(([0.0], np.cumsum(tramos)))
+    objetivo = np.linspace(0.0, arco[-1], max_puntos)
+    return np.unique(np.concatenate(([0], np.searchsorted(arco, objetivo), [len(x) - 1])).clip(0, len(x) - 1))
@@ -0,0 +1,81 @@
+"""
+Evaluación de pavimentos existentes: vida remanente de cada revisión y sobrecarpeta necesaria.
+
+La capacidad de una revisión (ESAL's admisibles) se obtiene invirtiendo ZG y fz: con el espesor en
+grava equivalente real zge, ZG(fz) = zge da el fz admisible y de ahí log10(ESAL). La vida remanente
+es el año en que los ESAL's acumulados (arreglo año por año, ver linea_tiempo) rebasan la capacidad.
+Las funciones aceptan inventarios completos: espesores (..., 4) y CBR's (..., 3) con el mismo tránsito.
+"""
+import numpy as np
+
+from .diseno import COEF_GRAVA, _revisiones, _zg_revisiones
+from .esals import esals
+from .linea_tiempo import esals_anuales
+
+ITERACIONES_BISECCION = 30
+
+
+def esal_admisible(vrs, VRS0, zge):
+    """
+    ESAL's que soporta una capa con CBR `vrs` bajo `zge` cm de grava equivalente (inversa de ZG y fz).
+    Con zge = 0 la capa solo resiste si vrs ≥ VRS0 (fz ≥ 1 con un ESAL).
+    """
+    zge = np.asarray(zge, dtype=float)
+    with np.errstate(divide="ignore"):
+        fz = 1 - (1 + (15 / zge) ** 2) ** -1.5
+        log_esal = np.log(vrs / (VRS0 * fz)) / np.log(1.5)
+    return 10 ** log_esal
+
+
+def vida_remanente(espesores, vrs, tc_nombre, params, fvp, fvv, tca, VRS01, VRS02, horizonte=50,
+                   periodos=None):
+    """
+    Años (con fracción, por interpolación lineal dentro del año) en que los ESAL's acumulados de cada
+    revisión rebasan su capacidad, contados desde la puesta en servicio: arreglo (..., 3).
+    inf si no se rebasa dentro del `horizonte`.
+    """
+    Z, zge, VRS0 = _revisiones(espesores, VRS01, VRS02)
+    capacidad = esal_admisible(np.asarray(vrs, dtype=float), VRS0, zge)
+    t, acumulados = esals_anuales(Z, tc_nombre, params, fvp, fvv, tca, horizonte, periodos)
+    t = np.concatenate(([0.0], t))
+    acumulados = np.concatenate((np.zeros((1,) + Z.shape), acumulados))
+
+    # Equivale a searchsorted sobre el eje de los años (acumulados crecientes) para cada revisión
+    k = np.count_nonzero(acumulados <= capacidad, axis=0)
+    excede = k < len(t)
+    k = np.clip(k, 1, len(t) - 1)
+    previo = np.take_along_axis(acumulados, k[None] - 1, axis=0)[0]
+    siguiente = np.take_along_axis(acumulados, k[None], axis=0)[0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraccion = np.clip((capacidad - previo) / (siguiente - previo), 0.0, 1.0)
+    anio = t[k - 1] + fraccion * (t[k] - t[k - 1])
+    return np.where(excede, anio, np.inf)
+
+
+def sobrecarpeta(espesores, vrs, tc_nombre, params, fvp, fvv, tca, vida, VRS01, VRS02, periodos=None,
+                 espesor_max=50.0):
+    """
+    Espesor mínimo de carpeta nueva (cm) para que las tres revisiones cumplan a la `vida` indicada: (...,).
+
+    La sobrecarpeta aumenta la profundidad y la grava equivalente (coeficiente de carpeta) de las tres
+    revisiones; el margen mínimo crece con el espesor, así que se resuelve con bisección vectorizada
+    sobre todo el inventario. 0 si ya cumple; NaN si no basta con `espesor_max`.
+    """
+    Z, zge, VRS0 = _revisiones(espesores, VRS01, VRS02)
+    vrs = np.asarray(vrs, dtype=float)
+    a1 = COEF_GRAVA[0]
+
+    def margen(h):
+        esal = esals(Z + h[..., None], tc_nombre, params, fvp, fvv, tca, vida, periodos)
+        return (zge + a1 * h[..., None] - _zg_revisiones(vrs, VRS0, esal)).min(axis=-1)
+
+    bajo = np.zeros(Z.shape[:-1])
+    alto = np.full(Z.shape[:-1], float(espesor_max))
+    cumple_ya = margen(bajo) >= 0
+    for _ in range(ITERACIONES_BISECCION):
+        medio = 0.5 * (bajo + alto)
+        cumple = margen(medio) >= 0
+        alto = np.where(cumple, medio, alto)
+        bajo = np.where(cumple, bajo, medio)
+    h = np.where(cumple_ya, 0.0, alto)
+    return np.where(margen(alto) >= 0, h, np.nan)[()]
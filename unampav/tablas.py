@@ -0,0 +1,144 @@
+"""
+Tablas precalculadas de daño unitario contra profundidad para cada tipo de camino.
+
+El daño unitario de cada fila de ejes solo depende del tipo de camino y de Z; el tránsito lo escala
+linealmente. Se tabula en una malla fina de Z para las dos ramas de la discontinuidad en Z = 30 cm
+(Z < 30 y Z ≥ 30) y se guarda en disco como .npy para abrirlo mapeado en memoria.
+
+Para un tránsito dado, la tabla se reduce con un producto punto contra los ejes del 1er año a una
+sola curva de ejes equivalentes contra Z; las consultas de ESAL's son entonces una interpolación
+cúbica en esa curva (en escala logarítmica, porque el daño se comporta como potencia de Z).
+
+La carpeta de las tablas se define con la variable de entorno UNAMPAV_TABLAS
+(por omisión ~/.cache/unampav).
+"""
+import functools
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from .danio import danio_unitario
+from .trafico import CARGAS_POR_CAMINO
+
+Z_LIMITE = 30.0   # discontinuidad del radio de placa y de N
+PASO_Z = 0.05     # cm; las profundidades enteras caen exactamente en un nodo
+Z_MAXIMO = 300.0  # fuera de la tabla se calcula directo
+TIPOS_CAMINO = tuple(CARGAS_POR_CAMINO)
+
+
+def _nodos():
+    return np.arange(round(Z_MAXIMO / PASO_Z) + 1) * PASO_Z
+
+
+def construir_tabla():
+    """Arreglo (tipos de camino, 2 ramas, nodos Z, 17 filas); rama 0: Z < 30, rama 1: Z ≥ 30."""
+    Z = _nodos()
+    cargas = np.array([CARGAS_POR_CAMINO[tc] for tc in TIPOS_CAMINO])
+    return np.stack([danio_unitario(Z, cargas, somero=True),
+                     danio_unitario(Z, cargas, somero=False)], axis=1)
+
+
+def ruta_tabla():
+    """Ruta del .npy; el nombre cambia si cambian las cargas o la malla, y entonces se regenera."""
+    firma = hashlib.sha256(repr((CARGAS_POR_CAMINO, PASO_Z, Z_MAXIMO)).encode()).hexdigest()[:12]
+    carpeta = os.environ.get("UNAMPAV_TABLAS", os.path.join(os.path.expanduser("~"), ".cache", "unampav"))
+    return os.path.join(carpeta, f"danio_{firma}.npy")
+
+
+@functools.lru_cache(maxsize=None)
+def cargar_tabla():
+    """Abre la tabla mapeada en memoria; la construye y la guarda la primera vez."""
+    ruta = ruta_tabla()
+    if not os.path.exists(ruta):
+        tabla = construir_tabla()
+        try:
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            # Escritura atómica: otros procesos nunca ven un archivo a medias
+            fd, temporal = tempfile.mkstemp(suffix=".npy", dir=os.path.dirname(ruta))
+            with os.fdopen(fd, "wb") as archivo:
+                np.save(archivo, tabla)
+            os.replace(temporal, ruta)
+        except OSError:
+            return tabla  # sin disco escribible la tabla se queda en memoria
+    return np.load(ruta, mmap_mode="r")
+
+
+def _tabla_camino(tc_nombre):
+    if tc_nombre not in CARGAS_POR_CAMINO:
+        raise ValueError(f"Tipo de camino '{tc_nombre}' no reconocido.")
+    return cargar_tabla()[TIPOS_CAMINO.index(tc_nombre)]
+
+
+_VECINOS = np.arange(-1, 3)  # nodos i-1, i, i+1, i+2 de la interpolación cúbica
+
+
+def _interpolar(valores, Z, transformar=None):
+    """
+    Interpolación cúbica (Catmull-Rom) de `valores` (2 ramas, nodos, ...) en las profundidades Z.
+    `transformar` se aplica a los nodos antes de interpolar (p. ej. np.log10).
+    Devuelve Z.shape + valores.shape[2:].
+    """
+    ultimo = valores.shape[1] - 1
+    posicion = np.minimum(np.maximum(Z, 0.0), Z_MAXIMO) / PASO_Z
+    i = np.minimum(posicion.astype(np.intp), ultimo - 1)
+    t = (posicion - i).reshape(Z.shape + (1,) * (valores.ndim - 2))
+    rama = (Z >= Z_LIMITE).astype(np.intp)
+    # Un solo acceso indexado para los 4 nodos vecinos: forma Z.shape + (4,) + valores.shape[2:]
+    indices = np.minimum(np.maximum(i[..., None] + _VECINOS, 0), ultimo)
+    y = valores[rama[..., None], indices]
+    if transformar is not None:
+        y = transformar(y)
+    y0, y1, y2, y3 = (y[..., k, :] if valores.ndim > 2 else y[..., k] for k in range(4))
+    return y1 + 0.5 * t * (y2 - y0 + t * (2 * y0 - 5 * y1 + 4 * y2 - y3 + t * (3 * (y1 - y2) + y3 - y0)))
+
+
+def danio_tabla(Z, tc_nombre):
+    """
+    Daño unitario de las 17 filas interpolado en la tabla del tipo de camino.
+    Devuelve un arreglo Z.shape + (17,), igual que danio_unitario(Z, CARGAS_POR_CAMINO[tc_nombre]).
+    """
+    tabla = _tabla_camino(tc_nombre)
+    Z = np.asarray(Z, dtype=float)
+    d = 10 ** _interpolar(tabla, Z, np.log10)
+    fuera = (Z < 0) | (Z > Z_MAXIMO)
+    if fuera.any():
+        d[fuera] = danio_unitario(Z[fuera], CARGAS_POR_CAMINO[tc_nombre])
+    return d
+
+
+@functools.lru_cache(maxsize=256)
+def _curva(tc_nombre, ejes_bytes):
+    ejes = np.frombuffer(ejes_bytes)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        curva = np.log10(_tabla_camino(tc_nombre) @ ejes)
+    # Sin tránsito (o con ejes negativos) el logaritmo no existe
+    return curva if np.all(np.isfinite(curva)) else None
+
+
+def curva_equivalentes(tc_nombre, ejes):
+    """
+    log10 de los ejes equivalentes del 1er año contra Z (2 ramas, nodos) para un vector de ejes (17,),
+    o None si la curva no tiene logaritmo (sin tránsito). Se memoriza por tipo de camino y ejes,
+    así que las consultas repetidas solo interpolan.
+    """
+    return _curva(tc_nombre, np.ascontiguousarray(ejes, dtype=np.float64).tobytes())
+
+
+def equivalentes_tabla(Z, tc_nombre, ejes):
+    """
+    Ejes equivalentes del 1er año, Σ ejes · daño unitario, para un arreglo de profundidades Z.
+    Equivale a danio_unitario(Z, cargas) @ ejes, con la tabla del tipo de camino.
+    """
+    Z = np.asarray(Z, dtype=float)
+    ejes = np.asarray(ejes, dtype=float)
+    curva = curva_equivalentes(tc_nombre, ejes)
+    if curva is None:
+        return danio_unitario(Z, CARGAS_POR_CAMINO[tc_nombre]) @ ejes
+    E = 10 ** _interpolar(curva, Z)
+    fuera = (Z < 0) | (Z > Z_MAXIMO)
+    if fuera.any():
+        E = np.array(E)
+        E[fuera] = danio_unitario(Z[fuera], CARGAS_POR_CAMINO[tc_nombre]) @ ejes
+    return E[()]
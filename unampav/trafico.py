@@ -0,0 +1,218 @@
+"""
+Tránsito: factor carril, volúmenes de proyecto y transformación de vehículos a ejes.
+"""
+import functools
+import json
+import os
+
+import numpy as np
+
+# 1. Calcular el factor carril de proyecto (fcp)
+# =============================================================================================================
+def calcular_fcp(nc): return 0.5 if nc == 1 else 0.45 if nc == 2 else 0.4
+
+
+def calcular_volumenes(tdpa, nc, vc):
+    """
+    Volúmenes anuales en el carril de proyecto.
+    Devuelve (vcp, fvp, fvv): TDPA del carril, vehículos cargados y vehículos vacíos por año.
+    """
+    vcp = tdpa * calcular_fcp(nc)  # TDPA en el carril de proyecto
+    fvp = (vcp * 3.65 * vc) / 100  # Vehículos cargados
+    fvv = (vcp * 3.65 * (100 - vc)) / 100  # Vehículos vacíos
+    return vcp, fvp, fvv
+
+
+# 2. transformar vehículos a número de ejes, definiendo tipo de eje y sus cargas segun tipo de camino
+
+# Cargas por tipo de camino (ton), una por cada una de las 17 filas de ejes
+CARGAS_POR_CAMINO = {
+    "ET y A": [1.0, 6.5, 12.5, 10.0, 11.0, 11.0, 4.0, 7.0, 17.5, 21.0, 17.0, 19.0, 18.0, 4.5, 23.5, 26.5, 5.0],
+    "Tipo B": [1.0, 6.0, 10.5, 9.5, 9.5, 10.5, 4.0, 7.0, 13.0, 17.0, 15.0, 15.0, 17.0, 4.5, 22.5, 22.5, 5.0],
+    "Tipo C": [1.0, 5.5, 9.0, 8.0, 8.0, 9.0, 4.0, 7.0, 11.5, 14.5, 13.5, 13.5,14.5, 4.5, 20.0, 20.0, 5.0],
+    "Tipo D": [1.0, 5.0, 8.0, 7.0, 7.0, 8.0, 4.0, 7.0, 11.0, 13.5, 12.0, 12.0, 13.5, 4.5, 18.0, 18.0, 5.0]
+}
+
+DESCRIPCION_EJES = ["Sencillo"] * 8 + ["Tándem"] * 6 + ["Trídem"] * 3
+CONDICION_EJES = ["Cargado"] * 6 + ["Vacío"] * 2 + ["Cargado"] * 5 + ["Vacío"] + ["Cargado"] * 2 + ["Vacío"]
+
+# Registro declarativo de clases vehiculares (unampav/datos/clases.json, o el archivo de UNAMPAV_CLASES).
+# Cada clase indica los ejes por fila (0-16) que aporta un vehículo cargado y uno vacío; agregar una
+# clase regional solo requiere editar el registro.
+RUTA_REGISTRO = os.environ.get("UNAMPAV_CLASES") or os.path.join(os.path.dirname(__file__), "datos", "clases.json")
+
+
+def cargar_registro(ruta=RUTA_REGISTRO):
+    """Lee el registro de clases: devuelve (clases, base_cargados) con las filas como enteros."""
+    with open(ruta, encoding="utf-8") as archivo:
+        registro = json.load(archivo)
+    clases = tuple(
+        dict(c, cargado={int(f): n for f, n in c.get("cargado", {}).items()},
+             vacio={int(f): n for f, n in c.get("vacio", {}).items()})
+        for c in registro["clases"]
+    )
+    base = {int(f): n for f, n in registro.get("base_cargados", {}).items()}
+    return clases, base
+
+
+REGISTRO_CLASES, _BASE_CARGADOS = cargar_registro()
+
+# Clases vehiculares en el orden de la composición (columnas)
+CLASES_VEHICULARES = tuple(c["clase"] for c in REGISTRO_CLASES)
+
+# Ejes que aporta cada clase a cada fila (1er año), por vehículo cargado y por vehículo vacío.
+# La fila 0 (automóvil) cuenta para ambos volúmenes; la fila 1 lleva además el término 100·cargados.
+def _ejes_por_fila(condicion):
+    """Invierte el registro a fila -> {clase: ejes} para `condicion` = "cargado" o "vacio"."""
+    filas = {}
+    for c in REGISTRO_CLASES:
+        for fila, n in c[condicion].items():
+            filas.setdefault(fila, {})[c["clase"]] = n
+    return dict(sorted(filas.items()))
+
+
+EJES_POR_CLASE_CARGADOS = _ejes_por_fila("cargado")
+EJES_POR_CLASE_VACIOS = _ejes_por_fila("vacio")
+
+
+def _matriz_ejes(ejes_por_clase):
+    """Compila un diccionario fila -> {clase: ejes} en una matriz de coeficientes 17×(clases)."""
+    M = np.zeros((len(DESCRIPCION_EJES), len(CLASES_VEHICULARES)))
+    for fila, clases in ejes_por_clase.items():
+        for clase, n in clases.items():
+            M[fila, CLASES_VEHICULARES.index(clase)] = n
+    return M
+
+
+# Matriz apilada (2, 17, clases): [0] multiplica a los vehículos cargados y [1] a los vacíos
+COEF_EJES = np.stack([_matriz_ejes(EJES_POR_CLASE_CARGADOS), _matriz_ejes(EJES_POR_CLASE_VACIOS)])
+EJES_BASE_CARGADOS = np.zeros(len(DESCRIPCION_EJES))
+EJES_BASE_CARGADOS[list(_BASE_CARGADOS)] = list(_BASE_CARGADOS.values())  # (100 - A2 + B4) · cargados
+
+
+# Con las 29 clases de origen la matriz tiene ~11 % de coeficientes no nulos y el producto denso es más
+# rápido; el producto disperso se usa cuando el registro crece por debajo de esta densidad.
+DENSIDAD_EJES = np.count_nonzero(COEF_EJES) / COEF_EJES.size
+DENSIDAD_DISPERSA = 0.05
+
+
+@functools.lru_cache(maxsize=1)
+def matriz_dispersa():
+    """COEF_EJES compilada una vez como matriz dispersa CSR (2·17, clases); scipy se importa aquí."""
+    from scipy import sparse
+
+    return sparse.csr_matrix(COEF_EJES.reshape(-1, len(CLASES_VEHICULARES)))
+
+
+def composicion_vector(params):
+    """Convierte el diccionario de composición vehicular (%) en un vector de 29 valores."""
+    return np.array([params[clase] for clase in CLASES_VEHICULARES], dtype=float)
+
+
+def ejes_primer_anio(composiciones, cargados, vacios, escala_base=1.0):
+    """
+    Ejes del 1er año por fila para N composiciones vehiculares con un solo producto matricial.
+
+    composiciones : arreglo (N, 29) o (29,) en %, columnas en el orden de CLASES_VEHICULARES
+    cargados      : volumen anual de vehículos cargados, escalar o (N,)
+    vacios        : volumen anual de vehículos vacíos, escalar o (N,)
+    escala_base   : factor del término independiente (el 100 % de la fila 1), escalar o (N,)
+    Devuelve un arreglo (N, 17), o (17,) si se pasó una sola composición.
+    """
+    X = np.asarray(composiciones, dtype=float)
+    n_filas = COEF_EJES.shape[1]
+    if DENSIDAD_EJES < DENSIDAD_DISPERSA:
+        # Registro grande y disperso: producto (2·17, clases) · (clases, N) con los coeficientes no nulos
+        por_vehiculo = np.asarray(matriz_dispersa() @ X.reshape(-1, X.shape[-1]).T).T
+    else:
+        por_vehiculo = X @ COEF_EJES.reshape(-1, X.shape[-1]).T
+    por_vehiculo = por_vehiculo.reshape(X.shape[:-1] + (2, n_filas))
+    cargados = np.asarray(cargados, dtype=float)[..., None]
+    vacios = np.asarray(vacios, dtype=float)[..., None]
+    base = EJES_BASE_CARGADOS * np.asarray(escala_base, dtype=float)[..., None]
+    return cargados * (por_vehiculo[..., 0, :] + base) + vacios * por_vehiculo[..., 1, :]
+
+
+def pesos_clase(composiciones):
+    """
+    Participación de cada clase en la composición (suma 1), (..., 29).
+    Reparte entre las clases el término independiente de la fila 1; sin composición, se reparte por igual.
+    """
+    X = np.asarray(composiciones, dtype=float)
+    total = X.sum(axis=-1, keepdims=True)
+    return np.where(total > 0, X / np.where(total > 0, total, 1.0), 1.0 / X.shape[-1])
+
+
+def ejes_acumulados(composiciones, cargados, vacios, CT):
+    """
+    Ejes acumulados por fila con un factor de crecimiento por clase.
+
+    CT : escalar, (29,) o (..., 29): repeticiones acumuladas por clase en la vida de proyecto
+         (ver calcular_CT_clases). Con un CT escalar equivale a CT * ejes_primer_anio(...).
+    """
+    X = np.asarray(composiciones, dtype=float)
+    CT = np.broadcast_to(np.asarray(CT, dtype=float), X.shape[-1:] if np.ndim(CT) == 0 else np.shape(CT))
+    return ejes_primer_anio(X * CT, cargados, vacios, escala_base=np.sum(pesos_clase(X) * CT, axis=-1))
+
+
+def ejes_por_clase(composicion, cargados, vacios):
+    """
+    Ejes del 1er año por fila aportados por cada clase, (29, 17); la suma sobre las clases
+    es ejes_primer_anio(composicion, cargados, vacios).
+    """
+    x = np.asarray(composicion, dtype=float)
+    return (cargados * (COEF_EJES[0] * x).T + vacios * (COEF_EJES[1] * x).T
+            + cargados * np.outer(pesos_clase(x), EJES_BASE_CARGADOS))
+
+
+def tasas_vector(tasas):
+    """Tasas de crecimiento por clase: acepta un diccionario {clase: %} y devuelve un arreglo en el orden de CLASES_VEHICULARES."""
+    if isinstance(tasas, dict):
+        return np.array([tasas[clase] for clase in CLASES_VEHICULARES], dtype=float)
+    return np.asarray(tasas, dtype=float)
+
+
+def transformar_vehiculos_a_ejes(tc_nombre, params, cargados, vacios):
+    """Tabla de ejes del 1er año (DataFrame) para el tipo de camino y la composición dados."""
+    import pandas as pd  # solo la vista tabular necesita pandas
+
+    if tc_nombre not in CARGAS_POR_CAMINO:
+        raise ValueError(f"Tipo de camino '{tc_nombre}' no reconocido.")
+
+    cargas = np.array(CARGAS_POR_CAMINO[tc_nombre])
+
+    df = pd.DataFrame({
+        "Descripción": DESCRIPCION_EJES,
+        "Condición": CONDICION_EJES,
+        "Cargas (Ton)": cargas,
+        # Convertir toneladas a kips
+        "Cargas (Kip)": cargas * 2.2046226218517,
+        # Calcular ejes (1er Año)
+        "Ejes 1er Año": ejes_primer_anio(composicion_vector(params), cargados, vacios)
+    })
+
+    # Asegurar tipos
+    df = df.astype({
+        "Descripción": str,
+        "Condición": str,
+        "Cargas (Ton)": float,
+        "Cargas (Kip)": float,
+        "Ejes 1er Año": float
+    })
+
+    return df
+
+
+# 3. Factor de crecimiento de tráfico CT
+# =============================================================================================================
+def calcular_CT(tca, vida):
+    if np.ndim(tca) > 0:  # Un arreglo de tasas (muestras de Monte Carlo, por ejemplo)
+        r = np.asarray(tca, dtype=float) / 100
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(r != 0, ((1 + r) ** vida - 1) / np.where(r != 0, r, 1), vida)
+    if tca != 0:  # Evita la división por cero
+        CT = ((1 + (tca / 100)) ** vida - 1) / (tca / 100)
+    else:
+        CT = vida  # Si tca es 0, el crecimiento es lineal, CT = vida
+
+    return CT
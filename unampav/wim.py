@@ -0,0 +1,157 @@
+"""
+Espectros de carga a partir de registros de pesaje en movimiento (WIM).
+
+Los archivos de pesaje tienen un renglón por eje (decenas de millones). Se leen por bloques, o se
+mapean en memoria si son binarios, y se acumulan en un histograma compacto (tipo de eje × intervalo
+de carga). La memoria usada depende del tamaño del bloque, no del archivo. El espectro reemplaza
+a las 17 filas fijas de cargas en el cálculo del daño:
+
+    python -m unampav.wim pesajes.csv espectro.npz --paso 0.25 --carga-max 60
+"""
+import argparse
+
+import numpy as np
+
+from .danio import propiedades_ejes, danio_unitario
+from .trafico import calcular_CT
+
+GRUPOS_EJE = ("Sencillo", "Tándem", "Trídem")
+
+# Códigos aceptados en la columna de tipo de eje -> grupo (0 sencillo, 1 tándem, 2 trídem)
+CODIGOS_TIPO = {
+    "sencillo": 0, "s": 0, "1": 0,
+    "tandem": 1, "tándem": 1, "t": 1, "2": 1,
+    "tridem": 2, "trídem": 2, "r": 2, "3": 2,
+}
+
+# Registro de los archivos binarios (.npy o crudo): grupo 1/2/3 y carga en toneladas
+REGISTRO_WIM = np.dtype([("tipo", "u1"), ("carga", "<f4")])
+
+# Los intervalos de ejes sencillos que empiezan hasta esta carga (t) se tratan como el automóvil
+# de la tabla (presión de contacto q = 2)
+CARGA_AUTOMOVIL = 1.0
+
+
+class EspectroCargas:
+    """
+    Histograma de repeticiones por grupo de eje e intervalo de carga.
+
+    conteos : arreglo (3, n) de ejes por grupo (sencillo, tándem, trídem) e intervalo
+    bordes  : n + 1 bordes de los intervalos de carga (t); los ejes más pesados van al último
+    """
+
+    def __init__(self, conteos, bordes, descartados=0):
+        self.conteos = np.asarray(conteos, dtype=np.int64)
+        self.bordes = np.asarray(bordes, dtype=float)
+        self.descartados = int(descartados)
+
+    @classmethod
+    def vacio(cls, paso=0.25, carga_max=60.0):
+        bordes = np.arange(0.0, carga_max + paso / 2, paso)
+        return cls(np.zeros((len(GRUPOS_EJE), len(bordes) - 1), dtype=np.int64), bordes)
+
+    @property
+    def total(self):
+        return int(self.conteos.sum())
+
+    def agregar(self, grupos, cargas):
+        """Acumula un bloque de ejes: `grupos` 0/1/2 (otro valor se descarta) y `cargas` en toneladas."""
+        grupos = np.asarray(grupos)
+        cargas = np.asarray(cargas, dtype=float)
+        validos = (grupos >= 0) & (grupos < len(GRUPOS_EJE)) & np.isfinite(cargas) & (cargas >= 0)
+        self.descartados += int(validos.size - np.count_nonzero(validos))
+        n = self.conteos.shape[1]
+        intervalo = np.minimum(np.searchsorted(self.bordes, cargas[validos], side="right") - 1, n - 1)
+        self.conteos += np.bincount(
+            grupos[validos].astype(np.intp) * n + intervalo, minlength=self.conteos.size
+        ).reshape(self.conteos.shape)
+
+    def filas(self):
+        """Intervalos con ejes como filas de daño: (repeticiones, cargas (t), propiedades_ejes)."""
+        grupo, intervalo = np.nonzero(self.conteos)
+        cargas = 0.5 * (self.bordes[intervalo] + self.bordes[intervalo + 1])
+        presion = np.where((grupo == 0) & (self.bordes[intervalo] <= CARGA_AUTOMOVIL), 2.0, 6.0)
+        return self.conteos[grupo, intervalo].astype(float), cargas, propiedades_ejes(grupo, presion)
+
+    def guardar(self, ruta):
+        np.savez_compressed(ruta, conteos=self.conteos, bordes=self.bordes, descartados=self.descartados)
+
+    @classmethod
+    def cargar(cls, ruta):
+        with np.load(ruta) as datos:
+            return cls(datos["conteos"], datos["bordes"], int(datos["descartados"]))
+
+
+def _grupos(tipos):
+    """Convierte una columna de tipos de eje (números 1/2/3 o texto) a grupos 0/1/2; -1 si no se reconoce."""
+    import pandas as pd
+
+    tipos = pd.Series(tipos)
+    if pd.api.types.is_numeric_dtype(tipos):
+        return np.where(tipos.isin([1, 2, 3]), tipos.fillna(0).astype(int) - 1, -1)
+    return tipos.astype(str).str.strip().str.lower().map(CODIGOS_TIPO).fillna(-1).astype(int).to_numpy()
+
+
+def espectro_csv(ruta, columna_tipo="tipo", columna_carga="carga", paso=0.25, carga_max=60.0,
+                 bloque=1_000_000):
+    """Histograma de un CSV de pesajes leído por bloques de `bloque` renglones."""
+    import pandas as pd
+
+    espectro = EspectroCargas.vacio(paso, carga_max)
+    for datos in pd.read_csv(ruta, usecols=[columna_tipo, columna_carga], chunksize=bloque):
+        espectro.agregar(_grupos(datos[columna_tipo]), pd.to_numeric(datos[columna_carga], errors="coerce"))
+    return espectro
+
+
+def espectro_binario(ruta, paso=0.25, carga_max=60.0, bloque=4_000_000):
+    """
+    Histograma de un archivo binario de registros REGISTRO_WIM (.npy o crudo), mapeado en memoria.
+    Solo se leen `bloque` registros a la vez.
+    """
+    if str(ruta).endswith(".npy"):
+        registros = np.load(ruta, mmap_mode="r")
+    else:
+        registros = np.memmap(ruta, dtype=REGISTRO_WIM, mode="r")
+    espectro = EspectroCargas.vacio(paso, carga_max)
+    for inicio in range(0, len(registros), bloque):
+        parte = registros[inicio:inicio + bloque]
+        espectro.agregar(parte["tipo"].astype(np.intp) - 1, parte["carga"])
+    return espectro
+
+
+def equivalentes_espectro(Z, espectro, factor_anual=1.0):
+    """
+    Ejes equivalentes de un año para el espectro, en las profundidades Z (escalar o arreglo).
+    `factor_anual` lleva los conteos del periodo registrado a un año (por ejemplo 365 / días registrados).
+    """
+    repeticiones, cargas, ejes = espectro.filas()
+    return danio_unitario(Z, cargas, ejes=ejes) @ (repeticiones * factor_anual)
+
+
+def esals_espectro(Z, espectro, tca, vida, factor_anual=1.0):
+    """ESAL's acumulados en la vida de proyecto con el espectro de pesaje en lugar de la tabla de cargas."""
+    return calcular_CT(tca, vida) * equivalentes_espectro(Z, espectro, factor_anual)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Espectro de cargas a partir de registros de pesaje (WIM).")
+    parser.add_argument("entrada", help="CSV con columnas de tipo de eje y carga (t), o binario .npy/crudo")
+    parser.add_argument("salida", help="Archivo .npz del espectro")
+    parser.add_argument("--paso", type=float, default=0.25, help="Ancho de los intervalos de carga (t)")
+    parser.add_argument("--carga-max", type=float, default=60.0, help="Carga máxima del histograma (t)")
+    parser.add_argument("--bloque", type=int, default=1_000_000, help="Renglones por bloque de lectura")
+    parser.add_argument("--columna-tipo", default="tipo")
+    parser.add_argument("--columna-carga", default="carga")
+    args = parser.parse_args(argv)
+
+    if str(args.entrada).lower().endswith(".csv"):
+        espectro = espectro_csv(args.entrada, args.columna_tipo, args.columna_carga,
+                                args.paso, args.carga_max, args.bloque)
+    else:
+        espectro = espectro_binario(args.entrada, args.paso, args.carga_max, args.bloque)
+    espectro.guardar(args.salida)
+    print(f"{espectro.total:,} ejes en el espectro, {espectro.descartados:,} registros descartados")
+
+
+if __name__ == "__main__":
+    main()